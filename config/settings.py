@@ -2,12 +2,103 @@
 Configuration settings for the application
 """
 
+import os
+
 # Regex pattern for filename base
 FILENAME_PATTERN = r'20\d{2}_\d{2}_\d{2}_\d{6}'
 
+# Maximum number of parsed filenames kept in the LRU cache
+FILENAME_PARSE_CACHE_SIZE = 200000
+
+# Excel ingestion backend: "pandas" (whole sheet as DataFrame) or
+# "openpyxl" (streaming read-only rows, flat memory for huge workbooks)
+EXCEL_BACKEND = "pandas"
+
+# Import pandas/openpyxl on a background thread once the window is shown
+EXCEL_PREWARM = True
+
+# Number of parsed Excel sheets kept in memory
+WORKBOOK_CACHE_SIZE = 4
+
+# Directory for persistent caches (Excel filename index sidecars, etc.)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".namechecker", "cache")
+
+# Reuse on-disk filename indexes for unchanged workbooks
+INDEX_CACHE_ENABLED = True
+
+# Index sidecar files and remembered workbook hashes kept on disk; the least
+# recently used ones are pruned beyond this number
+INDEX_CACHE_MAX_ENTRIES = 200
+
+# Separator between several folders entered in the folder field and in batch
+# manifests: the platform's path list separator (";" on Windows, ":" elsewhere,
+# where ";" is a common character in folder names)
+FOLDER_SEPARATOR = os.pathsep
+
+# Keep incremental folder snapshots so repeated comparisons only rescan changed folders
+SNAPSHOT_ENABLED = True
+
+# Watch mode: quiet period before a burst of new files is processed, and
+# interval of the periodic check (the only check when inotify is unavailable)
+WATCH_DEBOUNCE_SECONDS = 2.0
+WATCH_POLL_INTERVAL = 10.0
+
+# Threads used to walk folders in parallel (I/O bound on network storage)
+SCAN_WORKERS = 8
+
+# Threads used for cross-device file copies when grouping files
+MOVE_WORKERS = 4
+
+# Processes parsing workbooks in batch mode (None = number of CPU cores)
+BATCH_EXCEL_WORKERS = None
+
+# Threads issuing renames/deletes concurrently (latency bound on network shares)
+FS_WORKERS = 8
+
+# Number of processed items between progress updates of long operations
+PROGRESS_STEP = 100
+
+# Rename journal records written between fsync calls
+JOURNAL_SYNC_EVERY = 200
+
+# Rows per batch written when exporting results to Parquet
+EXPORT_BATCH_SIZE = 50000
+
+# Content verification: files smaller than this many bytes are reported
+# (1 = only empty files); VERIFY_MIN_FILE_SIZES overrides it per extension,
+# e.g. {".mp4": 1024 * 1024}
+VERIFY_MIN_FILE_SIZE = 1
+VERIFY_MIN_FILE_SIZES = {}
+
+# Content hashes: a hashlib algorithm (e.g. "blake2b", "sha256") or
+# "xxh3_128"/"xxh64" (requires the xxhash package)
+HASH_ALGORITHM = "blake2b"
+
+# Threads hashing files in parallel, and bytes read per chunk
+HASH_WORKERS = 4
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Files whose content digests are kept on disk; the least recently used
+# ones are dropped beyond this number
+DIGEST_CACHE_MAX_ENTRIES = 200000
+
+# Bytes hashed at the start and at the end of a file when looking for
+# duplicate contents; only files that also match there are hashed completely
+DUPLICATE_SAMPLE_SIZE = 64 * 1024
+
 # Minimum files required per test number
 FILES_PER_TEST = 4
 
+# Completeness profiles: files every test number must have, given as
+# "_<extra suffix><extension>" or "<extension>" (case-insensitive).
+# A selected profile replaces the FILES_PER_TEST count check.
+COMPLETENESS_PROFILES = {
+    "blf_video": (".blf", "_inside.mp4", "_outside.mp4"),
+}
+
+# Profile used by default (None = count files only)
+COMPLETENESS_PROFILE = None
+
 # UI settings
 WINDOW_TITLE = "File Name Check Tool"
 WINDOW_WIDTH = 600
@@ -0,0 +1,14 @@
+"""
+NameCheck命令行启动脚本（无图形界面）
+"""
+
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
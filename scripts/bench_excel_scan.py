@@ -0,0 +1,101 @@
+"""
+Benchmark: vectorized Excel filename extraction vs. the per-column loop
+
+Usage:
+    python scripts/bench_excel_scan.py [rows] [columns]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from config.settings import FILENAME_PATTERN
+from src.excel_utils import split_filenames, scan_excel_for_filenames
+
+
+def original_extract_filename_base(file_name: str):
+    """
+    Previous extract_filename_base: one uncached regex search per fragment.
+    """
+    match = re.search(FILENAME_PATTERN, file_name)
+    if match:
+        return match.group(0)
+    return None
+
+
+def scan_excel_loop(df):
+    """
+    Previous per-column implementation, kept here as the baseline (without
+    the memoized parser, so repeated runs do not time cache hits).
+    """
+    all_filenames = []
+    for col in df.columns:
+        column_data = df[col].dropna().apply(split_filenames).explode()
+        column_filenames = column_data.apply(lambda x: original_extract_filename_base(str(x))).dropna()
+        all_filenames.extend(column_filenames)
+    filename_series = pd.Series(all_filenames)
+    duplicates = filename_series[filename_series.duplicated()].unique()
+    unique_filenames = filename_series.drop_duplicates()
+    test_numbers = set(f[-6:] for f in all_filenames if f)
+    return unique_filenames, duplicates.tolist(), len(test_numbers)
+
+
+def make_sheet(rows: int, columns: int) -> pd.DataFrame:
+    rng = random.Random(42)
+    data = {}
+    for c in range(columns):
+        col = []
+        for r in range(rows):
+            kind = rng.random()
+            if kind < 0.3:
+                base = f"2025_{rng.randint(1, 12):02d}_{rng.randint(1, 28):02d}_{rng.randint(0, 999999):06d}"
+                col.append(f"{base}_DA00097_A")
+            elif kind < 0.4:
+                col.append("2025_04_15_155131_DA00097_A, 2025_04_15_155132_DA00097_A")
+            elif kind < 0.7:
+                col.append(rng.randint(0, 1000))
+            elif kind < 0.9:
+                col.append("some free text comment")
+            else:
+                col.append(None)
+        data[f"C{c}"] = col
+    return pd.DataFrame(data)
+
+
+def _timed(func, df, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    df = make_sheet(rows, columns)
+    print(f"Sheet: {rows} rows x {columns} columns")
+
+    loop_time, loop_result = _timed(scan_excel_loop, df)
+    vec_time, vec_result = _timed(scan_excel_for_filenames, df)
+
+    assert loop_result[0].tolist() == vec_result[0].tolist()
+    assert loop_result[1] == vec_result[1]
+    assert loop_result[2] == vec_result[2]
+
+    print(f"per-column loop : {loop_time:.3f} s")
+    print(f"vectorized      : {vec_time:.3f} s")
+    print(f"speedup         : {loop_time / vec_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
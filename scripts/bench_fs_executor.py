@@ -0,0 +1,109 @@
+"""
+Benchmark: parallel rename/delete executor on a high-latency filesystem
+
+Network shares pay one round trip per metadata operation. The stand-in
+below makes every os.rename, os.link, os.unlink, os.remove and os.lstat
+sleep for a fixed latency first, then runs the shipped rename path
+(apply_rename_plan, which checks the target and renames) and the
+link + unlink form used by resume/rollback (execute_rename_steps with
+atomic=True), plus a deletion, sequentially and with increasing thread
+pool sizes.
+
+Usage:
+    python scripts/bench_fs_executor.py [files] [latency_ms]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.fs_executor import execute_file_operations
+from src.file_utils import apply_rename_plan, build_suffix_rename_plan
+from src.rename_journal import execute_rename_steps
+
+DELAYED_FUNCTIONS = ("rename", "link", "unlink", "remove", "lstat")
+
+
+@contextmanager
+def delayed_filesystem(latency: float):
+    """
+    Patch the os metadata calls with a simulated round trip while the plan runs.
+    """
+    originals = {name: getattr(os, name) for name in DELAYED_FUNCTIONS}
+
+    def delayed(func):
+        def wrapper(*args, **kwargs):
+            time.sleep(latency)
+            return func(*args, **kwargs)
+        return wrapper
+
+    for name, func in originals.items():
+        setattr(os, name, delayed(func))
+    try:
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+
+
+def make_folder(root: str, tests: int):
+    for i in range(tests):
+        base = f"2025_08_18_{i:06d}"
+        for suffix in ("DA00001_A.blf", "DA00001_A_inside.mp4", "DA00001_A_outside.mp4", "DA00001_A.txt"):
+            open(os.path.join(root, f"{base}_{suffix}"), 'w').close()
+
+
+def run(latency: float, tests: int, workers: int):
+    root = tempfile.mkdtemp(prefix="bench_fs_")
+    try:
+        make_folder(root, tests)
+        changes, _, conflicts = build_suffix_rename_plan(root, "DA99999_Z")
+        assert not conflicts
+        start = time.perf_counter()
+        with delayed_filesystem(latency):
+            renamed = apply_rename_plan(changes, max_workers=workers)
+        rename_time = time.perf_counter() - start
+        assert not renamed["failed"]
+
+        # Rename back with link + unlink, as resume and rollback do
+        back = [(new_path, old_path) for old_path, new_path in changes]
+        with delayed_filesystem(latency):
+            linked = execute_rename_steps(back, list(range(len(back))), max_workers=workers, atomic=True)
+        assert not linked["failed"]
+
+        paths = [old_path for old_path, _ in changes]
+        with delayed_filesystem(latency):
+            deleted = execute_file_operations(paths, os.remove, max_workers=workers)
+        assert not deleted["failed"]
+        return len(changes), rename_time, linked["elapsed"], deleted["elapsed"]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    tests = max(1, files // 4)
+    latency = latency_ms / 1000.0
+
+    print(f"{tests * 4} files, {latency_ms:.1f} ms per metadata operation")
+    print(f"{'workers':>8} {'rename s':>10} {'files/s':>10} {'link s':>10} {'files/s':>10} "
+          f"{'delete s':>10} {'files/s':>10}")
+    baseline = None
+    for workers in (1, 4, 8, 16, 32):
+        count, rename_time, link_time, delete_time = run(latency, tests, workers)
+        if baseline is None:
+            baseline = rename_time + delete_time
+        speedup = baseline / (rename_time + delete_time)
+        print(f"{workers:>8} {rename_time:>10.2f} {count / rename_time:>10.0f} "
+              f"{link_time:>10.2f} {count / link_time:>10.0f} "
+              f"{delete_time:>10.2f} {count / delete_time:>10.0f}   x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: Excel prefix matching used by "Group Files"
+
+Compares the previous linear scan over all Excel names with PrefixIndex
+and shows that grouping time grows linearly with the number of files.
+
+Usage:
+    python scripts/bench_grouping.py [max_files]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.prefix_index import PrefixIndex
+
+
+def match_linear(file_stem, sorted_names):
+    """
+    Previous implementation of MainWindow._match_excel_prefix.
+    """
+    stem = file_stem.strip().lower()
+    for candidate in sorted_names:
+        if stem.startswith(candidate.lower()):
+            return candidate
+    return None
+
+
+def make_data(count: int):
+    rng = random.Random(7)
+    names = []
+    stems = []
+    for i in range(count):
+        base = f"2025_{rng.randint(1, 12):02d}_{rng.randint(1, 28):02d}_{i:06d}"
+        name = f"{base}_DA{rng.randint(0, 99999):05d}_{rng.choice('ABCDE')}"
+        names.append(name)
+        stems.append(name + rng.choice(["", "_inside", "_outside"]))
+    rng.shuffle(stems)
+    return names, stems
+
+
+def main():
+    max_files = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    sizes = []
+    size = 1250
+    while size <= max_files:
+        sizes.append(size)
+        size *= 2
+
+    print(f"{'files':>8} {'linear (s)':>12} {'index (s)':>12} {'index us/file':>14}")
+    for count in sizes:
+        names, stems = make_data(count)
+
+        start = time.perf_counter()
+        index = PrefixIndex(names)
+        indexed = [index.longest_prefix(stem) for stem in stems]
+        index_time = time.perf_counter() - start
+
+        linear_text = "skipped"
+        if count <= 5000:
+            sorted_names = sorted(names, key=len, reverse=True)
+            start = time.perf_counter()
+            linear = [match_linear(stem, sorted_names) for stem in stems]
+            linear_text = f"{time.perf_counter() - start:.3f}"
+            assert linear == indexed
+
+        per_file = index_time / count * 1e6
+        print(f"{count:>8} {linear_text:>12} {index_time:>12.4f} {per_file:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
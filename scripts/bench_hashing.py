@@ -0,0 +1,66 @@
+"""
+Benchmark: parallel content hashing and the digest cache
+
+Hashes a folder of generated recordings with increasing thread pool sizes
+(hashlib releases the GIL, so threads scale until the disk is the limit),
+then repeats the run with a warm DigestCache where no file is read again.
+
+Usage:
+    python scripts/bench_hashing.py [files] [size_mb] [algorithm]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.content_check import DigestCache, hash_files
+
+
+def make_folder(root: str, files: int, size: int):
+    block = os.urandom(1024 * 1024)
+    file_stats = {}
+    for i in range(files):
+        path = os.path.join(root, f"2025_08_18_{i:06d}_DA00001_A.blf")
+        with open(path, 'wb') as handle:
+            for _ in range(size // len(block)):
+                handle.write(block)
+        stat = os.stat(path)
+        file_stats[path] = (stat.st_size, stat.st_mtime)
+    return file_stats
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    size_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    algorithm = sys.argv[3] if len(sys.argv) > 3 else "blake2b"
+    root = tempfile.mkdtemp(prefix="bench_hash_")
+    try:
+        file_stats = make_folder(root, files, size_mb * 1024 * 1024)
+        total_mb = files * size_mb
+        print(f"{files} files x {size_mb} MB, {algorithm}")
+        print(f"{'workers':>8} {'seconds':>10} {'MB/s':>10}")
+        baseline = None
+        for workers in (1, 2, 4, 8):
+            cache = DigestCache(os.path.join(root, f"cold{workers}.json"))
+            start = time.perf_counter()
+            result = hash_files(file_stats, algorithm, max_workers=workers, cache=cache)
+            elapsed = time.perf_counter() - start
+            assert result["hashed"] == files and not result["errors"]
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>10.2f} {total_mb / elapsed:>10.0f}   x{baseline / elapsed:.1f}")
+
+        cache = DigestCache(os.path.join(root, "cold8.json"))
+        start = time.perf_counter()
+        result = hash_files(file_stats, algorithm, cache=cache)
+        elapsed = time.perf_counter() - start
+        print(f"warm cache: {result['cached']} cached, {result['hashed']} read, {elapsed * 1000:.1f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
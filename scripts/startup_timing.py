@@ -0,0 +1,96 @@
+"""
+Startup timing harness: import time and time to first paint of the main window
+
+Each run starts a fresh interpreter, so module caches from earlier runs do
+not hide import cost. Fails (exit code 1) when pandas/openpyxl are imported
+during startup or when the median times exceed the given budgets, so it can
+be used to catch startup regressions.
+
+Usage:
+    python scripts/startup_timing.py [--runs 5] [--max-import-ms 500] [--max-paint-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Runs in the child interpreter and prints one JSON line
+CHILD_CODE = r'''
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, %(root)r)
+import src.ui.main_window as main_window
+result = {
+    "import_ms": (time.perf_counter() - start) * 1000,
+    "heavy_modules": [name for name in ("pandas", "openpyxl") if name in sys.modules],
+    "paint_ms": None,
+}
+try:
+    import tkinter as tk
+    root = tk.Tk()
+except Exception as exc:
+    result["paint_error"] = str(exc)
+else:
+    main_window.EXCEL_PREWARM = False
+    main_window.MainWindow(root)
+    root.update()
+    result["paint_ms"] = (time.perf_counter() - start) * 1000
+    root.destroy()
+prewarm_start = time.perf_counter()
+main_window.prewarm_excel_modules()
+result["prewarm_ms"] = (time.perf_counter() - prewarm_start) * 1000
+print(json.dumps(result))
+'''
+
+
+def run_once(python: str) -> dict:
+    output = subprocess.run(
+        [python, "-c", CHILD_CODE % {"root": PROJECT_ROOT}],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--python", default=sys.executable, help="Interpreter to measure")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="Fail above this median import time")
+    parser.add_argument("--max-paint-ms", type=float, default=None, help="Fail above this median first-paint time")
+    args = parser.parse_args()
+
+    results = [run_once(args.python) for _ in range(args.runs)]
+    import_ms = statistics.median(r["import_ms"] for r in results)
+    paint_values = [r["paint_ms"] for r in results if r["paint_ms"] is not None]
+    paint_ms = statistics.median(paint_values) if paint_values else None
+    prewarm_ms = statistics.median(r["prewarm_ms"] for r in results)
+    heavy = sorted({name for r in results for name in r["heavy_modules"]})
+
+    print(f"runs:                     {args.runs}")
+    print(f"import main window:       {import_ms:8.1f} ms (median)")
+    if paint_ms is not None:
+        print(f"first paint:              {paint_ms:8.1f} ms (median)")
+    else:
+        print(f"first paint:              not measured ({results[0].get('paint_error', 'no display')})")
+    print(f"prewarm pandas/openpyxl:  {prewarm_ms:8.1f} ms (median, after first paint)")
+    print(f"heavy modules at startup: {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if heavy:
+        failures.append(f"{', '.join(heavy)} imported before the window is shown")
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        failures.append(f"import time {import_ms:.1f} ms exceeds {args.max_import_ms:.1f} ms")
+    if args.max_paint_ms is not None and paint_ms is not None and paint_ms > args.max_paint_ms:
+        failures.append(f"first paint {paint_ms:.1f} ms exceeds {args.max_paint_ms:.1f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
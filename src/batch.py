@@ -0,0 +1,228 @@
+"""
+批量比较：按清单（CSV/YAML）一次比较多个 (工作簿, sheet, 文件夹) 组合
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional, CSV manifests work without it
+    yaml = None
+
+from config.settings import BATCH_EXCEL_WORKERS, FILES_PER_TEST, FOLDER_SEPARATOR, SCAN_WORKERS
+from src.compare_engine import compare_indexed
+from src.completeness import get_completeness_profile
+from src.folder_snapshot import load_folder_index
+from src.workbook_cache import workbook_cache
+
+
+class BatchJob(NamedTuple):
+    """
+    One manifest row.
+    """
+    name: str
+    excel: str
+    sheet: Optional[str]
+    folders: Tuple[str, ...]
+    files_per_test: int
+    recursive: bool
+    profile: Optional[str] = None
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in ("1", "true", "yes", "y")
+
+
+def _make_job(row: Dict[str, object], index: int, base_dir: str) -> BatchJob:
+    def resolve(path: str) -> str:
+        path = os.path.expanduser(str(path).strip())
+        return path if os.path.isabs(path) else os.path.normpath(os.path.join(base_dir, path))
+
+    excel = row.get("excel")
+    folder = row.get("folder") or row.get("folders")
+    if not excel or not folder:
+        raise ValueError(f"Manifest row {index}: 'excel' and 'folder' are required")
+    if isinstance(folder, (list, tuple)):
+        folders = [str(path) for path in folder]
+    else:
+        folders = str(folder).split(FOLDER_SEPARATOR)
+    folders = tuple(resolve(path) for path in folders if str(path).strip())
+
+    files_per_test = row.get("files_per_test")
+    try:
+        files_per_test = int(files_per_test) if files_per_test not in (None, "") else FILES_PER_TEST
+    except ValueError:
+        raise ValueError(f"Manifest row {index}: files_per_test must be an integer") from None
+    if files_per_test <= 0:
+        raise ValueError(f"Manifest row {index}: files_per_test must be positive")
+
+    profile = str(row.get("profile") or "").strip() or None
+    try:
+        get_completeness_profile(profile)
+    except ValueError as exc:
+        raise ValueError(f"Manifest row {index}: {exc}") from None
+
+    sheet = row.get("sheet")
+    return BatchJob(
+        name=str(row.get("name") or f"row {index}"),
+        excel=resolve(excel),
+        sheet=str(sheet) if sheet not in (None, "") else None,
+        folders=folders,
+        files_per_test=files_per_test,
+        recursive=_parse_bool(row.get("recursive")),
+        profile=profile,
+    )
+
+
+def load_manifest(manifest_path: str) -> List[BatchJob]:
+    """
+    读取批量清单
+
+    CSV 表头：excel, sheet, folder, files_per_test, recursive, name, profile（后五列可选；
+    folder 中可用 FOLDER_SEPARATOR 分隔多个文件夹）。
+    YAML（需要安装 PyYAML）：上述字段组成的列表，或 {"jobs": [...]}。
+    相对路径以清单文件所在目录为基准。
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    extension = os.path.splitext(manifest_path)[1].lower()
+    if extension in (".yaml", ".yml"):
+        if yaml is None:
+            raise ValueError("YAML manifests require PyYAML (pip install pyyaml); use a CSV manifest instead")
+        with open(manifest_path, encoding='utf-8') as handle:
+            data = yaml.safe_load(handle) or []
+        rows = data.get("jobs", []) if isinstance(data, dict) else data
+        if not isinstance(rows, list):
+            raise ValueError("YAML manifest must be a list of jobs or a mapping with a 'jobs' list")
+    else:
+        with open(manifest_path, encoding='utf-8-sig', newline='') as handle:
+            rows = [
+                {key.strip().lower(): value for key, value in row.items() if key}
+                for row in csv.DictReader(handle)
+            ]
+    return [_make_job(row, index, base_dir) for index, row in enumerate(rows, 1)]
+
+
+def _index_workbook(excel_path: str, sheets: List[Optional[str]]) -> Dict[Optional[str], Dict[str, object]]:
+    """
+    Parse all requested sheets of one workbook (runs in a worker process).
+
+    Returns {requested_sheet: {"sheet", "bases", "test_count"} or {"error"}};
+    None stands for the first sheet of the workbook.
+    """
+    results: Dict[Optional[str], Dict[str, object]] = {}
+    for sheet in sheets:
+        try:
+            resolved = sheet
+            if resolved is None:
+                sheet_names = workbook_cache.get_sheet_names(excel_path)
+                if not sheet_names:
+                    raise ValueError("workbook has no sheets")
+                resolved = sheet_names[0]
+            index = workbook_cache.get_filename_index(excel_path, resolved)
+            results[sheet] = {"sheet": resolved, "bases": index["bases"], "test_count": index["test_count"]}
+        except Exception as exc:
+            results[sheet] = {"error": f"Cannot read Excel file: {exc}"}
+    return results
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    excel_workers: Optional[int] = BATCH_EXCEL_WORKERS,
+    scan_workers: int = SCAN_WORKERS,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, object]:
+    """
+    执行批量比较并生成汇总报告
+
+    每个工作簿只解析一次（同一工作簿的多行共享结果），不同工作簿在进程池中
+    并行解析；每组文件夹只扫描一次，在线程池中与Excel解析同时进行。
+
+    Args:
+        jobs: load_manifest 返回的任务列表
+        excel_workers: 解析Excel的进程数，None 表示CPU核心数
+        scan_workers: 同时扫描的文件夹组数
+        progress: 可选的进度回调 progress(已完成的工作簿/文件夹数量, 总数量)
+
+    Returns:
+        {"jobs": [每行的比较结果], "summary": {"total", "ok", "issues", "errors"}}
+    """
+    sheets_by_workbook: Dict[str, List[Optional[str]]] = {}
+    for job in jobs:
+        sheets = sheets_by_workbook.setdefault(job.excel, [])
+        if job.sheet not in sheets:
+            sheets.append(job.sheet)
+    scan_keys = list(dict.fromkeys((job.folders, job.recursive) for job in jobs))
+
+    total = len(sheets_by_workbook) + len(scan_keys)
+    done = 0
+    indexes: Dict[str, Dict[Optional[str], Dict[str, object]]] = {}
+    scans: Dict[Tuple[Tuple[str, ...], bool], object] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, scan_workers)) as scan_pool, \
+            ProcessPoolExecutor(max_workers=excel_workers) as excel_pool:
+        scan_futures = {scan_pool.submit(load_folder_index, *key): key for key in scan_keys}
+        excel_futures = {
+            excel_pool.submit(_index_workbook, excel, sheets): excel
+            for excel, sheets in sheets_by_workbook.items()
+        }
+        for futures, results in ((scan_futures, scans), (excel_futures, indexes)):
+            for future, key in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as exc:
+                    results[key] = exc
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+
+    reports = []
+    summary = {"total": len(jobs), "ok": 0, "issues": 0, "errors": 0}
+    for job in jobs:
+        report = {
+            "name": job.name,
+            "excel": job.excel,
+            "sheet": job.sheet,
+            "folders": list(job.folders),
+            "files_per_test": job.files_per_test,
+            "profile": job.profile,
+        }
+        workbook = indexes[job.excel]
+        excel_index = workbook if isinstance(workbook, Exception) else workbook[job.sheet]
+        folder_index = scans[(job.folders, job.recursive)]
+        if isinstance(excel_index, Exception) or "error" in excel_index:
+            error = excel_index.get("error") if isinstance(excel_index, dict) else str(excel_index)
+        elif isinstance(folder_index, Exception):
+            error = f"Cannot read folder: {folder_index}"
+        else:
+            error = None
+
+        if error is not None:
+            report.update({"status": "error", "error": error})
+            summary["errors"] += 1
+            reports.append(report)
+            continue
+
+        comparison = compare_indexed(excel_index["bases"], folder_index, required_files=job.files_per_test,
+                                     profile=get_completeness_profile(job.profile))
+        report.update({
+            "sheet": excel_index["sheet"],
+            "test_count": excel_index["test_count"],
+            "excel_only": comparison["excel_only"],
+            "folder_only": comparison["folder_only"],
+            "incomplete": {
+                base: len(comparison["files_by_base"].get(base, [])) for base in comparison["incomplete"]
+            },
+            "missing": comparison["missing"],
+            "duplicates": comparison["duplicates"],
+        })
+        has_issues = any(report[key] for key in ("excel_only", "folder_only", "incomplete", "duplicates"))
+        report["status"] = "issues" if has_issues else "ok"
+        summary["issues" if has_issues else "ok"] += 1
+        reports.append(report)
+
+    return {"jobs": reports, "summary": summary}
@@ -0,0 +1,474 @@
+"""
+NameCheck命令行入口（无需图形界面，可用于定时任务和流水线）
+
+Usage:
+    python -m src.cli compare --excel list.xlsx --folder D:/campaign1 --folder D:/campaign2
+    python -m src.cli compare --excel list.xlsx --folder D:/campaign1 --export result.xlsx
+    python -m src.cli rename-plan --folder D:/campaign1 --suffix DA00097_A --format csv
+    python -m src.cli rename-apply --folder D:/campaign1 --suffix DA00097_A
+    python -m src.cli group --excel list.xlsx --folder D:/campaign1 --group-column L
+    python -m src.cli delete-folder-only --excel list.xlsx --folder D:/campaign1
+    python -m src.cli delete-folder-only --excel list.xlsx --folder D:/campaign1 --yes
+    python -m src.cli batch --manifest nightly.csv --output report.json
+    python -m src.cli watch --excel list.xlsx --folder D:/campaign1
+
+Exit codes:
+    0  no issues found / all operations succeeded
+    1  issues found (mismatches, conflicts or failed operations)
+    2  invalid arguments or the command could not run (in batch mode: any row failed)
+
+delete-folder-only only lists the files it would delete unless --yes is given.
+
+watch runs until interrupted (Ctrl+C, exit code 0) and writes one JSON line
+per update instead of a single result.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# 添加项目根目录到Python路径，以便直接运行本文件
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import (
+    BATCH_EXCEL_WORKERS, COMPLETENESS_PROFILE, COMPLETENESS_PROFILES, FILES_PER_TEST, FS_WORKERS, HASH_ALGORITHM,
+)
+from src.batch import load_manifest, run_batch
+from src.compare_engine import compare_indexed
+from src.completeness import get_completeness_profile
+from src.content_check import find_duplicate_contents, find_undersized_files, hash_files
+from src.file_utils import apply_rename_plan, build_group_plan, build_suffix_rename_plan, fully_deleted_bases
+from src.folder_snapshot import load_folder_index, load_folder_listing
+from src.folder_watch import FolderWatcher
+from src.fs_executor import execute_file_operations
+from src.move_engine import execute_move_plan
+from src.result_export import export_report
+from src.result_model import add_duplicate_content_section, add_verification_sections, build_compare_report
+from src.rename_journal import has_unfinished_journal, journal_path_for, resume_rename_journal
+from src.workbook_cache import workbook_cache
+
+EXIT_OK = 0
+EXIT_ISSUES = 1
+EXIT_ERROR = 2
+
+# (section, name, detail) rows written in CSV mode
+Rows = List[Tuple[str, str, str]]
+
+
+def _resolve_sheet(excel_path: str, sheet: Optional[str]) -> str:
+    """
+    Return the requested sheet, or the first sheet of the workbook.
+    """
+    sheet_names = workbook_cache.get_sheet_names(excel_path)
+    if sheet is None:
+        if not sheet_names:
+            raise ValueError(f"{excel_path} has no sheets")
+        return sheet_names[0]
+    if sheet not in sheet_names:
+        raise ValueError(f"Sheet '{sheet}' not found in {excel_path} (available: {', '.join(sheet_names)})")
+    return sheet
+
+
+def cmd_compare(args) -> Tuple[Dict[str, object], Rows, int]:
+    sheet = _resolve_sheet(args.excel, args.sheet)
+    # Streamed with the openpyxl backend: the sheet is read while comparing
+    excel_index = workbook_cache.get_filename_index(args.excel, sheet, stream=True)
+    verify = args.verify_sizes or args.hash
+    if verify or args.find_duplicates:
+        folder_index, file_stats = load_folder_listing(args.folder, args.recursive)
+    else:
+        folder_index = load_folder_index(args.folder, args.recursive)
+    profile = get_completeness_profile(args.profile)
+    comparison = compare_indexed(excel_index["bases"], folder_index, required_files=args.files_per_test,
+                                 profile=profile)
+
+    payload = {
+        "excel": args.excel,
+        "sheet": sheet,
+        "folders": args.folder,
+        "test_count": excel_index["test_count"],
+        "files_per_test": args.files_per_test,
+        "profile": args.profile,
+        "excel_only": comparison["excel_only"],
+        "folder_only": comparison["folder_only"],
+        "incomplete": {
+            base: len(comparison["files_by_base"].get(base, [])) for base in comparison["incomplete"]
+        },
+        "missing": comparison["missing"],
+        "duplicates": comparison["duplicates"],
+    }
+    rows: Rows = []
+    rows += [("excel_only", base, "") for base in comparison["excel_only"]]
+    rows += [("folder_only", base, "") for base in comparison["folder_only"]]
+    if profile is not None:
+        rows += [("missing", base, ", ".join(kinds)) for base, kinds in comparison["missing"].items()]
+    else:
+        rows += [("incomplete", base, str(count)) for base, count in payload["incomplete"].items()]
+    rows += [("duplicate", base, "") for base in comparison["duplicates"]]
+
+    duplicate_groups, duplicate_errors = [], []
+    if args.find_duplicates:
+        duplicate_result = find_duplicate_contents(file_stats)
+        duplicate_groups, duplicate_errors = duplicate_result["groups"], duplicate_result["errors"]
+        payload["duplicate_content"] = duplicate_groups
+        payload["duplicate_unreadable"] = [{"path": path, "error": err} for path, err in duplicate_errors]
+        rows += [("duplicate_content", path, str(number)) for number, group in enumerate(duplicate_groups, 1)
+                 for path in group]
+        rows += [("duplicate_unreadable", path, err) for path, err in duplicate_errors]
+
+    undersized, hash_result = [], None
+    if verify:
+        undersized = find_undersized_files(file_stats)
+        payload["undersized"] = [{"path": path, "size": size} for path, size in undersized]
+        rows += [("undersized", path, str(size)) for path, size in undersized]
+    if args.hash:
+        hash_result = hash_files(file_stats)
+        payload.update({
+            "hash_algorithm": HASH_ALGORITHM,
+            "digests": dict(sorted(hash_result["digests"].items())),
+            "unreadable": [{"path": path, "error": err} for path, err in hash_result["errors"]],
+        })
+        rows += [("unreadable", path, err) for path, err in hash_result["errors"]]
+
+    if args.export:
+        report = build_compare_report(comparison, sheet, excel_index["test_count"], args.files_per_test, profile)
+        if args.find_duplicates:
+            add_duplicate_content_section(report, duplicate_groups, duplicate_errors)
+        if verify:
+            add_verification_sections(report, undersized, hash_result)
+        export_report(report, args.export)
+    return payload, rows, EXIT_ISSUES if rows else EXIT_OK
+
+
+def _rename_plan(args):
+    changes, skipped, conflicts = build_suffix_rename_plan(args.folder, args.suffix)
+    payload = {
+        "folder": args.folder,
+        "suffix": args.suffix,
+        "changes": [{"old": old, "new": new} for old, new in changes],
+        "skipped": skipped,
+        "conflicts": [{"old": old, "new": new} for old, new in conflicts],
+    }
+    rows: Rows = [("change", old, new) for old, new in changes]
+    rows += [("conflict", old, new) for old, new in conflicts]
+    return changes, conflicts, payload, rows
+
+
+def cmd_rename_plan(args) -> Tuple[Dict[str, object], Rows, int]:
+    _, conflicts, payload, rows = _rename_plan(args)
+    return payload, rows, EXIT_ISSUES if conflicts else EXIT_OK
+
+
+def cmd_rename_apply(args) -> Tuple[Dict[str, object], Rows, int]:
+    journal_path = None if args.no_journal else journal_path_for(args.folder)
+    if args.resume:
+        if not os.path.exists(journal_path):
+            raise ValueError(f"No rename journal found for {args.folder}")
+        conflicts = []
+        payload: Dict[str, object] = {"folder": args.folder, "resumed": True}
+        rows: Rows = []
+        stats = resume_rename_journal(journal_path)
+    else:
+        # A new plan would truncate the journal that is needed to resume or roll back
+        if not args.force and has_unfinished_journal(journal_path_for(args.folder)):
+            raise ValueError(
+                f"An interrupted rename job was found for {args.folder}; "
+                "use --resume to finish it, or --force to start a new rename and discard its journal"
+            )
+        changes, conflicts, payload, rows = _rename_plan(args)
+        stats = apply_rename_plan(
+            changes, journal_path=journal_path, max_workers=args.workers
+        )
+    payload.update({
+        "renamed": stats["renamed"],
+        "failed": stats["failed"],
+        "failures": [{"old": old, "new": new, "error": err} for old, new, err in stats["failures"]],
+        "per_second": stats.get("per_second", 0.0),
+        "recovered": stats.get("recovered", 0),
+        "journal": journal_path,
+    })
+    rows += [("failure", old, err) for old, _, err in stats["failures"]]
+    return payload, rows, EXIT_ISSUES if conflicts or stats["failed"] else EXIT_OK
+
+
+def cmd_group(args) -> Tuple[Dict[str, object], Rows, int]:
+    sheet = _resolve_sheet(args.excel, args.sheet)
+    filename_to_group, _ = workbook_cache.get_group_mapping(
+        args.excel, sheet, args.group_column, args.names_column
+    )
+    plan, unmatched_files, missing_excel, _ = build_group_plan(args.folder, filename_to_group)
+    moves = [(src, dest) for src, dest, _, _, _, _ in plan]
+
+    payload: Dict[str, object] = {
+        "excel": args.excel,
+        "sheet": sheet,
+        "folder": args.folder,
+        "group_column": args.group_column,
+        "dry_run": args.dry_run,
+        "unmatched_files": unmatched_files,
+        "missing_excel": sorted(missing_excel),
+    }
+    rows: Rows = [("unmatched", name, "") for name in unmatched_files]
+    rows += [("missing_excel", name, filename_to_group[name]) for name in sorted(missing_excel)]
+    if args.dry_run:
+        payload["planned"] = [{"src": src, "dest": dest} for src, dest in moves]
+        rows += [("planned", src, dest) for src, dest in moves]
+        return payload, rows, EXIT_OK
+
+    stats = execute_move_plan(moves)
+    payload.update({
+        "moved": [{"src": src, "dest": dest} for src, dest in stats["moved"]],
+        "conflicts": [{"src": src, "dest": dest} for src, dest in stats["conflicts"]],
+        "errors": [{"src": src, "dest": dest, "error": err} for src, dest, err in stats["errors"]],
+        "created_dirs": sorted(stats["created_dirs"]),
+    })
+    rows += [("moved", src, dest) for src, dest in stats["moved"]]
+    rows += [("conflict", src, dest) for src, dest in stats["conflicts"]]
+    rows += [("error", src, err) for src, _, err in stats["errors"]]
+    return payload, rows, EXIT_ISSUES if stats["conflicts"] or stats["errors"] else EXIT_OK
+
+
+def cmd_delete_folder_only(args) -> Tuple[Dict[str, object], Rows, int]:
+    sheet = _resolve_sheet(args.excel, args.sheet)
+    excel_bases = workbook_cache.get_filename_index(args.excel, sheet)["bases"]
+    folder_index = load_folder_index(args.folder, args.recursive)
+    comparison = compare_indexed(excel_bases, folder_index)
+    folder_only_bases = comparison["folder_only"]
+    file_paths = [
+        path for base in folder_only_bases for path in sorted(comparison["files_by_base"].get(base, ()))
+    ]
+
+    # Deleting needs an explicit --yes; listing is the default
+    dry_run = args.dry_run or not args.yes
+    payload: Dict[str, object] = {
+        "excel": args.excel,
+        "sheet": sheet,
+        "folders": args.folder,
+        "dry_run": dry_run,
+        "folder_only": folder_only_bases,
+    }
+    if dry_run:
+        payload["planned"] = file_paths
+        return payload, [("planned", path, "") for path in file_paths], EXIT_OK
+
+    result = execute_file_operations(file_paths, os.remove, max_workers=args.workers)
+    deleted = [file_paths[index] for index in result["succeeded"]]
+    failed = [(file_paths[index], err) for index, err in result["failed"]]
+    payload.update({
+        "deleted_tests": fully_deleted_bases(folder_only_bases, comparison["files_by_base"], deleted),
+        "deleted": deleted,
+        "failures": [{"path": path, "error": err} for path, err in failed],
+        "per_second": result["per_second"],
+    })
+    rows: Rows = [("deleted", path, "") for path in deleted]
+    rows += [("failure", path, err) for path, err in failed]
+    return payload, rows, EXIT_ISSUES if failed else EXIT_OK
+
+
+def cmd_batch(args) -> Tuple[Dict[str, object], Rows, int]:
+    report = run_batch(load_manifest(args.manifest), excel_workers=args.excel_workers)
+    # CSV detail column names the manifest row each finding belongs to
+    rows: Rows = []
+    for job in report["jobs"]:
+        if job["status"] == "error":
+            rows.append(("error", job["error"], job["name"]))
+            continue
+        rows += [("excel_only", base, job["name"]) for base in job["excel_only"]]
+        rows += [("folder_only", base, job["name"]) for base in job["folder_only"]]
+        rows += [("incomplete", base, job["name"]) for base in job["incomplete"]]
+        rows += [("duplicate", base, job["name"]) for base in job["duplicates"]]
+    summary = report["summary"]
+    if summary["errors"]:
+        exit_code = EXIT_ERROR
+    elif summary["issues"]:
+        exit_code = EXIT_ISSUES
+    else:
+        exit_code = EXIT_OK
+    return report, rows, exit_code
+
+
+def cmd_watch(args) -> int:
+    """
+    Print the comparison once, then again after every folder change (NDJSON).
+    """
+    sheet = _resolve_sheet(args.excel, args.sheet)
+    excel_bases = workbook_cache.get_filename_index(args.excel, sheet)["bases"]
+    handle = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    errors: List[Exception] = []
+    stopped = threading.Event()
+
+    def on_update(result):
+        line = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "mode": watcher.mode,
+            "sheet": sheet,
+            "excel_only": result["excel_only"],
+            "folder_only": result["folder_only"],
+            "incomplete": result["file_counts"],
+            "missing": result["missing"],
+            "duplicates": result["duplicates"],
+        }
+        handle.write(json.dumps(line, ensure_ascii=False) + "\n")
+        handle.flush()
+
+    def on_error(exc):
+        errors.append(exc)
+        stopped.set()
+
+    watcher = FolderWatcher(args.folder, excel_bases, on_update, recursive=args.recursive,
+                            required_files=args.files_per_test, profile=get_completeness_profile(args.profile),
+                            on_error=on_error)
+    watcher.start()
+    try:
+        while not stopped.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop(timeout=5)
+        if args.output:
+            handle.close()
+    if errors:
+        raise errors[0]
+    return EXIT_OK
+
+
+def write_output(payload: Dict[str, object], rows: Rows, output_format: str, output_path: Optional[str]):
+    """
+    Write the command result as JSON (full payload) or CSV (section, name, detail rows).
+    """
+    handle = open(output_path, 'w', encoding='utf-8', newline='') if output_path else sys.stdout
+    try:
+        if output_format == "csv":
+            writer = csv.writer(handle)
+            writer.writerow(["section", "name", "detail"])
+            writer.writerows(rows)
+        else:
+            json.dump(payload, handle, ensure_ascii=False, indent=2)
+            handle.write("\n")
+    finally:
+        if output_path:
+            handle.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="namecheck",
+        description="Compare Excel test lists with data folders without the graphical interface.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", choices=["json", "csv"], default="json", help="Output format (default: json)")
+    output.add_argument("--output", "-o", help="Write the result to this file instead of stdout")
+
+    excel = argparse.ArgumentParser(add_help=False)
+    excel.add_argument("--excel", required=True, help="Excel workbook with the test list")
+    excel.add_argument("--sheet", help="Sheet name (default: first sheet)")
+
+    folders = argparse.ArgumentParser(add_help=False)
+    folders.add_argument("--folder", action="append", required=True,
+                         help="Data folder; repeat to check several folders")
+    folders.add_argument("--recursive", action="store_true", help="Include subfolders")
+
+    completeness = argparse.ArgumentParser(add_help=False)
+    completeness.add_argument("--files-per-test", type=int, default=FILES_PER_TEST,
+                              help=f"Required files per test number (default: {FILES_PER_TEST})")
+    completeness.add_argument("--profile", choices=sorted(COMPLETENESS_PROFILES), default=COMPLETENESS_PROFILE,
+                              help="Check the file kinds of this completeness profile instead of the file count")
+
+    workers = argparse.ArgumentParser(add_help=False)
+    workers.add_argument("--workers", type=int, default=FS_WORKERS,
+                         help=f"Parallel file operations (default: {FS_WORKERS})")
+
+    compare = subparsers.add_parser("compare", parents=[output, excel, folders, completeness],
+                                    help="Compare Excel filenames with folder files")
+    compare.add_argument("--verify-sizes", action="store_true",
+                         help="Report empty or undersized files (uses the scan metadata, no file reads)")
+    compare.add_argument("--hash", action="store_true",
+                         help=f"Also hash every file ({HASH_ALGORITHM}); unchanged files reuse cached digests")
+    compare.add_argument("--find-duplicates", action="store_true",
+                         help="Report files with identical contents (size, then sampled, then full hashes)")
+    compare.add_argument("--export", metavar="PATH",
+                         help="Also write the result sections to a .csv, .xlsx or .parquet file")
+    compare.set_defaults(func=cmd_compare)
+
+    rename_plan = subparsers.add_parser("rename-plan", parents=[output],
+                                        help="Show the unified-suffix rename plan")
+    rename_plan.add_argument("--folder", required=True, help="Data folder")
+    rename_plan.add_argument("--suffix", required=True, help="Suffix to unify")
+    rename_plan.set_defaults(func=cmd_rename_plan)
+
+    rename_apply = subparsers.add_parser("rename-apply", parents=[output, workers],
+                                         help="Apply the unified-suffix rename plan")
+    rename_apply.add_argument("--folder", required=True, help="Data folder")
+    rename_apply.add_argument("--suffix", help="Suffix to unify")
+    rename_apply.add_argument("--no-journal", action="store_true", help="Do not write a rename journal")
+    rename_apply.add_argument("--resume", action="store_true",
+                              help="Resume an interrupted rename from its journal instead of planning")
+    rename_apply.add_argument("--force", action="store_true",
+                              help="Start a new rename even if an interrupted one was found (discards its journal)")
+    rename_apply.set_defaults(func=cmd_rename_apply)
+
+    group = subparsers.add_parser("group", parents=[output, excel],
+                                  help="Move files into folders named after an Excel column")
+    group.add_argument("--folder", required=True, help="Data folder")
+    group.add_argument("--group-column", default="L", help="Column with the target folder names (default: L)")
+    group.add_argument("--names-column", default="M", help="Column with the filenames (default: M)")
+    group.add_argument("--dry-run", action="store_true", help="Only show the planned moves")
+    group.set_defaults(func=cmd_group)
+
+    delete = subparsers.add_parser("delete-folder-only", parents=[output, excel, folders, workers],
+                                   help="Delete files of tests that are in the folder but not in Excel")
+    delete.add_argument("--yes", action="store_true",
+                        help="Delete the files (without it they are only listed)")
+    delete.add_argument("--dry-run", action="store_true",
+                        help="Only list the files that would be deleted (the default; overrides --yes)")
+    delete.set_defaults(func=cmd_delete_folder_only)
+
+    batch = subparsers.add_parser("batch", parents=[output],
+                                  help="Compare every (workbook, sheet, folder) row of a CSV/YAML manifest")
+    batch.add_argument("--manifest", required=True,
+                       help="CSV or YAML manifest with excel, sheet, folder, files_per_test columns")
+    batch.add_argument("--excel-workers", type=int, default=BATCH_EXCEL_WORKERS,
+                       help="Processes used to parse workbooks (default: CPU count)")
+    batch.set_defaults(func=cmd_batch)
+
+    watch = subparsers.add_parser("watch", parents=[excel, folders, completeness],
+                                  help="Keep comparing while files arrive; print one JSON line per change")
+    watch.add_argument("--output", "-o", help="Append the JSON lines to this file instead of stdout")
+    watch.set_defaults(func=cmd_watch)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行主入口，返回退出码
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "rename-apply" and not args.resume and not args.suffix:
+        parser.error("rename-apply requires --suffix unless --resume is given")
+    if args.command == "rename-apply" and args.resume and args.no_journal:
+        parser.error("rename-apply: --resume cannot be combined with --no-journal")
+    if args.command == "rename-apply" and args.resume and args.force:
+        parser.error("rename-apply: --force cannot be combined with --resume")
+
+    try:
+        if args.command == "watch":
+            return cmd_watch(args)
+        payload, rows, exit_code = args.func(args)
+        write_output(payload, rows, args.format, args.output)
+    except Exception as exc:
+        print(f"namecheck {args.command}: error: {exc}", file=sys.stderr)
+        return EXIT_ERROR
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
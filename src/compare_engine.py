@@ -0,0 +1,206 @@
+"""
+Excel与文件夹文件名比对引擎
+"""
+
+import os
+from typing import Collection, Dict, Iterable, List, Optional
+
+from config.settings import FILES_PER_TEST
+from src.completeness import CompletenessProfile, find_missing_artifacts, missing_artifacts
+from src.excel_utils import ExcelBaseStream
+from src.filename_parser import extract_filename_base
+
+
+def compare_bases(
+    excel_bases: Iterable[str],
+    folder_filenames: Iterable[str],
+    required_files: int = FILES_PER_TEST,
+    profile: Optional[CompletenessProfile] = None,
+) -> Dict[str, object]:
+    """
+    Compare filename bases found in Excel against the files of a folder.
+
+    Both inputs are consumed exactly once and indexed in hash maps, so the
+    comparison is linear in the number of Excel cells and folder files.
+
+    Args:
+        excel_bases: 从Excel中提取的文件名基本部分（可包含重复项）
+        folder_filenames: 文件夹中的文件名或文件路径
+        required_files: 每个测试编号至少需要的文件数量
+        profile: 完整性配置，给定时按文件种类检查（代替数量检查）
+
+    Returns:
+        结果字典:
+        - excel_only: 在Excel中但不在文件夹中的基本部分（已排序）
+        - folder_only: 在文件夹中但不在Excel中的基本部分（已排序）
+        - incomplete: 文件数量不足（或缺少配置中文件种类）的基本部分（已排序）
+        - missing: 基本部分 -> 缺少的文件种类（仅在给定 profile 时非空）
+        - duplicates: Excel中重复出现的基本部分（按首次重复的顺序）
+        - files_by_base: 基本部分 -> 文件名/路径列表
+    """
+    if required_files <= 0:
+        raise ValueError("required_files must be a positive integer")
+
+    # 文件夹侧：按基本部分分组，传入路径时只解析文件名部分
+    files_by_base: Dict[str, List[str]] = {}
+    for item in folder_filenames:
+        base = extract_filename_base(os.path.basename(item))
+        if base:
+            files_by_base.setdefault(base, []).append(item)
+
+    return compare_indexed(excel_bases, files_by_base, required_files, profile)
+
+
+def _first_duplicates(bases: Iterable[str]) -> List[str]:
+    """
+    Bases that occur more than once, in the order of their first repetition.
+    """
+    counts: Dict[str, int] = {}
+    duplicates: List[str] = []
+    for base in bases:
+        if not base:
+            continue
+        count = counts[base] = counts.get(base, 0) + 1
+        if count == 2:
+            duplicates.append(base)
+    return duplicates
+
+
+def _excel_duplicates(excel_bases: Iterable[str], duplicates: List[str]) -> List[str]:
+    """
+    A streamed sheet is consumed in row order; its duplicates are reported in
+    column order like those of a DataFrame-backed index.
+    """
+    if isinstance(excel_bases, ExcelBaseStream):
+        return _first_duplicates(excel_bases.ordered)
+    return duplicates
+
+
+def compare_indexed(
+    excel_bases: Iterable[str],
+    files_by_base: Dict[str, Collection[str]],
+    required_files: int = FILES_PER_TEST,
+    profile: Optional[CompletenessProfile] = None,
+) -> Dict[str, object]:
+    """
+    Same as compare_bases, for a folder side that is already indexed by base
+    (e.g. kept up to date incrementally by a FolderSnapshot).
+
+    Args:
+        excel_bases: 从Excel中提取的文件名基本部分（可包含重复项）
+        files_by_base: 基本部分 -> 文件名/路径集合
+        required_files: 每个测试编号至少需要的文件数量
+        profile: 完整性配置，给定时按文件种类检查（代替数量检查）
+
+    Returns:
+        与 compare_bases 相同的结果字典
+    """
+    if required_files <= 0:
+        raise ValueError("required_files must be a positive integer")
+
+    # Excel侧：dict保持插入顺序，同时记录出现次数
+    excel_counts: Dict[str, int] = {}
+    duplicates: List[str] = []
+    for base in excel_bases:
+        if not base:
+            continue
+        count = excel_counts.get(base, 0) + 1
+        excel_counts[base] = count
+        if count == 2:
+            duplicates.append(base)
+    duplicates = _excel_duplicates(excel_bases, duplicates)
+
+    excel_only = sorted(base for base in excel_counts if base not in files_by_base)
+    folder_only = sorted(base for base in files_by_base if base not in excel_counts)
+    if profile is not None:
+        missing = find_missing_artifacts(files_by_base, profile)
+        incomplete = list(missing)
+    else:
+        missing = {}
+        incomplete = sorted(
+            base for base, files in files_by_base.items()
+            if len(set(files)) < required_files
+        )
+
+    return {
+        "excel_only": excel_only,
+        "folder_only": folder_only,
+        "incomplete": incomplete,
+        "missing": missing,
+        "duplicates": duplicates,
+        "files_by_base": files_by_base,
+    }
+
+
+class LiveComparison:
+    """
+    Comparison result kept up to date while folder contents change.
+
+    The Excel side is indexed once. After a folder change only the bases
+    whose files changed are re-evaluated, so an update costs time in the
+    number of changed bases, not in the size of the folder.
+    """
+    def __init__(self, excel_bases: Iterable[str], required_files: int = FILES_PER_TEST,
+                 profile: Optional[CompletenessProfile] = None):
+        if required_files <= 0:
+            raise ValueError("required_files must be a positive integer")
+        self.required_files = required_files
+        self.profile = profile
+        self.excel_counts: Dict[str, int] = {}
+        self.duplicates: List[str] = []
+        for base in excel_bases:
+            if not base:
+                continue
+            count = self.excel_counts.get(base, 0) + 1
+            self.excel_counts[base] = count
+            if count == 2:
+                self.duplicates.append(base)
+        self.duplicates = _excel_duplicates(excel_bases, self.duplicates)
+        self.file_counts: Dict[str, int] = {}
+        self.excel_only = set(self.excel_counts)
+        self.folder_only: set = set()
+        self.incomplete: set = set()
+        self.missing: Dict[str, List[str]] = {}
+
+    def update(self, base: str, files: Collection[str]):
+        """
+        Record the current files of one base (empty when it has no files left).
+        """
+        count = len(set(files))
+        in_excel = base in self.excel_counts
+        if count:
+            self.file_counts[base] = count
+            self.excel_only.discard(base)
+            if not in_excel:
+                self.folder_only.add(base)
+        else:
+            self.file_counts.pop(base, None)
+            self.folder_only.discard(base)
+            if in_excel:
+                self.excel_only.add(base)
+        if self.profile is not None:
+            missing = missing_artifacts(files, self.profile) if count else []
+            if missing:
+                self.missing[base] = missing
+            else:
+                self.missing.pop(base, None)
+            is_incomplete = bool(missing)
+        else:
+            is_incomplete = 0 < count < self.required_files
+        if is_incomplete:
+            self.incomplete.add(base)
+        else:
+            self.incomplete.discard(base)
+
+    def result(self) -> Dict[str, object]:
+        """
+        Current result in the compare_bases format (without files_by_base).
+        """
+        return {
+            "excel_only": sorted(self.excel_only),
+            "folder_only": sorted(self.folder_only),
+            "incomplete": sorted(self.incomplete),
+            "missing": {base: self.missing[base] for base in sorted(self.missing)},
+            "duplicates": list(self.duplicates),
+            "file_counts": {base: self.file_counts[base] for base in sorted(self.incomplete)},
+        }
@@ -0,0 +1,75 @@
+"""
+完整性配置：按文件种类（额外后缀 + 扩展名）检查每个测试编号缺少哪些文件
+"""
+
+import os
+from typing import Collection, Dict, FrozenSet, List, NamedTuple, Optional
+
+from config.settings import COMPLETENESS_PROFILES
+from src.filename_parser import parse_filename
+
+
+class CompletenessProfile(NamedTuple):
+    """
+    Files every test number must have, as artifact keys such as ".blf" or "_inside.mp4".
+    """
+    name: str
+    artifacts: FrozenSet[str]
+
+
+def artifact_key(file_name: str) -> Optional[str]:
+    """
+    Kind of a file within its test: "_" + extra suffix (if any) + extension, lower case
+
+    2025_04_15_155131_DA00097_A_inside.mp4 -> "_inside.mp4"
+    2025_04_15_155131_DA00097_A.blf        -> ".blf"
+    """
+    parsed = parse_filename(os.path.basename(file_name))
+    if parsed is None:
+        return None
+    if parsed.extra_suffix:
+        return f"_{parsed.extra_suffix}{parsed.extension}".lower()
+    return parsed.extension.lower()
+
+
+def get_completeness_profile(name: Optional[str]) -> Optional[CompletenessProfile]:
+    """
+    Look up a profile from COMPLETENESS_PROFILES; None or "" means count-only checking.
+    """
+    if not name:
+        return None
+    artifacts = COMPLETENESS_PROFILES.get(name)
+    if artifacts is None:
+        available = ", ".join(COMPLETENESS_PROFILES) or "none configured"
+        raise ValueError(f"Unknown completeness profile '{name}' (available: {available})")
+    return CompletenessProfile(name, frozenset(key.lower() for key in artifacts))
+
+
+def missing_artifacts(files: Collection[str], profile: CompletenessProfile) -> List[str]:
+    """
+    Return the sorted artifact keys of the profile that none of the files provides.
+    """
+    missing = set(profile.artifacts)
+    for file_name in files:
+        missing.discard(artifact_key(file_name))
+        if not missing:
+            return []
+    return sorted(missing)
+
+
+def find_missing_artifacts(
+    files_by_base: Dict[str, Collection[str]],
+    profile: CompletenessProfile,
+) -> Dict[str, List[str]]:
+    """
+    基本部分 -> 缺少的文件种类（只包含不完整的测试编号，按基本部分排序）
+
+    Runs in one pass over the folder index; filenames are parsed through the
+    cached parse_filename, so repeated checks of the same folder are cheap.
+    """
+    result: Dict[str, List[str]] = {}
+    for base in sorted(files_by_base):
+        missing = missing_artifacts(files_by_base[base], profile)
+        if missing:
+            result[base] = missing
+    return result
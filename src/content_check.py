@@ -0,0 +1,292 @@
+"""
+文件内容校验：空文件/过小文件检查、可选的并行内容哈希（带缓存）以及重复内容查找
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.settings import (
+    CACHE_DIR, DIGEST_CACHE_MAX_ENTRIES, DUPLICATE_SAMPLE_SIZE, HASH_ALGORITHM, HASH_CHUNK_SIZE, HASH_WORKERS,
+    VERIFY_MIN_FILE_SIZE, VERIFY_MIN_FILE_SIZES,
+)
+from src.fs_executor import execute_file_operations
+
+DIGEST_CACHE_PATH = os.path.join(CACHE_DIR, "content_digests.json")
+
+# path -> (size, mtime), as returned by load_folder_listing
+FileStats = Dict[str, Tuple[int, float]]
+
+
+def find_undersized_files(
+    file_stats: FileStats,
+    min_size: int = VERIFY_MIN_FILE_SIZE,
+    min_sizes: Optional[Dict[str, int]] = None,
+) -> List[Tuple[str, int]]:
+    """
+    返回小于最小大小的文件 [(路径, 大小)]（按路径排序）
+
+    只使用传入的大小信息，不访问文件内容。
+
+    Args:
+        file_stats: 文件路径 -> (大小, 修改时间)，须为当前值（load_folder_listing 返回的值）
+        min_size: 默认最小字节数（1 表示只报告空文件）
+        min_sizes: 按扩展名覆盖最小字节数，默认 VERIFY_MIN_FILE_SIZES
+    """
+    if min_sizes is None:
+        min_sizes = VERIFY_MIN_FILE_SIZES
+    min_sizes = {extension.lower(): size for extension, size in min_sizes.items()}
+    undersized = []
+    for path, (size, _) in file_stats.items():
+        limit = min_sizes.get(os.path.splitext(path)[1].lower(), min_size) if min_sizes else min_size
+        if size < limit:
+            undersized.append((path, size))
+    undersized.sort()
+    return undersized
+
+
+def new_hasher(algorithm: str = HASH_ALGORITHM):
+    """
+    Create a hash object: xxhash for "xxh*" names (optional package), hashlib otherwise.
+    """
+    if algorithm.startswith("xxh"):
+        try:
+            import xxhash
+        except ImportError:
+            raise ValueError(f"Hash algorithm '{algorithm}' requires xxhash (pip install xxhash)") from None
+        factory = getattr(xxhash, algorithm, None)
+        if factory is None:
+            raise ValueError(f"Unknown xxhash algorithm: {algorithm}")
+        return factory()
+    try:
+        return hashlib.new(algorithm)
+    except ValueError:
+        raise ValueError(f"Unknown hash algorithm: {algorithm}") from None
+
+
+def file_digest(path: str, algorithm: str = HASH_ALGORITHM, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    计算文件内容哈希
+
+    Reads into one reusable buffer (no per-chunk allocations); hashlib and
+    xxhash release the GIL while hashing, so several files hash in parallel threads.
+    """
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as handle:
+        while True:
+            count = handle.readinto(buffer)
+            if not count:
+                break
+            hasher.update(view[:count])
+    return hasher.hexdigest()
+
+
+def sample_digest(path: str, sample_size: int, algorithm: str = HASH_ALGORITHM) -> str:
+    """
+    Hash of the first and last sample_size bytes of a file (the whole file if it is smaller).
+    """
+    hasher = new_hasher(algorithm)
+    with open(path, 'rb') as handle:
+        hasher.update(handle.read(sample_size))
+        size = os.fstat(handle.fileno()).st_size
+        if size > sample_size:
+            handle.seek(max(sample_size, size - sample_size))
+            hasher.update(handle.read(sample_size))
+    return hasher.hexdigest()
+
+
+class DigestCache:
+    """
+    Content digests persisted by path and algorithm and validated against
+    (size, mtime), so repeated runs hash only new or modified files.
+
+    At most max_entries files are kept; the least recently used ones are
+    dropped when the cache is saved.
+    """
+    def __init__(self, path: str = DIGEST_CACHE_PATH, max_entries: int = DIGEST_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._changed = False
+        try:
+            with open(path, encoding='utf-8') as handle:
+                self._entries: Dict[str, dict] = json.load(handle)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, path: str, size: int, mtime: float, algorithm: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(path)
+            record = entry.get(algorithm) if isinstance(entry, dict) else None
+            if record and record[:2] == [size, mtime]:
+                # Most recently used last; the order is persisted with the next save
+                self._entries[path] = self._entries.pop(path)
+                return record[2]
+        return None
+
+    def put(self, path: str, size: int, mtime: float, algorithm: str, digest: str):
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if not isinstance(entry, dict) or any(record[:2] != [size, mtime] for record in entry.values()):
+                # Digests of an older version of the file are dropped
+                entry = {}
+            entry[algorithm] = [size, mtime, digest]
+            self._entries[path] = entry
+            self._changed = True
+
+    def save(self):
+        with self._lock:
+            if not self._changed:
+                return
+            for stale in list(self._entries)[:max(0, len(self._entries) - self.max_entries)]:
+                del self._entries[stale]
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp{os.getpid()}"
+                with open(tmp_path, 'w', encoding='utf-8') as handle:
+                    json.dump(self._entries, handle, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+                self._changed = False
+            except OSError:
+                pass
+
+
+def hash_files(
+    file_stats: FileStats,
+    algorithm: str = HASH_ALGORITHM,
+    max_workers: int = HASH_WORKERS,
+    cache: Optional[DigestCache] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    sample_size: Optional[int] = None,
+) -> Dict[str, object]:
+    """
+    在线程池中计算文件内容哈希，已缓存且未变化的文件不再读取
+
+    Args:
+        file_stats: 文件路径 -> (大小, 修改时间)，须为当前值（用于匹配缓存）
+        algorithm: 哈希算法，参见 HASH_ALGORITHM
+        max_workers: 并行线程数
+        cache: 哈希缓存，None 时使用默认位置的 DigestCache
+        progress: 可选的进度回调 progress(已处理数量, 需要读取的文件数量)
+        cancel_event: 可选的取消标志
+        sample_size: 给定时只对文件首尾各 sample_size 字节计算哈希（见 sample_digest）
+
+    Returns:
+        {"digests": {路径: 哈希}, "errors": [(路径, 错误)], "hashed": 读取的文件数,
+         "cached": 使用缓存的文件数, "cancelled": bool}
+    """
+    new_hasher(algorithm)  # fail early on an unknown algorithm
+    if cache is None:
+        cache = DigestCache()
+    # Sample digests are cached next to full digests under their own key
+    cache_key = f"{algorithm}:sample{sample_size}" if sample_size else algorithm
+    digests: Dict[str, str] = {}
+    pending: List[str] = []
+    for path, (size, mtime) in file_stats.items():
+        digest = cache.get(path, size, mtime, cache_key)
+        if digest is None:
+            pending.append(path)
+        else:
+            digests[path] = digest
+
+    def hash_one(path: str):
+        if sample_size:
+            digest = sample_digest(path, sample_size, algorithm)
+        else:
+            digest = file_digest(path, algorithm)
+        # A file that vanished after hashing is an error, without a digest
+        stat = os.stat(path)
+        digests[path] = digest
+        # Not cached if the file changed since the scan (e.g. still being copied)
+        if (stat.st_size, stat.st_mtime) == tuple(file_stats[path]):
+            cache.put(path, stat.st_size, stat.st_mtime, cache_key, digest)
+
+    result = execute_file_operations(
+        pending, hash_one, max_workers=max_workers, progress=progress, cancel_event=cancel_event
+    )
+    cache.save()
+    return {
+        "digests": digests,
+        "errors": [(pending[index], err) for index, err in result["failed"]],
+        "hashed": len(result["succeeded"]),
+        "cached": len(file_stats) - len(pending),
+        "cancelled": result["cancelled"],
+    }
+
+
+def _group_by(paths: List[str], key: Callable[[str], object]) -> List[List[str]]:
+    """
+    Groups of two or more paths sharing the same key.
+    """
+    groups: Dict[object, List[str]] = {}
+    for path in paths:
+        groups.setdefault(key(path), []).append(path)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_duplicate_contents(
+    file_stats: FileStats,
+    sample_size: int = DUPLICATE_SAMPLE_SIZE,
+    algorithm: str = HASH_ALGORITHM,
+    max_workers: int = HASH_WORKERS,
+    cache: Optional[DigestCache] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, object]:
+    """
+    查找内容相同的文件
+
+    Three narrowing stages, each only for the candidates left by the previous one:
+    1. files are bucketed by size (free, from the scan metadata; empty files are skipped),
+    2. same-size files are compared by a hash of their first and last sample_size bytes,
+    3. files that still match are hashed completely.
+    Stages 2 and 3 run on a thread pool and reuse cached digests.
+
+    Args:
+        file_stats: 文件路径 -> (大小, 修改时间)
+        sample_size: 首尾采样的字节数
+        algorithm, max_workers, cache, progress, cancel_event: 参见 hash_files
+
+    Returns:
+        {"groups": [[路径, ...], ...]（每组内容相同，按路径排序）, "errors": [(路径, 错误)],
+         "hashed": 第3阶段完整读取的文件数, "cancelled": bool}
+    """
+    if cache is None:
+        cache = DigestCache()
+    result: Dict[str, object] = {"groups": [], "errors": [], "hashed": 0, "cancelled": False}
+    non_empty = [path for path, (size, _) in file_stats.items() if size > 0]
+    candidates = _group_by(non_empty, lambda path: file_stats[path][0])
+
+    confirmed: List[List[str]] = []
+    for stage_sample in (sample_size, None):
+        if stage_sample is None:
+            # Files of up to 2 * sample_size bytes were read completely by the sample stage
+            confirmed += [group for group in candidates if file_stats[group[0]][0] <= 2 * sample_size]
+            candidates = [group for group in candidates if file_stats[group[0]][0] > 2 * sample_size]
+        paths = [path for group in candidates for path in group]
+        if not paths:
+            break
+        hashed = hash_files(
+            {path: file_stats[path] for path in paths}, algorithm, max_workers, cache,
+            progress, cancel_event, sample_size=stage_sample,
+        )
+        result["errors"] += hashed["errors"]
+        if hashed["cancelled"]:
+            result["cancelled"] = True
+            return result
+        if stage_sample is None:
+            result["hashed"] = hashed["hashed"]
+        digests = hashed["digests"]
+        candidates = [
+            subgroup
+            for group in candidates
+            for subgroup in _group_by([path for path in group if path in digests], digests.get)
+        ]
+
+    result["groups"] = sorted(sorted(group) for group in confirmed + candidates)
+    return result
@@ -3,11 +3,21 @@ Excel处理相关的工具函数
 """
 
 import re
-import pandas as pd
-from typing import List, Tuple, Set, Dict, Union
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Tuple, Set, Dict, Union
 
 from config.settings import FILENAME_PATTERN
 
+# pandas/openpyxl are imported on first use: loading them takes several
+# seconds in the frozen build and would delay the main window.
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 单元格内常见分隔符：换行符、逗号、分号、空格
+FILENAME_DELIMITERS = r'[\n,; ]+'
+
+# 匹配文件名基本部分并吞掉所在分割片段的剩余部分，保证每个片段只取第一个匹配
+_TOKEN_BASE_RE = re.compile(rf'({FILENAME_PATTERN})[^\n,; ]*')
+
 def split_filenames(cell_value):
     """
     使用多种分隔符分割单元格内容
@@ -19,58 +29,74 @@ def split_filenames(cell_value):
         分割后的文件名列表
     """
     if isinstance(cell_value, str):
-        # 使用常见分隔符：换行符、逗号、分号、空格
-        delimiters = r'[\n,; ]+'
-        return re.split(delimiters, cell_value)
+        return re.split(FILENAME_DELIMITERS, cell_value)
     return []
 
-def scan_excel_for_filenames(df: pd.DataFrame) -> Tuple[pd.Series, List[str], int]:
+def extract_excel_filename_series(df: "pd.DataFrame") -> "pd.Series":
     """
-    扫描整个Excel表格，找出所有符合模式的文件名
+    按列顺序提取Excel中所有符合模式的文件名基本部分（保留重复项）
+
+    整张表按列优先展开后，只对字符串单元格做一次正则扫描，避免逐列、逐单元格的Python循环。
     
     Args:
         df: pandas DataFrame对象
         
     Returns:
-        Tuple包含：
-        - 所有唯一的文件名（pandas.Series）
-        - 重复的文件名列表
-        - 不同测试编号的数量
+        文件名基本部分（pandas.Series）
     """
-    all_filenames = []
-    for col in df.columns:
-        column_data = df[col].dropna().apply(split_filenames).explode()
-        column_filenames = column_data.apply(lambda x: extract_filename_base(str(x))).dropna()
-        all_filenames.extend(column_filenames)
-    
-    # 转换为Series并找出重复项
-    filename_series = pd.Series(all_filenames)
-    duplicates = filename_series[filename_series.duplicated()].unique()
-    unique_filenames = filename_series.drop_duplicates()
+    # order='F' 保持与逐列扫描相同的顺序
+    cells = df.to_numpy(dtype=object).ravel(order='F').tolist()
+    # 用分隔符连接所有字符串单元格后一次扫描，结果与逐片段 extract_filename_base 一致
+    text = '\n'.join([cell for cell in cells if isinstance(cell, str)])
+    bases = _TOKEN_BASE_RE.findall(text)
+    import pandas as pd
+    return pd.Series(bases, dtype=object)
+
+def extract_excel_filename_bases(df: "pd.DataFrame") -> List[str]:
+    """
+    按列顺序提取Excel中所有符合模式的文件名基本部分（保留重复项）
     
-    # 计算不同的测试编号数量
+    Args:
+        df: pandas DataFrame对象
+        
+    Returns:
+        文件名基本部分列表
+    """
+    return extract_excel_filename_series(df).tolist()
+
+def count_test_numbers(filenames) -> int:
+    """
+    计算不同测试编号的数量（文件名最后6位数字）
+    """
     test_numbers = set()
-    for filename in all_filenames:
+    for filename in filenames:
         if filename:
-            test_number = filename[-6:]  # 获取文件名最后6位数字
-            test_numbers.add(test_number)
-    
-    return unique_filenames, duplicates.tolist(), len(test_numbers)
+            test_numbers.add(filename[-6:])
+    return len(test_numbers)
 
-def extract_filename_base(file_name: str) -> str:
+def scan_excel_for_filenames(df: "pd.DataFrame") -> Tuple["pd.Series", List[str], int]:
     """
-    提取文件名中符合模式的基本部分 (20xx_xx_xx_xxxxxx)
+    扫描整个Excel表格，找出所有符合模式的文件名
     
     Args:
-        file_name: 待处理的文件名
+        df: pandas DataFrame对象
         
     Returns:
-        匹配的文件名基本部分，如果没有匹配则返回None
+        Tuple包含：
+        - 所有唯一的文件名（pandas.Series）
+        - 重复的文件名列表
+        - 不同测试编号的数量
     """
-    match = re.search(FILENAME_PATTERN, file_name)
-    if match:
-        return match.group(0)  # 返回匹配的模式
-    return None
+    filename_series = extract_excel_filename_series(df)
+    
+    # 找出重复项
+    duplicates = filename_series[filename_series.duplicated()].unique()
+    unique_filenames = filename_series.drop_duplicates()
+    
+    # 计算不同的测试编号数量（文件名最后6位数字）
+    test_count = filename_series.str[-6:].nunique() if not filename_series.empty else 0
+    
+    return unique_filenames, list(duplicates), int(test_count)
 
 def get_excel_sheets(file_path: str) -> List[str]:
     """
@@ -82,7 +108,10 @@ def get_excel_sheets(file_path: str) -> List[str]:
     Returns:
         sheet名称列表
     """
-    return pd.ExcelFile(file_path).sheet_names
+    import pandas as pd
+
+    with pd.ExcelFile(file_path) as excel_file:
+        return excel_file.sheet_names
 
 def _column_letter_to_index(column_ref: str) -> int:
     """
@@ -99,7 +128,7 @@ def _column_letter_to_index(column_ref: str) -> int:
     return index - 1
 
 
-def _resolve_column(df: pd.DataFrame, column_ref: Union[str, int]):
+def _resolve_column(df: "pd.DataFrame", column_ref: Union[str, int]):
     """
     Resolve pandas column using Excel column notation, integer index, or explicit column name.
     """
@@ -121,7 +150,8 @@ def _normalize_group_value(value) -> str:
     """
     Normalize numeric/text cell values so they can be used as folder names.
     """
-    if pd.isna(value):
+    # None for empty openpyxl cells; NaN/NaT (pandas missing values) are not equal to themselves
+    if value is None or value != value:
         return ""
     if isinstance(value, (int, float)) and not isinstance(value, bool):
         if float(value).is_integer():
@@ -130,7 +160,7 @@ def _normalize_group_value(value) -> str:
     return str(value).strip()
 
 
-def build_group_mapping_from_excel(df: pd.DataFrame, group_column="L", names_column="M"):
+def build_group_mapping_from_excel(df: "pd.DataFrame", group_column="L", names_column="M"):
     """
     Build mapping between filenames (column M) and group labels (column L).
 
@@ -156,3 +186,133 @@ def build_group_mapping_from_excel(df: pd.DataFrame, group_column="L", names_col
         raise ValueError("No filenames found in the specified Excel columns")
     return filename_to_group, group_to_names
 
+
+
+def iter_sheet_rows(file_path: str, sheet: Optional[str] = None, skip_header: bool = True) -> Iterator[tuple]:
+    """
+    以只读流式方式逐行读取sheet（openpyxl read_only + values_only），内存占用与表格大小无关。
+
+    Args:
+        file_path: Excel文件路径
+        sheet: sheet名称，为空时读取第一个sheet（与 pd.read_excel 默认一致）
+        skip_header: 是否跳过第一行（pd.read_excel 将其作为列名）
+
+    Yields:
+        每行单元格值组成的tuple
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        if skip_header:
+            next(rows, None)
+        for row in rows:
+            yield row
+    finally:
+        workbook.close()
+
+
+class ExcelBaseStream:
+    """
+    流式扫描sheet中的文件名基本部分（保留重复项）。
+
+    Iterating yields the bases in row order while the sheet is being read, so a
+    comparison can consume them before the whole sheet is loaded. Once the sheet
+    was read completely, `ordered` holds the bases in column order, the same order
+    extract_excel_filename_bases returns for the pandas backend; iterating again
+    yields that list instead of re-reading the file.
+    """
+    def __init__(
+        self,
+        file_path: str,
+        sheet: Optional[str] = None,
+        on_complete: Optional[Callable[[List[str]], None]] = None,
+    ):
+        """
+        Args:
+            file_path: Excel文件路径
+            sheet: sheet名称，为空时读取第一个sheet
+            on_complete: 读完整个sheet后以按列顺序的列表调用一次
+        """
+        self.file_path = file_path
+        self.sheet = sheet
+        self.on_complete = on_complete
+        self._ordered: Optional[List[str]] = None
+
+    def __iter__(self) -> Iterator[str]:
+        if self._ordered is not None:
+            yield from self._ordered
+            return
+        # Per-consumer state, so an abandoned or concurrent iteration does not mix results
+        columns: List[List[str]] = []
+        for row in iter_sheet_rows(self.file_path, self.sheet):
+            for column, cell in enumerate(row):
+                if not isinstance(cell, str):
+                    continue
+                found = _TOKEN_BASE_RE.findall(cell)
+                if not found:
+                    continue
+                while len(columns) <= column:
+                    columns.append([])
+                columns[column].extend(found)
+                yield from found
+        if self._ordered is None:
+            self._ordered = [base for column in columns for base in column]
+            if self.on_complete is not None:
+                self.on_complete(self._ordered)
+
+    @property
+    def ordered(self) -> List[str]:
+        """
+        All bases in column order (reads the rest of the sheet if needed).
+        """
+        if self._ordered is None:
+            for _ in self:
+                pass
+        return self._ordered
+
+
+def build_group_mapping_streaming(file_path: str, sheet: Optional[str] = None, group_column="L", names_column="M"):
+    """
+    Streaming variant of build_group_mapping_from_excel.
+
+    Only Excel column letters or integer indices are supported, since header
+    names are not resolved while streaming.
+
+    Returns:
+        (filename_to_group, group_to_names)
+    """
+    group_idx = group_column if isinstance(group_column, int) else _column_letter_to_index(group_column)
+    names_idx = names_column if isinstance(names_column, int) else _column_letter_to_index(names_column)
+    filename_to_group: Dict[str, str] = {}
+    group_to_names: Dict[str, Set[str]] = {}
+    for row in iter_sheet_rows(file_path, sheet):
+        if group_idx >= len(row) or names_idx >= len(row):
+            continue
+        label = _normalize_group_value(row[group_idx])
+        if not label:
+            continue
+        for name in split_filenames(row[names_idx]):
+            name = name.strip()
+            if not name:
+                continue
+            filename_to_group[name] = label
+            group_to_names.setdefault(label, set()).add(name)
+    if not filename_to_group:
+        raise ValueError("No filenames found in the specified Excel columns")
+    return filename_to_group, group_to_names
+
+
+def prewarm_excel_modules():
+    """
+    Import pandas and openpyxl ahead of the first Excel operation.
+
+    Meant to run on a background thread once the window is visible, so the
+    first comparison does not pay the import cost.
+    """
+    import importlib
+
+    for module_name in ("pandas", "openpyxl"):
+        importlib.import_module(module_name)
@@ -3,29 +3,19 @@
 """
 
 import os
-import re
-from typing import List, Set, Dict, Optional, Tuple
+import threading
+from typing import Callable, Collection, List, Optional, Set, Dict, Tuple
 
-from config.settings import FILENAME_PATTERN, FILES_PER_TEST
-
-def extract_filename_base(file_name: str) -> Optional[str]:
-    """
-    提取文件名中符合模式的基本部分 (20xx_xx_xx_xxxxxx)
-    
-    Args:
-        file_name: 待处理的文件名
-        
-    Returns:
-        匹配的文件名基本部分，如果没有匹配则返回None
-    """
-    match = re.search(FILENAME_PATTERN, file_name)
-    if match:
-        return match.group(0)  # 返回匹配的模式
-    return None
+from config.settings import FILES_PER_TEST, FS_WORKERS
+from src.completeness import CompletenessProfile, find_missing_artifacts
+from src.filename_parser import extract_filename_base, parse_filename
+from src.folder_scanner import scan_folder, list_file_entries
+from src.prefix_index import PrefixIndex
+from src.rename_journal import RenameJournal, execute_rename_steps
 
 def get_folder_files(folder_path: str) -> List[str]:
     """
-    获取文件夹中的所有文件
+    获取文件夹中的所有文件（不含子目录）
     
     Args:
         folder_path: 文件夹路径
@@ -33,7 +23,7 @@ def get_folder_files(folder_path: str) -> List[str]:
     Returns:
         文件夹中的文件列表
     """
-    return os.listdir(folder_path)
+    return [entry.name for entry in list_file_entries(folder_path)]
 
 def extract_folder_filename_bases(folder_filenames: List[str]) -> Set[str]:
     """
@@ -45,15 +35,22 @@ def extract_folder_filename_bases(folder_filenames: List[str]) -> Set[str]:
     Returns:
         符合模式的文件名基本部分集合
     """
-    return set([extract_filename_base(f) for f in folder_filenames if extract_filename_base(f)])
+    bases = set()
+    for name in folder_filenames:
+        base = extract_filename_base(name)
+        if base:
+            bases.add(base)
+    return bases
 
 def check_file_completeness(
     folder_path: str,
     folder_filenames: List[str],
     required_files: int = FILES_PER_TEST,
+    profile: Optional[CompletenessProfile] = None,
 ) -> List[str]:
     """
-    Check whether each test number has the required count of files.
+    Check whether each test number has the required count of files,
+    or every file kind of the profile when one is given.
     """
     if required_files <= 0:
         raise ValueError("required_files must be a positive integer")
@@ -64,6 +61,9 @@ def check_file_completeness(
         if base_name:
             files_by_number.setdefault(base_name, set()).add(filename)
 
+    if profile is not None:
+        return list(find_missing_artifacts(files_by_number, profile))
+
     incomplete_numbers = []
     for number, files in files_by_number.items():
         if len(files) < required_files:
@@ -87,6 +87,53 @@ def build_files_by_base_map(
         files_map.setdefault(base, []).append(os.path.join(folder_path, name))
     return files_map
 
+def fully_deleted_bases(
+    bases: List[str],
+    files_by_base: Dict[str, Collection[str]],
+    deleted: List[str],
+) -> List[str]:
+    """
+    Return the bases whose files were all deleted (in the order of bases);
+    bases with a failed or skipped (cancelled) deletion are not included.
+    """
+    deleted_paths = set(deleted)
+    return [
+        base for base in bases
+        if files_by_base.get(base) and all(path in deleted_paths for path in files_by_base[base])
+    ]
+
+def build_group_plan(folder_path: str, filename_to_group: Dict[str, str]):
+    """
+    将文件夹中的文件与Excel文件名按最长前缀匹配，规划目标子文件夹
+
+    Args:
+        folder_path: 文件夹路径
+        filename_to_group: Excel文件名 -> 分组值（目标子文件夹名）
+
+    Returns:
+        (plan, unmatched_files, missing_excel, filename_to_group)
+        - plan: [(src_path, dest_path, file_name, group_value, target_dir, matched_excel_name), ...]
+        - unmatched_files: 未匹配到Excel文件名的文件名
+        - missing_excel: 在文件夹中没有对应文件的Excel文件名集合
+    """
+    prefix_index = PrefixIndex(filename_to_group.keys())
+    plan = []
+    unmatched_files = []
+    missing_excel = set(filename_to_group.keys())
+    for folder_entry in list_file_entries(folder_path):
+        entry = folder_entry.name
+        stem = os.path.splitext(entry)[0]
+        matched = prefix_index.longest_prefix(stem.strip())
+        if not matched:
+            unmatched_files.append(entry)
+            continue
+        group_value = filename_to_group[matched]
+        target_dir = os.path.join(folder_path, group_value)
+        dest_path = os.path.join(target_dir, entry)
+        plan.append((folder_entry.path, dest_path, entry, group_value, target_dir, matched))
+        missing_excel.discard(matched)
+    return plan, unmatched_files, missing_excel, filename_to_group
+
 def build_suffix_rename_plan(folder_path: str, new_suffix: str) -> Tuple[List[Tuple[str, str]], List[str], List[Tuple[str, str]]]:
     """
     基于文件名模式，生成“统一后缀”的重命名计划。
@@ -103,9 +150,11 @@ def build_suffix_rename_plan(folder_path: str, new_suffix: str) -> Tuple[List[Tu
 
     Returns:
         (changes, skipped, conflicts)
-        - changes: 计划变更列表 [(old_path, new_path), ...]
+        - changes: 计划变更列表 [(old_path, new_path), ...]，已按执行顺序排列；
+          链式重命名先腾出目标名称，循环重命名经由临时名称完成
         - skipped: 被跳过的文件名列表（不匹配或无需修改）
-        - conflicts: 与现有文件冲突的变更 [(old_path, conflict_path)]
+        - conflicts: 与现有文件冲突的变更 [(old_path, conflict_path)]；
+          目标名称被计划中同样会改名的文件占用时不算冲突
     """
     if not new_suffix:
         raise ValueError("new_suffix 不能为空")
@@ -113,86 +162,205 @@ def build_suffix_rename_plan(folder_path: str, new_suffix: str) -> Tuple[List[Tu
     # 允许用户传入包含前导下划线的后缀，统一规范为不带下划线，并在拼接时添加
     normalized_suffix = new_suffix.lstrip('_')
 
-    folder_files = get_folder_files(folder_path)
-    changes: List[Tuple[str, str]] = []
+    folder_entries = scan_folder(folder_path)
+    # 现有名称集合（normcase 键），冲突检测完全在内存中进行，无需逐个 stat
+    existing_keys = {os.path.normcase(entry.name) for entry in folder_entries}
     skipped: List[str] = []
     conflicts: List[Tuple[str, str]] = []
+    # 源名称键 -> (旧名称, 新名称)，保持目录顺序
+    moves: Dict[str, Tuple[str, str]] = {}
+    claimed_targets = set()
 
-    pattern = re.compile(FILENAME_PATTERN)
-
-    for name in folder_files:
+    for entry in folder_entries:
+        name = entry.name
         # 跳过子目录，仅处理文件
-        old_full_path = os.path.join(folder_path, name)
-        if os.path.isdir(old_full_path):
+        if not entry.is_file:
             skipped.append(name)
             continue
 
-        match = pattern.search(name)
-        if not match:
+        parsed = parse_filename(name)
+        if not parsed:
             skipped.append(name)
             continue
 
-        base = match.group(0)
-
-        # 分离扩展名
-        root, ext = os.path.splitext(name)
-
-        # root 的格式一般为: 2025_08_18_134120[_第一个后缀][_额外后缀]
-        # 我们需要将第一个后缀（如 DA00097_A）替换为 normalized_suffix
+        # 将第一个后缀（如 DA00097_A）替换为 normalized_suffix，
         # 保留后面的 _inside, _outside 等额外后缀
-        
-        # 找到 base 后的内容
-        remaining = root[len(base):]  # 例如: _DA00097_A_inside 或 _DA00097_A
-        
-        if remaining:
-            # 检查是否有额外后缀（如 _inside, _outside）
-            # 假设第一个后缀格式是 _XXXXXXX_X，额外后缀是 _word
-            parts = remaining.split('_')
-            if len(parts) >= 4:  # ['', 'DA00097', 'A', 'inside'] 或 ['', 'DA00097', 'A', 'outside']
-                # 有额外后缀，保留它
-                extra_suffix = '_' + '_'.join(parts[3:])  # _inside 或 _outside
-                new_root = f"{base}_{normalized_suffix}{extra_suffix}"
-            else:
-                # 没有额外后缀，只有第一个后缀
-                new_root = f"{base}_{normalized_suffix}"
-        else:
-            # 如果 root == base，说明原来无后缀
-            new_root = f"{base}_{normalized_suffix}"
-            
-        new_name = new_root + ext
+        new_root = f"{parsed.base}_{normalized_suffix}"
+        if parsed.extra_suffix:
+            new_root += f"_{parsed.extra_suffix}"
+
+        new_name = new_root + parsed.extension
 
         if new_name == name:
             # 已经是期望命名，无需修改
             skipped.append(name)
             continue
 
-        new_full_path = os.path.join(folder_path, new_name)
-        if os.path.exists(new_full_path):
-            conflicts.append((old_full_path, new_full_path))
+        target_key = os.path.normcase(new_name)
+        if target_key in claimed_targets:
+            # 计划中已有其他文件要使用同一个新名称
+            conflicts.append((entry.path, os.path.join(folder_path, new_name)))
             continue
+        claimed_targets.add(target_key)
+        moves[os.path.normcase(name)] = (name, new_name)
 
-        changes.append((old_full_path, new_full_path))
+    ok = _resolve_rename_conflicts(moves, existing_keys)
+    for key, (name, new_name) in moves.items():
+        if key not in ok:
+            conflicts.append((os.path.join(folder_path, name), os.path.join(folder_path, new_name)))
 
+    changes = [
+        (os.path.join(folder_path, old_name), os.path.join(folder_path, new_name))
+        for old_name, new_name in _order_renames(moves, ok, existing_keys)
+    ]
     return changes, skipped, conflicts
 
-def apply_rename_plan(changes: List[Tuple[str, str]]) -> Dict[str, object]:
+
+def _rename_holder(moves: Dict[str, Tuple[str, str]], key: str, existing_keys: Set[str]) -> Optional[str]:
+    """
+    Return the key of the file currently holding the target name of moves[key],
+    or None when the target name is free (or only differs from the source by case).
+    """
+    target_key = os.path.normcase(moves[key][1])
+    if target_key == key or target_key not in existing_keys:
+        return None
+    return target_key
+
+
+def _resolve_rename_conflicts(moves: Dict[str, Tuple[str, str]], existing_keys: Set[str]) -> set:
+    """
+    Return the keys of the renames that can be applied.
+
+    A target held by a file that is itself renamed in the plan is not a
+    conflict, as long as that file's own rename can go ahead; a closed cycle
+    of renames is always applicable. Anything else is a true conflict.
+    """
+    status: Dict[str, bool] = {}
+    for start in moves:
+        path: List[str] = []
+        on_path = set()
+        key = start
+        while True:
+            if key in status:
+                result = status[key]
+                break
+            if key in on_path:
+                # 循环重命名：环上的文件互相让出名称
+                result = True
+                break
+            path.append(key)
+            on_path.add(key)
+            holder = _rename_holder(moves, key, existing_keys)
+            if holder is None:
+                result = True
+                break
+            if holder not in moves:
+                # 目标名称被不参与重命名的文件占用
+                result = False
+                break
+            key = holder
+        for key in path:
+            status[key] = result
+    return {key for key, result in status.items() if result}
+
+
+def _order_renames(moves: Dict[str, Tuple[str, str]], ok: set, existing_keys: Set[str]) -> List[Tuple[str, str]]:
+    """
+    Order the applicable renames so that every target name is free when its
+    rename runs: a chain A -> B -> C is emitted as B -> C, A -> B, and a cycle
+    is broken by first moving one of its files to a temporary name.
+    """
+    # 每个目标名称只被一个重命名使用，因此依赖关系只构成链和环
+    blocker: Dict[str, str] = {}
+    waiting: Dict[str, str] = {}
+    for key in moves:
+        if key not in ok:
+            continue
+        holder = _rename_holder(moves, key, existing_keys)
+        if holder is not None:
+            blocker[key] = holder
+            waiting[holder] = key
+
+    ordered: List[Tuple[str, str]] = []
+    emitted = set()
+
+    for key in moves:
+        if key not in ok or key in waiting:
+            continue
+        chain = [key]
+        while chain[-1] in blocker:
+            chain.append(blocker[chain[-1]])
+        for item in reversed(chain):
+            ordered.append(moves[item])
+            emitted.add(item)
+
+    used_keys = set(existing_keys) | {os.path.normcase(new_name) for _, new_name in moves.values()}
+    for key in moves:
+        if key not in ok or key in emitted:
+            continue
+        name, new_name = moves[key]
+        temp_name = f"{name}.renaming"
+        counter = 1
+        while os.path.normcase(temp_name) in used_keys:
+            temp_name = f"{name}.renaming{counter}"
+            counter += 1
+        used_keys.add(os.path.normcase(temp_name))
+
+        ordered.append((name, temp_name))
+        emitted.add(key)
+        item = waiting[key]
+        while item != key:
+            ordered.append(moves[item])
+            emitted.add(item)
+            item = waiting[item]
+        ordered.append((temp_name, new_name))
+
+    return ordered
+
+
+def apply_rename_plan(
+    changes: List[Tuple[str, str]],
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    journal_path: Optional[str] = None,
+    max_workers: int = FS_WORKERS,
+) -> Dict[str, object]:
     """
     执行重命名计划。
 
+    互不相关的重命名在线程池中并行执行；同一测试编号的重命名按计划顺序依次执行，
+    其中一个失败后跳过同组剩余的重命名（避免覆盖尚未腾出的目标名称）。
+    已存在的目标文件不会被覆盖（该重命名失败）。
+
     Args:
         changes: 待执行的重命名 [(old_path, new_path)]
+        progress: 可选的进度回调 progress(已处理数量, 总数量)
+        cancel_event: 可选的取消标志，被设置后停止处理剩余的重命名
+        journal_path: 可选的日志文件路径；提供时先写入完整计划，再逐条记录结果，
+            进程中断后可用 resume_rename_journal / rollback_rename_journal 恢复
+        max_workers: 并行线程数
 
     Returns:
-        执行统计信息字典 {"renamed": x, "failed": y, "failures": [(old, new, err_str), ...]}
-    """
-    renamed = 0
-    failed = 0
-    failures: List[Tuple[str, str, str]] = []
-    for old_path, new_path in changes:
-        try:
-            os.rename(old_path, new_path)
-            renamed += 1
-        except Exception as e:
-            failed += 1
-            failures.append((old_path, new_path, str(e)))
-    return {"renamed": renamed, "failed": failed, "failures": failures}
+        执行统计信息字典 {"renamed": x, "failed": y, "failures": [(old, new, err_str), ...],
+                          "cancelled": bool, "per_second": 每秒处理的文件数}
+    """
+    journal = RenameJournal.create(journal_path, changes) if journal_path else None
+    try:
+        # The planner checked the targets against the folder listing, so the
+        # cheaper lookup + rename is used; resume and rollback use link + unlink
+        result = execute_rename_steps(
+            changes, list(range(len(changes))), journal, progress, cancel_event, max_workers, atomic=False
+        )
+        if journal is not None and not result["cancelled"]:
+            journal.record_finished("complete")
+    finally:
+        if journal is not None:
+            journal.close()
+    failures = [(changes[index][0], changes[index][1], err) for index, err in result["failed"]]
+    return {
+        "renamed": len(result["succeeded"]),
+        "failed": len(failures),
+        "failures": failures,
+        "cancelled": result["cancelled"],
+        "per_second": result["per_second"],
+    }
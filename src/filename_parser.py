@@ -0,0 +1,73 @@
+"""
+文件名解析（file_utils 与 excel_utils 共用）
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from config.settings import FILENAME_PATTERN, FILENAME_PARSE_CACHE_SIZE
+
+FILENAME_RE = re.compile(FILENAME_PATTERN)
+
+
+class ParsedName(NamedTuple):
+    """
+    Parsed parts of a filename such as 2025_04_15_155131_DA00097_A_inside.mp4
+    """
+    base: str          # 2025_04_15_155131
+    date: str          # 2025_04_15
+    time: str          # 155131
+    suffix: str        # DA00097_A
+    extra_suffix: str  # inside
+    extension: str     # .mp4
+
+
+@lru_cache(maxsize=FILENAME_PARSE_CACHE_SIZE)
+def parse_filename(file_name: str) -> Optional[ParsedName]:
+    """
+    解析文件名，结果按文件名缓存（有界LRU）
+
+    Args:
+        file_name: 待处理的文件名（不含目录）
+
+    Returns:
+        ParsedName，如果文件名不包含 FILENAME_PATTERN 则返回None
+    """
+    match = FILENAME_RE.search(file_name)
+    if not match:
+        return None
+    base = match.group(0)
+    root, ext = os.path.splitext(file_name)
+
+    # 基础名之后的部分格式一般为: [_第一个后缀(XXXXXXX_X)][_额外后缀]
+    remaining = root[match.end():] if match.end() <= len(root) else ""
+    parts = remaining.split('_') if remaining else []
+    suffix = '_'.join(parts[1:3])
+    extra_suffix = '_'.join(parts[3:]) if len(parts) >= 4 else ""
+
+    return ParsedName(
+        base=base,
+        date=base[:10],
+        time=base[11:],
+        suffix=suffix,
+        extra_suffix=extra_suffix,
+        extension=ext,
+    )
+
+
+def extract_filename_base(file_name: str) -> Optional[str]:
+    """
+    提取文件名中符合模式的基本部分 (20xx_xx_xx_xxxxxx)
+
+    Args:
+        file_name: 待处理的文件名
+
+    Returns:
+        匹配的文件名基本部分，如果没有匹配则返回None
+    """
+    parsed = parse_filename(file_name)
+    if parsed:
+        return parsed.base
+    return None
@@ -0,0 +1,130 @@
+"""
+基于 os.scandir 的文件夹扫描
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, List, NamedTuple, Optional
+
+from config.settings import SCAN_WORKERS
+
+
+class FolderEntry(NamedTuple):
+    """
+    One directory entry with the metadata collected during the scan
+    (size and mtime are None unless the scan was asked for them).
+    """
+    name: str
+    path: str
+    is_file: bool
+    size: Optional[int]
+    mtime: Optional[float]
+
+
+def scan_folder(folder_path: str, with_stats: bool = False) -> List[FolderEntry]:
+    """
+    单次遍历文件夹，返回每个条目的名称、类型，以及可选的大小和修改时间
+
+    类型来自 DirEntry 的缓存信息（Linux 上为 d_type），只需要名称时不会
+    逐个文件调用 stat；with_stats 时才读取文件的大小/修改时间（Windows 上
+    由目录遍历直接提供，Linux/SMB 挂载上每个文件多一次 stat）。
+    扫描过程中消失的文件会被忽略。
+
+    Args:
+        folder_path: 文件夹路径
+        with_stats: 是否读取文件的大小和修改时间
+
+    Returns:
+        FolderEntry 列表（目录顺序）
+    """
+    entries: List[FolderEntry] = []
+    with os.scandir(folder_path) as iterator:
+        for entry in iterator:
+            try:
+                if not entry.is_file():
+                    entries.append(FolderEntry(entry.name, entry.path, False, None, None))
+                elif with_stats:
+                    stat = entry.stat()
+                    entries.append(FolderEntry(entry.name, entry.path, True, stat.st_size, stat.st_mtime))
+                else:
+                    entries.append(FolderEntry(entry.name, entry.path, True, None, None))
+            except FileNotFoundError:
+                continue
+    return entries
+
+
+def list_file_entries(folder_path: str, with_stats: bool = False) -> List[FolderEntry]:
+    """
+    只返回文件条目（跳过子目录）
+    """
+    return [entry for entry in scan_folder(folder_path, with_stats) if entry.is_file]
+
+
+def _scan_subfolder(folder_path: str, with_stats: bool = False) -> List[FolderEntry]:
+    """
+    Scan a nested folder, treating unreadable or vanished folders as empty.
+    """
+    try:
+        return scan_folder(folder_path, with_stats)
+    except OSError:
+        return []
+
+
+def distinct_roots(folder_paths: Iterable[str], recursive: bool) -> List[str]:
+    """
+    Absolute, de-duplicated root folders (in their given order).
+
+    For a recursive scan, a root inside another root is dropped: its files
+    are already found through the outer root and would be scanned twice.
+    """
+    roots = list(dict.fromkeys(os.path.abspath(path) for path in folder_paths))
+    if not recursive:
+        return roots
+    keys = [os.path.normcase(root) for root in roots]
+
+    def is_nested(key: str) -> bool:
+        return any(
+            other != key and os.path.commonpath([other, key]) == other
+            for other in keys
+            if os.path.splitdrive(other)[0] == os.path.splitdrive(key)[0]
+        )
+
+    return [root for root, key in zip(roots, keys) if not is_nested(key)]
+
+
+def scan_folders(
+    folder_paths: Iterable[str],
+    recursive: bool = False,
+    max_workers: int = SCAN_WORKERS,
+    with_stats: bool = False,
+) -> List[FolderEntry]:
+    """
+    扫描多个根目录（可选递归），各目录在线程池中并行遍历
+
+    网络存储上目录遍历主要受延迟限制，并行可以显著缩短总时间。
+    递归时不跟随指向目录的符号链接；无法读取的子目录会被跳过，
+    但根目录无法读取时会抛出异常。
+
+    Args:
+        folder_paths: 根目录列表
+        recursive: 是否包含子目录
+        max_workers: 并行扫描的线程数
+        with_stats: 是否读取文件的大小和修改时间（参见 scan_folder）
+
+    Returns:
+        所有条目（含目录条目），按路径排序
+    """
+    roots = distinct_roots(folder_paths, recursive)
+    entries_by_path = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(scan_folder, root, with_stats) for root in roots}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for entry in future.result():
+                    if entry.path in entries_by_path:
+                        continue
+                    entries_by_path[entry.path] = entry
+                    if recursive and not entry.is_file and not os.path.islink(entry.path):
+                        pending.add(pool.submit(_scan_subfolder, entry.path, with_stats))
+    return sorted(entries_by_path.values(), key=lambda entry: entry.path)
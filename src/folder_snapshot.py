@@ -0,0 +1,287 @@
+"""
+持久化的文件夹快照：再次比较时只重新扫描发生变化的目录
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config.settings import CACHE_DIR, FILENAME_PATTERN, SCAN_WORKERS, SNAPSHOT_ENABLED
+from src.filename_parser import extract_filename_base
+from src.folder_scanner import distinct_roots, scan_folders
+
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "snapshots")
+SNAPSHOT_FORMAT_VERSION = 2
+
+# A directory modified this recently may still change within the same mtime
+# tick (coarse timestamps on FAT/SMB), so its listing is not trusted next time
+_MTIME_GRACE_NS = 2 * 1000 ** 3
+
+# name -> base (None for names without a test base)
+DirFiles = Dict[str, Optional[str]]
+
+
+def _list_directory(dir_path: str) -> Tuple[List[str], List[str]]:
+    """
+    List one directory: file names plus names of real subdirectories.
+
+    Only names and types are read (no stat per file); callers that need
+    sizes stat the files themselves (see load_folder_listing).
+    """
+    files: List[str] = []
+    subdirs: List[str] = []
+    with os.scandir(dir_path) as iterator:
+        for entry in iterator:
+            try:
+                if entry.is_file():
+                    files.append(entry.name)
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+            except FileNotFoundError:
+                continue
+    return files, subdirs
+
+
+def _refresh_directory(dir_path: str, record: Optional[dict], is_root: bool):
+    """
+    Bring one directory record up to date (runs on a worker thread).
+
+    Returns (new_record or None if the directory is gone, added names, removed names).
+    An unchanged directory mtime means no entry was added, removed or renamed,
+    so the stored listing is reused without listing the directory again.
+    """
+    try:
+        mtime_ns = os.stat(dir_path).st_mtime_ns
+    except OSError:
+        if is_root:
+            raise
+        return None, [], list(record["files"]) if record else []
+
+    if record is not None and record.get("mtime") == mtime_ns:
+        return record, [], []
+
+    try:
+        names, subdirs = _list_directory(dir_path)
+    except OSError:
+        if is_root:
+            raise
+        return None, [], list(record["files"]) if record else []
+
+    old_files = record["files"] if record else {}
+    # Only new names are parsed; known names keep their base
+    files: DirFiles = {
+        name: old_files[name] if name in old_files else extract_filename_base(name) for name in names
+    }
+    added = [name for name in files if name not in old_files]
+    removed = [name for name in old_files if name not in files]
+
+    stable = time.time_ns() - mtime_ns > _MTIME_GRACE_NS
+    new_record = {"mtime": mtime_ns if stable else None, "files": files, "subdirs": subdirs}
+    return new_record, added, removed
+
+
+class FolderSnapshot:
+    """
+    Persisted listing of one root folder (optionally with subfolders) and the
+    base -> file paths index derived from it.
+
+    refresh() stats every known directory; only directories whose mtime
+    changed are listed again, and only names that appeared since the last
+    refresh are parsed. The base index is updated with the added and removed
+    files instead of being rebuilt.
+    """
+    def __init__(self, root: str, recursive: bool = False, snapshot_dir: str = SNAPSHOT_DIR):
+        self.root = os.path.abspath(root)
+        self.recursive = recursive
+        key = f"{os.path.normcase(self.root)}|{int(recursive)}"
+        self.path = os.path.join(snapshot_dir, hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + ".json")
+        self.lock = threading.Lock()
+        self.dirs: Dict[str, dict] = {}
+        self.files_by_base: Dict[str, Set[str]] = {}
+        # Incremented whenever the file set of a base changes; each consumer
+        # compares against the versions it has seen (refresh() is shared)
+        self.base_versions: Dict[str, int] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        # Stored bases were matched with the pattern in the header; a changed
+        # FILENAME_PATTERN discards them and the folder is listed again
+        if (
+            data.get("version") != SNAPSHOT_FORMAT_VERSION or data.get("root") != self.root
+            or data.get("pattern") != FILENAME_PATTERN
+        ):
+            return
+        self.dirs = data.get("dirs", {})
+        for dir_path, record in self.dirs.items():
+            self._index_files(dir_path, record["files"], record["files"])
+
+    def save(self):
+        data = {
+            "version": SNAPSHOT_FORMAT_VERSION, "root": self.root, "recursive": self.recursive,
+            "pattern": FILENAME_PATTERN, "dirs": self.dirs,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp{os.getpid()}"
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def _index_files(self, dir_path: str, names: Iterable[str], files: DirFiles):
+        for name in names:
+            base = files[name]
+            if base:
+                self.files_by_base.setdefault(base, set()).add(os.path.join(dir_path, name))
+                self.base_versions[base] = self.base_versions.get(base, 0) + 1
+
+    def _unindex_files(self, dir_path: str, names: Iterable[str], files: DirFiles):
+        for name in names:
+            base = files[name]
+            if not base:
+                continue
+            paths = self.files_by_base.get(base)
+            self.base_versions[base] = self.base_versions.get(base, 0) + 1
+            if paths is not None:
+                paths.discard(os.path.join(dir_path, name))
+                if not paths:
+                    del self.files_by_base[base]
+
+    def refresh(self, max_workers: int = SCAN_WORKERS) -> Dict[str, int]:
+        """
+        与磁盘同步快照并保存
+
+        Returns:
+            {"dirs": 目录总数, "rescanned": 重新列出的目录数, "added": 新增文件数, "removed": 删除文件数}
+        """
+        stats = {"dirs": 0, "rescanned": 0, "added": 0, "removed": 0}
+        visited: Set[str] = set()
+        new_dirs: Dict[str, dict] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = {pool.submit(_refresh_directory, self.root, self.dirs.get(self.root), True): self.root}
+            visited.add(self.root)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    dir_path = pending.pop(future)
+                    old_record = self.dirs.get(dir_path)
+                    record, added, removed = future.result()
+                    if old_record is not None and removed:
+                        self._unindex_files(dir_path, removed, old_record["files"])
+                    stats["removed"] += len(removed)
+                    if record is None:
+                        continue
+                    if record is not old_record:
+                        stats["rescanned"] += 1
+                        if old_record is None:
+                            self._index_files(dir_path, record["files"], record["files"])
+                        else:
+                            self._index_files(dir_path, added, record["files"])
+                        stats["added"] += len(added)
+                    new_dirs[dir_path] = record
+                    if not self.recursive:
+                        continue
+                    for name in record["subdirs"]:
+                        sub_path = os.path.join(dir_path, name)
+                        if sub_path in visited:
+                            continue
+                        visited.add(sub_path)
+                        pending[pool.submit(_refresh_directory, sub_path, self.dirs.get(sub_path), False)] = sub_path
+
+        # Directories that disappeared take their files out of the index
+        for dir_path, record in self.dirs.items():
+            if dir_path not in new_dirs and dir_path not in visited:
+                self._unindex_files(dir_path, record["files"], record["files"])
+                stats["removed"] += len(record["files"])
+        self.dirs = new_dirs
+        stats["dirs"] = len(new_dirs)
+        if stats["rescanned"] or stats["removed"]:
+            self.save()
+        return stats
+
+
+_snapshots: Dict[Tuple[str, bool], FolderSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_snapshot(root: str, recursive: bool = False) -> FolderSnapshot:
+    """
+    Return the snapshot of a root folder, kept in memory for the session.
+    """
+    key = (os.path.normcase(os.path.abspath(root)), recursive)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None:
+            snapshot = FolderSnapshot(root, recursive, SNAPSHOT_DIR)
+            _snapshots[key] = snapshot
+    return snapshot
+
+
+def _load_folders(roots: Iterable[str], recursive: bool, file_stats: Optional[Dict[str, Tuple[int, float]]]):
+    files_by_base: Dict[str, Set[str]] = {}
+    if not SNAPSHOT_ENABLED:
+        for entry in scan_folders(roots, recursive=recursive, with_stats=file_stats is not None):
+            if entry.is_file:
+                base = extract_filename_base(entry.name)
+                if base:
+                    files_by_base.setdefault(base, set()).add(entry.path)
+                    if file_stats is not None:
+                        file_stats[entry.path] = (entry.size, entry.mtime)
+        return files_by_base
+
+    for root in distinct_roots(roots, recursive):
+        snapshot = get_snapshot(root, recursive)
+        with snapshot.lock:
+            snapshot.refresh()
+            for base, paths in snapshot.files_by_base.items():
+                files_by_base.setdefault(base, set()).update(paths)
+    if file_stats is not None:
+        # The snapshot keeps names only (writing into an existing file does
+        # not change the directory mtime anyway), so sizes are read now, and
+        # only for callers that asked for them.
+        paths = [path for paths in files_by_base.values() for path in paths]
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            for path, stat in zip(paths, pool.map(_stat_or_none, paths)):
+                if stat is not None:
+                    file_stats[path] = (stat.st_size, stat.st_mtime)
+    return files_by_base
+
+
+def _stat_or_none(path: str):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def load_folder_index(roots: Iterable[str], recursive: bool = False) -> Dict[str, Set[str]]:
+    """
+    返回一个或多个根目录的 基本部分 -> 文件路径集合 索引
+
+    SNAPSHOT_ENABLED 时使用增量快照，否则完整扫描文件夹。
+    返回的字典是副本，调用方可以自由使用。
+    """
+    return _load_folders(roots, recursive, None)
+
+
+def load_folder_listing(
+    roots: Iterable[str], recursive: bool = False
+) -> Tuple[Dict[str, Set[str]], Dict[str, Tuple[int, float]]]:
+    """
+    同 load_folder_index，另外返回 文件路径 -> (大小, 修改时间)
+
+    使用快照时每个文件都重新 stat 一次（快照中的大小/修改时间可能已过期），
+    只读取元数据，不读取文件内容；扫描期间消失的文件不包含在内。
+    """
+    file_stats: Dict[str, Tuple[int, float]] = {}
+    return _load_folders(roots, recursive, file_stats), file_stats
@@ -0,0 +1,219 @@
+"""
+监视文件夹变化（Linux 上使用 inotify，其它平台轮询），增量更新比较结果
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from config.settings import FILES_PER_TEST, WATCH_DEBOUNCE_SECONDS, WATCH_POLL_INTERVAL
+from src.compare_engine import LiveComparison
+from src.completeness import CompletenessProfile
+from src.folder_scanner import distinct_roots
+from src.folder_snapshot import FolderSnapshot, get_snapshot
+
+# inotify(7) constants
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_WATCH_MASK = (_IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+               | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _InotifyBackend:
+    """
+    Directory change notifications through the Linux inotify API (via ctypes).
+    """
+    event_driven = True
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[str, int] = {}
+
+    def watch(self, dir_paths: Iterable[str]):
+        """
+        Add watches for directories that are not watched yet.
+        """
+        for dir_path in dir_paths:
+            if dir_path in self._watches:
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), _WATCH_MASK)
+            if wd >= 0:
+                self._watches[dir_path] = wd
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait up to timeout seconds; return True if a relevant event arrived.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + name_length
+                if mask & _IN_IGNORED:
+                    # Watched directory was removed; forget it so it can be re-added
+                    self._watches = {path: value for path, value in self._watches.items() if value != wd}
+                    continue
+                changed = changed or bool(mask & (_WATCH_MASK | _IN_Q_OVERFLOW))
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """
+    Fallback without change notifications: every wait() ends with a check.
+    """
+    event_driven = False
+
+    def __init__(self, stop_event: threading.Event):
+        self._stop_event = stop_event
+
+    def watch(self, dir_paths: Iterable[str]):
+        pass
+
+    def wait(self, timeout: float) -> bool:
+        return not self._stop_event.wait(timeout)
+
+    def close(self):
+        pass
+
+
+class FolderWatcher:
+    """
+    Keeps a LiveComparison current while files arrive in the watched folders.
+
+    A background thread waits for directory changes (inotify on Linux,
+    polling elsewhere; inotify mode also checks every WATCH_POLL_INTERVAL
+    seconds), lets bursts settle for WATCH_DEBOUNCE_SECONDS, then refreshes
+    the folder snapshots (only changed directories are listed again) and
+    re-evaluates only the bases whose files changed.
+    on_update(result) is called on the watcher thread after the initial scan
+    and after every change.
+    """
+    def __init__(
+        self,
+        roots: List[str],
+        excel_bases: Iterable[str],
+        on_update: Callable[[Dict[str, object]], None],
+        recursive: bool = False,
+        required_files: int = FILES_PER_TEST,
+        profile: Optional[CompletenessProfile] = None,
+        debounce: float = WATCH_DEBOUNCE_SECONDS,
+        poll_interval: float = WATCH_POLL_INTERVAL,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.roots = distinct_roots(roots, recursive)
+        self.recursive = recursive
+        self.comparison = LiveComparison(excel_bases, required_files, profile)
+        self.on_update = on_update
+        self.on_error = on_error
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.snapshots: List[FolderSnapshot] = [get_snapshot(root, recursive) for root in self.roots]
+        # Base versions already applied to the comparison, per snapshot. The
+        # snapshots are shared with compare jobs that refresh them too, so
+        # changes are found by version and not by what the last refresh saw.
+        self._seen_versions: List[Dict[str, int]] = [{} for _ in self.snapshots]
+        try:
+            self._backend = _InotifyBackend()
+        except OSError:
+            self._backend = _PollingBackend(self._stop_event)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._backend.event_driven else "polling"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="namecheck-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _refresh(self, initial: bool = False) -> bool:
+        """
+        Refresh all snapshots and update the comparison; return True if anything changed.
+        """
+        changed_bases: Set[str] = set()
+        for snapshot, seen in zip(self.snapshots, self._seen_versions):
+            with snapshot.lock:
+                snapshot.refresh()
+                for base, version in snapshot.base_versions.items():
+                    if seen.get(base) != version:
+                        seen[base] = version
+                        changed_bases.add(base)
+                self._backend.watch(snapshot.dirs)
+        files_by_base: Dict[str, Set[str]] = {base: set() for base in changed_bases}
+        for snapshot in self.snapshots:
+            with snapshot.lock:
+                for base, files in files_by_base.items():
+                    files |= snapshot.files_by_base.get(base, set())
+        for base, files in files_by_base.items():
+            self.comparison.update(base, files)
+        return initial or bool(changed_bases)
+
+    def _settle(self):
+        """
+        Wait until no new event arrived for `debounce` seconds (bounded).
+        """
+        deadline = time.monotonic() + 10 * self.debounce
+        while not self._stop_event.is_set() and time.monotonic() < deadline:
+            if not self._backend.wait(self.debounce):
+                return
+
+    def _run(self):
+        try:
+            self._refresh(initial=True)
+            self.on_update(self.comparison.result())
+            while not self._stop_event.is_set():
+                notified = self._backend.wait(self.poll_interval)
+                if self._stop_event.is_set():
+                    break
+                if notified and self._backend.event_driven:
+                    self._settle()
+                # Also refresh on timeout: changes made by other hosts on a
+                # network share produce no inotify events
+                changed = self._refresh()
+                if not self._backend.event_driven:
+                    # Polling: keep refreshing while a burst is still arriving
+                    while changed and not self._stop_event.wait(self.debounce) and self._refresh():
+                        pass
+                if changed:
+                    self.on_update(self.comparison.result())
+        except Exception as exc:
+            if self.on_error is not None:
+                self.on_error(exc)
+        finally:
+            self._backend.close()
@@ -0,0 +1,198 @@
+"""
+并行执行文件操作（重命名、删除），用于高延迟的网络共享
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+from config.settings import FS_WORKERS, PROGRESS_STEP
+from src.filename_parser import FILENAME_RE
+
+T = TypeVar("T")
+
+# Error text recorded for operations skipped after an earlier failure in their group
+SKIPPED_AFTER_FAILURE = "skipped: an earlier operation for the same test failed"
+
+
+def test_base_key(path: str) -> Tuple[str, str]:
+    """
+    Group key for file operations: the folder plus the test base of the name.
+
+    Temporary names used to break rename cycles keep the base, so they land
+    in the same group as the renames around them.
+    """
+    folder, name = os.path.split(path)
+    match = FILENAME_RE.search(name)
+    return folder, match.group(0) if match else name
+
+
+def _is_case_only_rename(old_path: str, new_path: str) -> bool:
+    """
+    True if the two paths name the same directory entry up to letter case.
+    """
+    old_folder, old_name = os.path.split(old_path)
+    new_folder, new_name = os.path.split(new_path)
+    return (
+        os.path.normcase(os.path.abspath(old_folder)) == os.path.normcase(os.path.abspath(new_folder))
+        and old_name.lower() == new_name.lower()
+    )
+
+
+def _rename_onto_existing(old_path: str, new_path: str):
+    """
+    Handle a rename whose target name already exists.
+
+    The target may be the source itself: either a case-only rename on a
+    case-insensitive filesystem, or a second hard link left by a link + unlink
+    interrupted before the unlink, which is finished by removing the old name.
+    Any other existing target is a collision.
+    """
+    try:
+        same_file = os.path.samefile(old_path, new_path)
+    except OSError:
+        same_file = False
+    if not same_file:
+        raise FileExistsError(f"{new_path} already exists")
+    if _is_case_only_rename(old_path, new_path):
+        os.rename(old_path, new_path)
+    else:
+        os.unlink(old_path)
+
+
+def rename_no_replace(old_path: str, new_path: str, atomic: bool = True):
+    """
+    Rename a file, raising FileExistsError instead of replacing an existing target.
+
+    os.rename silently replaces the target on POSIX. With atomic=True a hard
+    link (which fails atomically when the target exists) plus an unlink of the
+    old name is used where the filesystem supports it: two directory updates
+    per file, i.e. two round trips on a network share. With atomic=False the
+    target is looked up first and then renamed; the lookup is often answered
+    from the client's attribute cache, but a file created in between would be
+    replaced, so this form is only for targets the planner has just checked.
+    Windows' os.rename never replaces and is used as is.
+    """
+    if os.name == "nt":
+        os.rename(old_path, new_path)
+        return
+    if not atomic:
+        if os.path.lexists(new_path):
+            _rename_onto_existing(old_path, new_path)
+        else:
+            os.rename(old_path, new_path)
+        return
+    try:
+        os.link(old_path, new_path)
+    except FileExistsError:
+        _rename_onto_existing(old_path, new_path)
+        return
+    except OSError:
+        # Hard links unsupported (FAT, some SMB mounts)
+        if os.path.lexists(new_path):
+            _rename_onto_existing(old_path, new_path)
+        else:
+            os.rename(old_path, new_path)
+        return
+    os.unlink(old_path)
+
+
+def execute_file_operations(
+    items: Sequence[T],
+    operation: Callable[[T], None],
+    group_key: Optional[Callable[[T], Hashable]] = None,
+    max_workers: int = FS_WORKERS,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    on_result: Optional[Callable[[int, Optional[str]], None]] = None,
+    stop_group_on_error: bool = False,
+) -> Dict[str, object]:
+    """
+    在线程池中并行执行 operation(item)
+
+    在 SMB/NFS 上每次 rename/remove 都需要一次网络往返，吞吐量受延迟限制；
+    并发发出互不相关的操作可以隐藏这部分延迟。同一分组（group_key 相同，
+    例如同一测试编号）内的操作按原顺序在同一个线程中依次执行，
+    因此计划中的先后依赖（链式重命名、临时名称）保持不变。
+
+    Args:
+        items: 待执行的操作参数
+        operation: 执行单个操作的函数，失败时抛出异常
+        group_key: 可选的分组函数；为 None 时每个操作独立执行
+        max_workers: 并行线程数
+        progress: 可选的进度回调 progress(已处理数量, 总数量)
+        cancel_event: 可选的取消标志，被设置后不再开始新的操作
+        on_result: 可选的回调 on_result(index, error)，成功时 error 为 None；
+            在工作线程中调用，必须是线程安全的
+        stop_group_on_error: 为 True 时，同一分组中某个操作失败后跳过其余操作
+
+    Returns:
+        {"succeeded": [index], "failed": [(index, err_str)], "cancelled": bool,
+         "elapsed": 秒数, "per_second": 每秒完成的操作数}
+    """
+    if group_key is None:
+        groups: List[List[int]] = [[index] for index in range(len(items))]
+    else:
+        grouped: "OrderedDict[Hashable, List[int]]" = OrderedDict()
+        for index, item in enumerate(items):
+            grouped.setdefault(group_key(item), []).append(index)
+        groups = list(grouped.values())
+
+    total = len(items)
+    succeeded: List[int] = []
+    failed: List[Tuple[int, str]] = []
+    lock = threading.Lock()
+    done = [0]
+
+    def is_cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    def finish(index: int, error: Optional[str]):
+        if on_result is not None:
+            on_result(index, error)
+        with lock:
+            if error is None:
+                succeeded.append(index)
+            else:
+                failed.append((index, error))
+            done[0] += 1
+            count = done[0]
+        if progress is not None and count % PROGRESS_STEP == 0:
+            progress(count, total)
+
+    def run_group(indices: List[int]):
+        for position, index in enumerate(indices):
+            if is_cancelled():
+                return
+            try:
+                operation(items[index])
+            except Exception as exc:
+                finish(index, str(exc))
+                if stop_group_on_error:
+                    for skipped in indices[position + 1:]:
+                        finish(skipped, SKIPPED_AFTER_FAILURE)
+                    return
+            else:
+                finish(index, None)
+
+    start = time.perf_counter()
+    if groups:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as pool:
+            for future in [pool.submit(run_group, indices) for indices in groups]:
+                future.result()
+    elapsed = time.perf_counter() - start
+
+    if progress is not None:
+        progress(done[0], total)
+    succeeded.sort()
+    failed.sort()
+    return {
+        "succeeded": succeeded,
+        "failed": failed,
+        "cancelled": is_cancelled() and done[0] < total,
+        "elapsed": elapsed,
+        "per_second": done[0] / elapsed if elapsed > 0 else 0.0,
+    }
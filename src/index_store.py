@@ -0,0 +1,201 @@
+"""
+Excel文件名索引的磁盘缓存（sidecar），工作簿未变化时无需重新解析.xlsx
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+from config.settings import CACHE_DIR, FILENAME_PATTERN, INDEX_CACHE_MAX_ENTRIES
+
+INDEX_FORMAT_VERSION = 2
+_DIGESTS_FILE = "digests.json"
+_INDEX_PREFIX = "index_"
+# Sidecars of format version 1, which did not record pattern and backend
+_LEGACY_INDEX_RE = re.compile(r'^[0-9a-f]{32}_[0-9a-f]{16}\.json$')
+
+
+def workbook_digest(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    计算工作簿内容的哈希值（blake2b）
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _group_key(group_column, names_column) -> str:
+    return f"{group_column}|{names_column}"
+
+
+def _write_json_atomic(path: str, data) -> None:
+    # Unique per process and thread: batch workers write the same files concurrently
+    tmp_path = f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+    with open(tmp_path, 'w', encoding='utf-8') as handle:
+        json.dump(data, handle, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+class IndexStore:
+    """
+    On-disk store of extracted filename indexes keyed by workbook hash, sheet,
+    Excel backend and FILENAME_PATTERN (a changed pattern never reuses old indexes).
+
+    Content hashes are memoized per path against (mtime, size), so an unchanged
+    workbook is recognised with a single stat call instead of being re-hashed.
+    Both the sidecar files and the memoized hashes are limited to max_entries,
+    dropping the least recently used. Several processes may share the store:
+    digests.json is merged with its current contents before each write.
+    """
+    def __init__(self, cache_dir: str = CACHE_DIR, max_entries: int = INDEX_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._digests: Optional[Dict[str, list]] = None
+
+    def _read_digests(self) -> Dict[str, list]:
+        try:
+            with open(os.path.join(self.cache_dir, _DIGESTS_FILE), encoding='utf-8') as handle:
+                digests = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return digests if isinstance(digests, dict) else {}
+
+    def _load_digests(self) -> Dict[str, list]:
+        if self._digests is None:
+            self._digests = self._read_digests()
+        return self._digests
+
+    def get_digest(self, file_path: str) -> str:
+        """
+        返回工作簿内容哈希；文件未变化（mtime、大小相同）时直接复用记录的哈希
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        with self._lock:
+            digests = self._load_digests()
+            known = digests.get(path)
+            if known and known[:2] == signature:
+                # Most recently used last; persisted with the next write
+                digests[path] = digests.pop(path)
+                return known[2]
+        digest = workbook_digest(path)
+        with self._lock:
+            # Merge in what other processes wrote since the file was read (as recently used)
+            digests = dict(self._load_digests())
+            for known_path, record in self._read_digests().items():
+                digests.setdefault(known_path, record)
+            digests.pop(path, None)
+            digests[path] = signature + [digest]
+            for stale in list(digests)[:max(0, len(digests) - self.max_entries)]:
+                del digests[stale]
+            self._digests = digests
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                _write_json_atomic(os.path.join(self.cache_dir, _DIGESTS_FILE), digests)
+            except OSError:
+                pass
+        return digest
+
+    def _index_path(self, digest: str, sheet: Optional[str], backend: str) -> str:
+        sheet_hash = hashlib.sha1(str(sheet).encode('utf-8')).hexdigest()[:16]
+        variant = hashlib.sha1(f"{backend}|{FILENAME_PATTERN}".encode('utf-8')).hexdigest()[:8]
+        return os.path.join(self.cache_dir, f"{_INDEX_PREFIX}{digest}_{sheet_hash}_{variant}.json")
+
+    def _load(self, digest: str, sheet: Optional[str], backend: str) -> Dict[str, object]:
+        path = self._index_path(digest, sheet, backend)
+        try:
+            with open(path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if (
+            data.get("version") != INDEX_FORMAT_VERSION or data.get("sheet") != sheet
+            or data.get("backend") != backend or data.get("pattern") != FILENAME_PATTERN
+        ):
+            return {}
+        try:
+            # The modification time orders sidecars by last use for pruning
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _update(self, digest: str, sheet: Optional[str], backend: str, mutate) -> None:
+        """
+        Apply mutate(data) to the stored record and rewrite it atomically.
+        """
+        with self._lock:
+            data = self._load(digest, sheet, backend) or {
+                "version": INDEX_FORMAT_VERSION, "sheet": sheet, "backend": backend, "pattern": FILENAME_PATTERN,
+            }
+            mutate(data)
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                _write_json_atomic(self._index_path(digest, sheet, backend), data)
+                self._prune()
+            except OSError:
+                pass
+
+    def _prune(self) -> None:
+        """
+        Remove legacy sidecars and the least recently used ones beyond max_entries.
+        """
+        stale = []
+        sidecars = []
+        for entry in os.scandir(self.cache_dir):
+            if _LEGACY_INDEX_RE.match(entry.name):
+                stale.append(entry.path)
+            elif entry.name.startswith(_INDEX_PREFIX) and entry.name.endswith(".json"):
+                try:
+                    sidecars.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+        sidecars.sort()
+        stale += [path for _, path in sidecars[:max(0, len(sidecars) - self.max_entries)]]
+        for path in stale:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def load_filename_index(self, digest: str, sheet: Optional[str], backend: str) -> Optional[Dict[str, object]]:
+        """
+        读取文件名索引 {"bases": [...], "test_count": n}，不存在时返回None
+        """
+        return self._load(digest, sheet, backend).get("filename_index")
+
+    def save_filename_index(self, digest: str, sheet: Optional[str], backend: str, index: Dict[str, object]) -> None:
+        def mutate(data):
+            data["filename_index"] = index
+        self._update(digest, sheet, backend, mutate)
+
+    def load_group_mapping(
+        self, digest: str, sheet: Optional[str], backend: str, group_column, names_column
+    ) -> Optional[Tuple[Dict[str, str], Dict[str, Set[str]]]]:
+        """
+        读取分组映射 (filename_to_group, group_to_names)，不存在时返回None
+        """
+        groups = self._load(digest, sheet, backend).get("groups", {})
+        filename_to_group = groups.get(_group_key(group_column, names_column))
+        if filename_to_group is None:
+            return None
+        group_to_names: Dict[str, Set[str]] = {}
+        for name, label in filename_to_group.items():
+            group_to_names.setdefault(label, set()).add(name)
+        return filename_to_group, group_to_names
+
+    def save_group_mapping(
+        self, digest: str, sheet: Optional[str], backend: str, group_column, names_column, mapping
+    ) -> None:
+        filename_to_group, _ = mapping
+
+        def mutate(data):
+            data.setdefault("groups", {})[_group_key(group_column, names_column)] = filename_to_group
+        self._update(digest, sheet, backend, mutate)
@@ -0,0 +1,153 @@
+"""
+批量移动文件（按Excel分组时使用）
+"""
+
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.settings import MOVE_WORKERS, PROGRESS_STEP
+from src.folder_scanner import scan_folder
+from src.fs_executor import rename_no_replace
+
+
+def _device_of(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+def _move_no_replace(src: str, dest: str):
+    """
+    跨设备移动（复制+删除），目标已存在时抛出 FileExistsError 而不是覆盖
+    """
+    if os.path.lexists(dest):
+        raise FileExistsError(f"目标已存在: {dest}")
+    shutil.move(src, dest)
+
+
+def execute_move_plan(
+    moves: List[Tuple[str, str]],
+    max_workers: int = MOVE_WORKERS,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, object]:
+    """
+    执行移动计划 [(src_path, dest_path), ...]
+
+    - 每个目标目录只创建、列出一次，冲突检测基于内存中的名称集合
+      （按 os.path.normcase 比较，与大小写不敏感的文件系统一致）；
+    - 源与目标在同一文件系统时使用 rename_no_replace（不复制数据），
+      列出目录后才出现的同名文件也不会被覆盖，而是记为冲突；
+    - 跨设备移动（复制+删除）在有界线程池中并行执行，每完成一个文件报告一次进度。
+
+    Args:
+        moves: 移动计划
+        max_workers: 跨设备复制的并行线程数
+        progress: 可选的进度回调 progress(已处理数量, 总数量)
+        cancel_event: 可选的取消标志，被设置后不再开始新的移动
+
+    Returns:
+        {"moved": [(src, dest)], "conflicts": [(src, dest)], "errors": [(src, dest, err_str)],
+         "created_dirs": {target_dir}, "cancelled": bool}
+    """
+    moved: List[Tuple[str, str]] = []
+    conflicts: List[Tuple[str, str]] = []
+    errors: List[Tuple[str, str, str]] = []
+    created_dirs = set()
+    total = len(moves)
+    done = 0
+
+    def is_cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    def report(force: bool = False):
+        if progress is not None and (force or done % PROGRESS_STEP == 0):
+            progress(done, total)
+
+    # Names already present in each target folder (normcased), listed once per folder
+    target_names: Dict[str, Optional[set]] = {}
+    dir_errors: Dict[str, str] = {}
+    devices: Dict[str, Optional[int]] = {}
+    copies: List[Tuple[str, str]] = []
+    for src, dest in moves:
+        if is_cancelled():
+            break
+        target_dir = os.path.dirname(dest)
+        if target_dir not in target_names:
+            try:
+                if not os.path.isdir(target_dir):
+                    os.makedirs(target_dir, exist_ok=True)
+                    created_dirs.add(target_dir)
+                target_names[target_dir] = {os.path.normcase(entry.name) for entry in scan_folder(target_dir)}
+                devices[target_dir] = _device_of(target_dir)
+            except OSError as exc:
+                target_names[target_dir] = None
+                dir_errors[target_dir] = str(exc)
+        existing = target_names[target_dir]
+        if existing is None:
+            errors.append((src, dest, dir_errors[target_dir]))
+            done += 1
+            report()
+            continue
+
+        name = os.path.normcase(os.path.basename(dest))
+        if name in existing:
+            conflicts.append((src, dest))
+            done += 1
+            report()
+            continue
+        existing.add(name)
+
+        source_dir = os.path.dirname(src)
+        if source_dir not in devices:
+            devices[source_dir] = _device_of(source_dir)
+        same_device = devices[source_dir] is not None and devices[source_dir] == devices[target_dir]
+        if not same_device:
+            copies.append((src, dest))
+            continue
+
+        # Same filesystem: a rename only touches directory entries
+        try:
+            rename_no_replace(src, dest)
+            moved.append((src, dest))
+        except FileExistsError:
+            # Created after the folder was listed
+            conflicts.append((src, dest))
+        except OSError as exc:
+            existing.discard(name)
+            errors.append((src, dest, str(exc)))
+        done += 1
+        report()
+
+    if copies and not is_cancelled():
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_move_no_replace, src, dest): (src, dest) for src, dest in copies}
+            for future in as_completed(futures):
+                src, dest = futures[future]
+                if future.cancelled():
+                    continue
+                try:
+                    future.result()
+                    moved.append((src, dest))
+                except FileExistsError:
+                    conflicts.append((src, dest))
+                except Exception as exc:
+                    errors.append((src, dest, str(exc)))
+                done += 1
+                report(force=True)
+                if is_cancelled():
+                    for pending in futures:
+                        pending.cancel()
+
+    report(force=True)
+    return {
+        "moved": moved,
+        "conflicts": conflicts,
+        "errors": errors,
+        "created_dirs": created_dirs,
+        "cancelled": is_cancelled() and done < total,
+    }
@@ -0,0 +1,40 @@
+"""
+Excel文件名前缀索引（按文件名分组时使用）
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+
+class PrefixIndex:
+    """
+    Case-insensitive longest-prefix lookup over a fixed set of names.
+
+    Names are stored in a dict keyed by their lowercase form and bucketed by
+    length, so a lookup checks at most one slice per distinct name length
+    instead of comparing the stem with every name.
+    """
+    def __init__(self, names: Iterable[str]):
+        """
+        Args:
+            names: Excel中的文件名；小写形式相同时保留第一个
+        """
+        self._names: Dict[str, str] = {}
+        for name in names:
+            self._names.setdefault(name.lower(), name)
+        self._lengths: List[int] = sorted({len(key) for key in self._names}, reverse=True)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def longest_prefix(self, text: str) -> Optional[str]:
+        """
+        Return the longest name that is a case-insensitive prefix of text, or None.
+        """
+        key = text.lower()
+        for length in self._lengths:
+            if length > len(key):
+                continue
+            match = self._names.get(key[:length])
+            if match is not None:
+                return match
+        return None
@@ -0,0 +1,341 @@
+"""
+重命名日志（write-ahead journal），支持中断后继续执行和回滚
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from config.settings import CACHE_DIR, FS_WORKERS, JOURNAL_SYNC_EVERY
+from src.fs_executor import execute_file_operations, rename_no_replace, test_base_key
+
+JOURNAL_DIR = os.path.join(CACHE_DIR, "journals")
+
+
+def journal_path_for(folder_path: str) -> str:
+    """
+    Return the journal file used for rename jobs in the given folder.
+    """
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(folder_path)).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(JOURNAL_DIR, f"rename_{key}.jsonl")
+
+
+def linked_steps(changes: List[Tuple[str, str]]) -> Set[int]:
+    """
+    Indices of renames that are part of a chain or cycle: their target is the
+    source of another rename, or their source is the target of another one.
+
+    Only for these steps the file system state after a crash is ambiguous
+    (both names exist, holding different files), so they get an intent record.
+    """
+    sources = {os.path.normcase(old) for old, _ in changes}
+    targets = {os.path.normcase(new) for _, new in changes}
+    return {
+        index for index, (old, new) in enumerate(changes)
+        if os.path.normcase(new) in sources or os.path.normcase(old) in targets
+    }
+
+
+class RenameJournal:
+    """
+    Append-only JSON-lines journal of a rename plan.
+
+    The first record holds the whole plan and is fsynced before any file is
+    touched. Before a chained rename (see linked_steps) a "started" record is
+    fsynced. Afterwards one small record is appended per completed, failed or
+    rolled-back rename; these are fsynced in batches of JOURNAL_SYNC_EVERY.
+    """
+    def __init__(self, path: str, sync_every: int = JOURNAL_SYNC_EVERY):
+        self.path = path
+        self.sync_every = sync_every
+        self._handle = open(path, 'a', encoding='utf-8')
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, path: str, changes: List[Tuple[str, str]], **kwargs) -> "RenameJournal":
+        """
+        Start a new journal for the plan, replacing any previous one.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(json.dumps({"type": "plan", "changes": changes}, ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        return cls(path, **kwargs)
+
+    def _append(self, record: Dict[str, object], force_sync: bool = False):
+        with self._lock:
+            self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._pending += 1
+            if force_sync or self._pending >= self.sync_every:
+                self._sync()
+
+    def _sync(self):
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._pending = 0
+
+    def record_started(self, index: int):
+        self._append({"type": "started", "i": index}, force_sync=True)
+
+    def record_done(self, index: int):
+        self._append({"type": "done", "i": index})
+
+    def record_failed(self, index: int, error: str):
+        self._append({"type": "failed", "i": index, "error": error})
+
+    def record_undone(self, index: int):
+        self._append({"type": "undone", "i": index})
+
+    def record_finished(self, kind: str = "complete"):
+        """
+        Mark the apply ("complete") or rollback ("rolled_back") as finished.
+        """
+        self._append({"type": kind}, force_sync=True)
+
+    def close(self):
+        with self._lock:
+            if not self._handle.closed:
+                self._sync()
+                self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_journal(path: str) -> Dict[str, object]:
+    """
+    读取日志状态
+
+    A truncated last line (crash while writing) is ignored.
+
+    Returns:
+        {"changes": [(old, new)], "started": set(index), "done": set(index),
+         "failed": {index: error}, "undone": set(index), "complete": bool, "rolled_back": bool}
+    """
+    state = {
+        "changes": [],
+        "started": set(),
+        "done": set(),
+        "failed": {},
+        "undone": set(),
+        "complete": False,
+        "rolled_back": False,
+    }
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            kind = record.get("type")
+            if kind == "plan":
+                state["changes"] = [tuple(pair) for pair in record["changes"]]
+            elif kind == "started":
+                state["started"].add(record["i"])
+            elif kind == "done":
+                state["done"].add(record["i"])
+                state["failed"].pop(record["i"], None)
+            elif kind == "failed":
+                state["failed"][record["i"]] = record.get("error", "")
+            elif kind == "undone":
+                state["undone"].add(record["i"])
+            elif kind in ("complete", "rolled_back"):
+                state[kind] = True
+    return state
+
+
+def has_unfinished_journal(path: str) -> bool:
+    """
+    Return True if the journal exists and its apply was interrupted.
+    """
+    if not os.path.exists(path):
+        return False
+    try:
+        state = load_journal(path)
+    except OSError:
+        return False
+    return bool(state["changes"]) and not state["complete"] and not state["rolled_back"]
+
+
+def _exists(path: str) -> bool:
+    return os.path.lexists(path)
+
+
+def completed_steps(changes: List[Tuple[str, str]], state: Dict[str, object]) -> Set[int]:
+    """
+    Renames that were carried out, including those whose "done" record was
+    lost in a crash (done records are only fsynced in batches).
+
+    Renames of one test run in plan order and a group stops at its first
+    failure, so a durable "started" record proves that every earlier rename
+    of its group finished. The last started rename of a group, and renames
+    outside any chain, are judged by the files: source gone and target present.
+    Later chained renames are never judged by the files, because a pending
+    chain can leave exactly that pattern (e.g. the target of a temp name).
+    """
+    linked = linked_steps(changes)
+    completed = set(state["done"])
+    groups: Dict[Tuple[str, str], List[int]] = {}
+    for index, (old_path, _) in enumerate(changes):
+        if index not in completed:
+            groups.setdefault(test_base_key(old_path), []).append(index)
+
+    for indices in groups.values():
+        started = [position for position, index in enumerate(indices) if index in state["started"]]
+        last_started = started[-1] if started else -1
+        completed.update(indices[:last_started])
+        for position, index in enumerate(indices[max(last_started, 0):], max(last_started, 0)):
+            if index in linked and position != last_started:
+                continue
+            old_path, new_path = changes[index]
+            if not _exists(old_path) and _exists(new_path):
+                completed.add(index)
+    return completed
+
+
+def execute_rename_steps(
+    changes: List[Tuple[str, str]],
+    indices: List[int],
+    journal: Optional[RenameJournal] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    max_workers: int = FS_WORKERS,
+    atomic: bool = True,
+) -> Dict[str, object]:
+    """
+    Run the given renames of a plan (grouped by test, groups in parallel).
+
+    Targets are never replaced (rename_no_replace; atomic=False only for a
+    plan whose targets were just checked). With a journal, chained renames
+    get a durable "started" record first, and every result is recorded.
+
+    Returns:
+        execute_file_operations 的结果，索引指向 indices 中的位置
+    """
+    linked = linked_steps(changes) if journal is not None else set()
+
+    def rename(index: int):
+        if index in linked:
+            journal.record_started(index)
+        rename_no_replace(*changes[index], atomic=atomic)
+
+    def on_result(position: int, error: Optional[str]):
+        if journal is None:
+            return
+        if error is None:
+            journal.record_done(indices[position])
+        else:
+            journal.record_failed(indices[position], error)
+
+    return execute_file_operations(
+        indices,
+        rename,
+        group_key=lambda index: test_base_key(changes[index][0]),
+        max_workers=max_workers,
+        progress=progress,
+        cancel_event=cancel_event,
+        on_result=on_result,
+        stop_group_on_error=True,
+    )
+
+
+def resume_rename_journal(
+    path: str,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, object]:
+    """
+    继续执行中断的重命名：只处理日志中尚未完成的条目，无需重新扫描文件夹。
+    与 apply_rename_plan 一样，不同测试编号的重命名并行执行。
+
+    Renames that finished before the crash without a synced "done" record
+    are recognised by completed_steps and recorded, not repeated. An existing
+    target is never replaced: such a rename fails instead.
+
+    Returns:
+        与 apply_rename_plan 相同的统计信息字典，另含 "recovered"（补记为已完成的数量）
+    """
+    state = load_journal(path)
+    changes = state["changes"]
+    completed = completed_steps(changes, state)
+    recovered = sorted(completed - state["done"])
+    pending = [i for i in range(len(changes)) if i not in completed]
+
+    with RenameJournal(path) as journal:
+        for index in recovered:
+            journal.record_done(index)
+        result = execute_rename_steps(changes, pending, journal, progress, cancel_event)
+        if not result["cancelled"]:
+            journal.record_finished("complete")
+    failures = [(*changes[pending[position]], err) for position, err in result["failed"]]
+    return {
+        "renamed": len(result["succeeded"]),
+        "failed": len(failures),
+        "failures": failures,
+        "cancelled": result["cancelled"],
+        "per_second": result["per_second"],
+        "recovered": len(recovered),
+    }
+
+
+def rollback_rename_journal(
+    path: str,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, object]:
+    """
+    回滚日志中已完成的重命名（按相反顺序执行 new -> old，不同测试编号之间并行）
+
+    Includes renames that finished after the last synced "done" record
+    (see completed_steps); their number is returned as "recovered".
+
+    Returns:
+        {"restored": x, "failed": y, "failures": [(new, old, err_str), ...], "cancelled": bool,
+         "recovered": z}
+    """
+    state = load_journal(path)
+    changes = state["changes"]
+    completed = completed_steps(changes, state)
+    recovered = len(completed - state["done"] - state["undone"])
+    to_undo = sorted((i for i in completed if i not in state["undone"]), reverse=True)
+
+    linked = linked_steps(changes)
+
+    def restore(index: int):
+        old_path, new_path = changes[index]
+        if index not in linked and not _exists(new_path) and _exists(old_path):
+            return  # restored before an interruption, "undone" record lost
+        rename_no_replace(new_path, old_path)
+
+    with RenameJournal(path) as journal:
+        def on_result(position: int, error: Optional[str]):
+            if error is None:
+                journal.record_undone(to_undo[position])
+
+        result = execute_file_operations(
+            to_undo,
+            restore,
+            group_key=lambda index: test_base_key(changes[index][0]),
+            progress=progress,
+            cancel_event=cancel_event,
+            on_result=on_result,
+            stop_group_on_error=True,
+        )
+        if not result["cancelled"] and not result["failed"]:
+            journal.record_finished("rolled_back")
+    failures = [(changes[to_undo[position]][1], changes[to_undo[position]][0], err)
+                for position, err in result["failed"]]
+    return {
+        "restored": len(result["succeeded"]),
+        "failed": len(failures),
+        "failures": failures,
+        "cancelled": result["cancelled"],
+        "recovered": recovered,
+    }
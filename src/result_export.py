@@ -0,0 +1,142 @@
+"""
+将比较结果导出为 CSV / XLSX / Parquet（流式写入，不构建完整文本）
+"""
+
+import csv
+import os
+import threading
+from typing import Callable, Iterator, Optional, Tuple
+
+from config.settings import EXPORT_BATCH_SIZE, PROGRESS_STEP
+from src.result_model import ResultReport
+
+# File extension -> export format
+EXPORT_FORMATS = {".csv": "csv", ".xlsx": "xlsx", ".parquet": "parquet"}
+
+EXPORT_COLUMNS = ("section", "item")
+
+
+class ExportCancelled(Exception):
+    """
+    Raised by export_report when its cancel_event was set; no file is written.
+    """
+
+
+def count_report_rows(report: ResultReport) -> int:
+    """
+    Number of rows iter_report_rows yields for the report.
+    """
+    return len(report.header) + sum(len(section.items) or 1 for section in report.sections)
+
+
+def iter_report_rows(report: ResultReport, suffix: str = "") -> Iterator[Tuple[str, str]]:
+    """
+    Yield (section, item) rows; a section without items yields its title.
+    """
+    for line in report.header:
+        yield "header", line
+    for section in report.sections:
+        if not section.items:
+            yield section.key, section.title
+            continue
+        for item in section.items:
+            yield section.key, item + suffix if section.filenames else item
+
+
+def _export_csv(rows: Iterator[Tuple[str, str]], path: str):
+    # utf-8-sig so Excel detects the encoding when the CSV is opened directly
+    with open(path, 'w', encoding='utf-8-sig', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(EXPORT_COLUMNS)
+        writer.writerows(rows)
+
+
+def _export_xlsx(rows: Iterator[Tuple[str, str]], path: str):
+    from openpyxl import Workbook
+
+    # write_only mode streams rows to disk instead of keeping cell objects
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Results")
+    worksheet.append(EXPORT_COLUMNS)
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def _export_parquet(rows: Iterator[Tuple[str, str]], path: str, batch_size: int = EXPORT_BATCH_SIZE):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export requires pyarrow (pip install pyarrow)") from None
+
+    schema = pa.schema([(name, pa.string()) for name in EXPORT_COLUMNS])
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_table(pa.Table.from_arrays([list(column) for column in zip(*batch)], schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_arrays([list(column) for column in zip(*batch)], schema=schema))
+
+
+def export_report(
+    report: ResultReport,
+    path: str,
+    export_format: Optional[str] = None,
+    suffix: str = "",
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> int:
+    """
+    导出比较结果
+
+    The file is written under a temporary name and renamed when complete, so a
+    failed or cancelled export leaves an existing file at path untouched.
+
+    Args:
+        report: ResultReport
+        path: 目标文件路径
+        export_format: "csv"、"xlsx" 或 "parquet"，为空时按扩展名判断
+        suffix: 附加到文件名条目的后缀（与结果窗口中的 Apply Suffix 一致）
+        progress: 可选的进度回调 progress(已写入行数, 总行数)
+        cancel_event: 可选的取消标志，设置后抛出 ExportCancelled
+
+    Returns:
+        写入的数据行数（不含表头）
+    """
+    if export_format is None:
+        export_format = EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+        if export_format is None:
+            raise ValueError(f"Unsupported export file type: {path} (use .csv, .xlsx or .parquet)")
+    writers = {"csv": _export_csv, "xlsx": _export_xlsx, "parquet": _export_parquet}
+    if export_format not in writers:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    total = count_report_rows(report)
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            if count % PROGRESS_STEP == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+                if progress:
+                    progress(count, total)
+            yield row
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        writers[export_format](counted(iter_report_rows(report, suffix)), tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if progress:
+        progress(count, total)
+    return count
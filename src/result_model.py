@@ -0,0 +1,177 @@
+"""
+结构化的结果模型：结果窗口、复制和导出直接操作数据，而不是重新解析文本
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.completeness import CompletenessProfile
+
+
+class ResultSection(NamedTuple):
+    """
+    One block of a result: a title line followed by its items.
+
+    A section without items is a plain message line. Items of sections with
+    filenames=True are test bases/filenames: they receive the suffix typed
+    in the result window and are what "Copy as Single Line" copies.
+    """
+    key: str
+    title: str
+    items: List[str]
+    filenames: bool = False
+    # Items are shown on one line joined by this separator (None: one per line)
+    separator: Optional[str] = None
+
+
+class ResultReport:
+    """
+    Header lines plus an ordered list of sections.
+    """
+    def __init__(self, header: Sequence[str] = (), sections: Sequence[ResultSection] = (),
+                 metadata: Optional[Dict[str, object]] = None):
+        self.header: List[str] = list(header)
+        self.sections: List[ResultSection] = list(sections)
+        self.metadata: Dict[str, object] = dict(metadata or {})
+
+    @classmethod
+    def from_lines(cls, lines: Sequence[str]) -> "ResultReport":
+        """
+        Wrap already formatted text lines (summaries of delete/rename/group jobs).
+        """
+        return cls(sections=[ResultSection("text", "", list(lines))])
+
+    def add_section(self, key: str, title: str, items: Sequence[str] = (), filenames: bool = False,
+                    separator: Optional[str] = None):
+        self.sections.append(ResultSection(key, title, list(items), filenames, separator))
+
+    def section(self, key: str) -> Optional[ResultSection]:
+        for section in self.sections:
+            if section.key == key:
+                return section
+        return None
+
+    def filenames(self, suffix: str = "") -> Iterator[str]:
+        """
+        Iterate over all filename items, with the suffix appended.
+        """
+        for section in self.sections:
+            if section.filenames:
+                for item in section.items:
+                    yield item + suffix
+
+    def to_lines(self, suffix: str = "") -> List[str]:
+        """
+        Render the report as display lines; the suffix is appended to filename items.
+        """
+        lines: List[str] = list(self.header)
+        if lines:
+            lines.append("")
+        for section in self.sections:
+            items = [item + suffix for item in section.items] if section.filenames else section.items
+            if section.title:
+                lines.append(section.title)
+            if section.separator is not None:
+                if items:
+                    lines.append(section.separator.join(items))
+            else:
+                lines.extend(items)
+            if section.key != "text":
+                lines.append("")
+        while lines and not lines[-1]:
+            lines.pop()
+        return lines
+
+    def to_text(self, suffix: str = "") -> str:
+        return "\n".join(self.to_lines(suffix))
+
+
+def build_compare_report(comparison: Dict[str, object], sheet: str, test_count: int,
+                         files_per_test: int, profile: Optional[CompletenessProfile] = None) -> ResultReport:
+    """
+    根据 compare_bases 的结果生成比较报告
+
+    Args:
+        comparison: compare_bases 返回的字典
+        sheet: sheet名称
+        test_count: Excel中不同测试编号的数量
+        files_per_test: 每个测试编号要求的文件数量
+        profile: 比较时使用的完整性配置（None 表示按数量检查）
+
+    Returns:
+        ResultReport
+    """
+    report = ResultReport(
+        header=[f"Current Excel file ({sheet}) has {test_count} different test numbers."],
+        metadata={"sheet": sheet, "test_count": test_count, "files_per_test": files_per_test,
+                  "profile": profile.name if profile else None},
+    )
+    excel_only = comparison["excel_only"]
+    folder_only = comparison["folder_only"]
+    incomplete = comparison["incomplete"]
+    duplicates = comparison["duplicates"]
+
+    # Lists are sorted by time (lexicographic works for pattern like YYYY_MM_DD_HHMMSS)
+    if excel_only:
+        report.add_section("excel_only", f"In Excel but not in folder ({len(excel_only)}):",
+                           excel_only, filenames=True)
+    if folder_only:
+        report.add_section("folder_only", f"In folder but not in Excel ({len(folder_only)}):",
+                           folder_only, filenames=True)
+    if incomplete and profile is not None:
+        missing = comparison["missing"]
+        report.add_section("incomplete", f"Incomplete file numbers (profile {profile.name}):",
+                           [f"{base}: missing {', '.join(missing[base])}" for base in incomplete])
+    elif incomplete:
+        report.add_section("incomplete", f"Incomplete file numbers (less than {files_per_test} files):",
+                           incomplete, separator=", ")
+
+    if not (excel_only or folder_only or incomplete or duplicates):
+        expected = f"profile {profile.name}" if profile else f"{files_per_test} files each"
+        report.add_section(
+            "message",
+            f"All numbers have complete file sets ({expected}), Excel and folder match.",
+        )
+        report.add_section("message", "No duplicate filenames found in Excel.")
+    elif duplicates:
+        report.add_section("duplicates", "Duplicate filenames found in Excel:", duplicates)
+    else:
+        report.add_section("message", "No duplicate filenames found in Excel.")
+    return report
+
+
+def add_duplicate_content_section(report: ResultReport, groups: Sequence[Sequence[str]],
+                                  errors: Sequence[Tuple[str, str]] = ()):
+    """
+    添加重复内容查找结果（放在 Excel 重复文件名结果之后），以及无法读取而未能比较的文件
+    """
+    if groups:
+        report.add_section("duplicate_content", f"Duplicate file contents found in folder ({len(groups)} groups):",
+                           [" = ".join(group) for group in groups])
+    else:
+        report.add_section("message", "No duplicate file contents found in folder.")
+    if errors:
+        report.add_section("duplicate_unreadable",
+                           f"Files that could not be read for the duplicate check ({len(errors)}):",
+                           [f"{path}: {err}" for path, err in errors])
+
+
+def add_verification_sections(report: ResultReport, undersized: Sequence[Tuple[str, int]],
+                              hash_result: Optional[Dict[str, object]] = None):
+    """
+    添加内容校验结果（空文件/过小文件，以及可选的哈希读取结果）
+    """
+    if undersized:
+        report.add_section("undersized", f"Empty or undersized files ({len(undersized)}):",
+                           [f"{path} ({size} bytes)" for path, size in undersized])
+    else:
+        report.add_section("message", "No empty or undersized files found.")
+    if hash_result is None:
+        return
+    errors = hash_result["errors"]
+    if errors:
+        report.add_section("unreadable", f"Files that could not be read completely ({len(errors)}):",
+                           [f"{path}: {err}" for path, err in errors])
+    report.add_section(
+        "message",
+        f"Content hashes: {hash_result['hashed']} files read, {hash_result['cached']} unchanged files reused.",
+    )
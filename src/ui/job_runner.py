@@ -0,0 +1,152 @@
+"""
+Background job execution for long-running operations
+"""
+
+import queue
+import threading
+from typing import Callable, Optional
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside a job when the user cancelled it.
+    """
+
+
+class JobContext:
+    """
+    Handle passed to a job function running on the worker thread.
+
+    The job reports progress through report() and checks cancel_event
+    (or calls check_cancelled()) between units of work. It must not touch
+    any Tk widget or variable.
+    """
+    def __init__(self, messages: "queue.Queue"):
+        self._messages = messages
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def report(self, message: str, current: Optional[int] = None, total: Optional[int] = None):
+        """
+        Post a progress update; it is delivered to the UI on the Tk thread.
+        """
+        self._messages.put(("progress", (message, current, total)))
+
+    def progress_callback(self, message: str) -> Callable[[int, int], None]:
+        """
+        Return a (current, total) callback suitable for file_utils helpers.
+        """
+        def callback(current: int, total: int):
+            self.report(message, current, total)
+        return callback
+
+
+class JobRunner:
+    """
+    Runs one job at a time on a worker thread and delivers progress and
+    results back to the Tk main loop by polling a queue with root.after.
+    """
+    def __init__(self, root, on_progress: Optional[Callable] = None, on_state: Optional[Callable] = None,
+                 poll_interval_ms: int = 100):
+        """
+        Args:
+            root: tkinter root window
+            on_progress: callback(message, current, total) called on the Tk thread
+            on_state: callback(busy: bool) called when a job starts or finishes
+            poll_interval_ms: queue polling interval
+        """
+        self.root = root
+        self.on_progress = on_progress
+        self.on_state = on_state
+        self.poll_interval_ms = poll_interval_ms
+        self._messages: "queue.Queue" = queue.Queue()
+        self._context: Optional[JobContext] = None
+        self._callbacks = (None, None, None)
+
+    @property
+    def busy(self) -> bool:
+        return self._context is not None
+
+    def submit(self, func: Callable[[JobContext], object], on_success: Callable[[object], None],
+               on_error: Optional[Callable[[Exception], None]] = None,
+               on_cancel: Optional[Callable[[], None]] = None,
+               description: str = "Working...") -> bool:
+        """
+        Run func(context) on a worker thread.
+
+        on_success(result), on_error(exc) and on_cancel() are invoked on the
+        Tk thread. Returns False if another job is still running.
+        """
+        if self.busy:
+            return False
+        context = JobContext(self._messages)
+        self._context = context
+
+        def worker():
+            try:
+                result = func(context)
+            except JobCancelled:
+                self._messages.put(("cancelled", None))
+            except Exception as exc:
+                self._messages.put(("error", exc))
+            else:
+                self._messages.put(("done", result))
+
+        self._callbacks = (on_success, on_error, on_cancel)
+        if self.on_state:
+            self.on_state(True)
+        if self.on_progress:
+            self.on_progress(description, None, None)
+        threading.Thread(target=worker, name="namecheck-job", daemon=True).start()
+        self.root.after(self.poll_interval_ms, self._poll)
+        return True
+
+    def cancel(self):
+        """
+        Request cancellation of the running job.
+        """
+        if self._context is not None:
+            self._context.cancel_event.set()
+
+    def _poll(self):
+        finished = None
+        latest_progress = None
+        try:
+            while True:
+                kind, payload = self._messages.get_nowait()
+                if kind == "progress":
+                    latest_progress = payload
+                else:
+                    finished = (kind, payload)
+                    break
+        except queue.Empty:
+            pass
+
+        # Only the most recent progress update per poll is rendered
+        if latest_progress is not None and self.on_progress:
+            self.on_progress(*latest_progress)
+
+        if finished is None:
+            self.root.after(self.poll_interval_ms, self._poll)
+            return
+
+        on_success, on_error, on_cancel = self._callbacks
+        self._context = None
+        self._callbacks = (None, None, None)
+        if self.on_state:
+            self.on_state(False)
+        kind, payload = finished
+        if kind == "done":
+            on_success(payload)
+        elif kind == "error":
+            if on_error:
+                on_error(payload)
+        elif on_cancel:
+            on_cancel()
@@ -4,30 +4,46 @@ Main window UI components
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
 import os
-import shutil
+import queue
+import threading
+import time
 
-from config.settings import WINDOW_TITLE, FILES_PER_TEST
+from config.settings import (
+    WINDOW_TITLE, FILES_PER_TEST, FOLDER_SEPARATOR, EXCEL_PREWARM, COMPLETENESS_PROFILE, COMPLETENESS_PROFILES,
+)
+from src.excel_utils import prewarm_excel_modules
 from src.file_utils import (
-    get_folder_files,
-    extract_folder_filename_bases,
-    check_file_completeness,
     build_suffix_rename_plan,
     apply_rename_plan,
-    build_files_by_base_map,
+    build_group_plan,
+    fully_deleted_bases,
 )
-from src.excel_utils import (
-    get_excel_sheets,
-    scan_excel_for_filenames,
-    build_group_mapping_from_excel,
+from src.workbook_cache import workbook_cache
+from src.compare_engine import compare_indexed
+from src.completeness import get_completeness_profile
+from src.result_model import add_duplicate_content_section, add_verification_sections, build_compare_report
+from src.content_check import find_duplicate_contents, find_undersized_files, hash_files
+from src.folder_snapshot import load_folder_index, load_folder_listing
+from src.folder_watch import FolderWatcher
+from src.move_engine import execute_move_plan
+from src.fs_executor import execute_file_operations
+from src.rename_journal import (
+    journal_path_for,
+    has_unfinished_journal,
+    resume_rename_journal,
+    rollback_rename_journal,
 )
 from src.ui.result_window import ResultWindow
+from src.ui.job_runner import JobRunner
 
 class MainWindow:
     """
     Main window class, responsible for file selection and comparison operations
     """
+    # Profile menu entry for the plain files-per-test count check
+    COUNT_ONLY_PROFILE = "(file count)"
+
     def __init__(self, root):
         """
         Initialize main window
@@ -46,8 +62,31 @@ class MainWindow:
         # Unified suffix input
         self.rename_suffix_var = tk.StringVar()
         self.files_per_test_var = tk.StringVar(value=str(FILES_PER_TEST))
+        self.profile_var = tk.StringVar(value=COMPLETENESS_PROFILE or self.COUNT_ONLY_PROFILE)
+        self.recursive_var = tk.BooleanVar(value=False)
+        # Optional content verification after the folder scan
+        self.verify_sizes_var = tk.BooleanVar(value=False)
+        self.hash_contents_var = tk.BooleanVar(value=False)
+        self.find_duplicates_var = tk.BooleanVar(value=False)
+        self.status_var = tk.StringVar(value="Ready")
+        # Live watch mode: watcher thread -> UI queue, and the window showing the live result
+        self.watcher = None
+        self.watch_queue = queue.Queue()
+        self.watch_context = None
+        self.watch_window = None
         
         self.setup_ui()
+        self.jobs = JobRunner(self.root, on_progress=self._show_progress, on_state=self._set_busy)
+        if EXCEL_PREWARM:
+            # after_idle runs once the window has been drawn
+            self.root.after_idle(self._prewarm_excel)
+
+    @staticmethod
+    def _prewarm_excel():
+        """
+        Load the Excel libraries in the background so the first comparison starts faster.
+        """
+        threading.Thread(target=prewarm_excel_modules, name="namecheck-prewarm", daemon=True).start()
     
     def setup_ui(self):
         """
@@ -66,13 +105,30 @@ class MainWindow:
         # Folder selection
         tk.Label(self.root, text="Select Folder:").grid(row=2, column=0, padx=10, pady=10)
         tk.Entry(self.root, textvariable=self.folder_path_var, width=50).grid(row=2, column=1, padx=10, pady=10)
-        tk.Button(self.root, text="Browse", command=self.select_folder).grid(row=2, column=2, padx=10, pady=10)
+        folder_btn_frame = tk.Frame(self.root)
+        folder_btn_frame.grid(row=2, column=2, padx=10, pady=10)
+        tk.Button(folder_btn_frame, text="Browse", command=self.select_folder).pack(side=tk.LEFT)
+        tk.Button(folder_btn_frame, text="Add", command=self.add_folder).pack(side=tk.LEFT, padx=(5, 0))
         
         # Files per test input
         tk.Label(self.root, text="File number per Test:").grid(row=3, column=0, padx=10, pady=5)
-        tk.Entry(self.root, textvariable=self.files_per_test_var, width=10).grid(row=3, column=1, padx=10, pady=5, sticky='w')
+        completeness_frame = tk.Frame(self.root)
+        completeness_frame.grid(row=3, column=1, padx=10, pady=5, sticky='w')
+        tk.Entry(completeness_frame, textvariable=self.files_per_test_var, width=10).pack(side=tk.LEFT)
+        tk.Label(completeness_frame, text="Profile:").pack(side=tk.LEFT, padx=(10, 0))
+        tk.OptionMenu(
+            completeness_frame, self.profile_var, self.COUNT_ONLY_PROFILE, *sorted(COMPLETENESS_PROFILES)
+        ).pack(side=tk.LEFT)
+        options_frame = tk.Frame(self.root)
+        options_frame.grid(row=3, column=2, padx=10, pady=5, sticky='w')
+        tk.Checkbutton(options_frame, text="Include subfolders", variable=self.recursive_var).pack(anchor='w')
+        tk.Checkbutton(options_frame, text="Check empty files", variable=self.verify_sizes_var).pack(anchor='w')
+        tk.Checkbutton(options_frame, text="Hash file contents", variable=self.hash_contents_var).pack(anchor='w')
+        tk.Checkbutton(options_frame, text="Find duplicate contents", variable=self.find_duplicates_var).pack(anchor='w')
 
         # Start comparison button
+        self.watch_button = tk.Button(self.root, text="Watch Folder", command=self.toggle_watch)
+        self.watch_button.grid(row=4, column=0, padx=10, pady=10)
         tk.Button(self.root, text="Start Comparison", command=self.compare_files).grid(row=4, column=1, padx=10, pady=10)
         tk.Button(
             self.root,
@@ -88,12 +144,21 @@ class MainWindow:
         btn_frame.grid(row=7, column=1, pady=10)
         tk.Button(btn_frame, text="Preview Rename", command=self.preview_rename).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Apply Rename", command=self.execute_rename).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Undo Last Rename", command=self.rollback_rename).pack(side=tk.LEFT, padx=5)
 
         # Excel-driven grouping
         ttk.Separator(self.root, orient='horizontal').grid(row=8, column=0, columnspan=3, sticky='ew', padx=10, pady=(5, 5))
         tk.Label(self.root, text="Group files by Excel column:").grid(row=9, column=0, padx=10, pady=5, sticky='w')
         tk.Entry(self.root, textvariable=self.group_column_var, width=6).grid(row=9, column=1, padx=10, pady=5, sticky='w')
         tk.Button(self.root, text="Group Files", command=self.group_files_by_excel).grid(row=9, column=2, padx=10, pady=5, sticky='w')
+
+        # Background job status
+        ttk.Separator(self.root, orient='horizontal').grid(row=10, column=0, columnspan=3, sticky='ew', padx=10, pady=(5, 5))
+        tk.Label(self.root, textvariable=self.status_var, anchor='w').grid(row=11, column=0, padx=10, pady=5, sticky='ew')
+        self.progress_bar = ttk.Progressbar(self.root, orient='horizontal', length=300, mode='determinate')
+        self.progress_bar.grid(row=11, column=1, padx=10, pady=5, sticky='ew')
+        self.cancel_button = tk.Button(self.root, text="Cancel", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_button.grid(row=11, column=2, padx=10, pady=5, sticky='w')
     
     def select_excel_file(self):
         """
@@ -104,7 +169,7 @@ class MainWindow:
         if file_path:
             try:
                 # Read all sheet names from Excel file
-                sheet_names = get_excel_sheets(file_path)
+                sheet_names = workbook_cache.get_sheet_names(file_path)
                 self.sheet_var.set(sheet_names[0])  # default select first sheet
                 self.sheet_menu['menu'].delete(0, 'end')  # clear old menu
                 for sheet in sheet_names:
@@ -118,6 +183,70 @@ class MainWindow:
         """
         folder_path = filedialog.askdirectory(title="Select Folder")
         self.folder_path_var.set(folder_path)
+
+    def add_folder(self):
+        """
+        Add another folder to compare (folders are separated by FOLDER_SEPARATOR)
+        """
+        folder_path = filedialog.askdirectory(title="Add Folder")
+        if not folder_path:
+            return
+        roots = self._get_folder_roots()
+        if folder_path not in roots:
+            roots.append(folder_path)
+        self.folder_path_var.set(FOLDER_SEPARATOR.join(roots))
+
+    def _get_folder_roots(self):
+        """
+        Return the selected folders as a list.
+        """
+        raw_value = self.folder_path_var.get()
+        return [path.strip() for path in raw_value.split(FOLDER_SEPARATOR) if path.strip()]
+
+    def _show_progress(self, message, current=None, total=None):
+        """
+        Render a progress update from the running job.
+        """
+        if total:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', maximum=total, value=current or 0)
+            self.status_var.set(f"{message} ({current}/{total})")
+        else:
+            if str(self.progress_bar['mode']) != 'indeterminate':
+                self.progress_bar.config(mode='indeterminate')
+                self.progress_bar.start(15)
+            self.status_var.set(message)
+
+    def _set_busy(self, busy):
+        """
+        Toggle status widgets when a job starts or finishes.
+        """
+        self.cancel_button.config(state=tk.NORMAL if busy else tk.DISABLED)
+        if not busy:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', value=0)
+            self.status_var.set("Ready")
+
+    def cancel_job(self):
+        """
+        Cancel the running background job
+        """
+        self.jobs.cancel()
+        self.status_var.set("Cancelling...")
+
+    def _start_job(self, func, on_success, error_prefix, description):
+        """
+        Run func(context) in the background; errors are shown as "{error_prefix}: {error}".
+        """
+        def on_error(exc):
+            messagebox.showerror("Error", f"{error_prefix}: {str(exc)}" if error_prefix else str(exc))
+
+        def on_cancel():
+            messagebox.showinfo("Info", "Operation cancelled")
+
+        started = self.jobs.submit(func, on_success, on_error=on_error, on_cancel=on_cancel, description=description)
+        if not started:
+            messagebox.showinfo("Info", "Another operation is still running, please wait or cancel it first")
     
     def compare_files(self):
         """
@@ -135,75 +264,165 @@ class MainWindow:
         if not files_per_test:
             return
 
-        try:
-            # Read selected Excel sheet
-            df = pd.read_excel(excel_file_path, sheet_name=selected_sheet)
-            
-            # Scan entire Excel for filenames matching pattern and get duplicates
-            excel_filenames, duplicates, test_count = scan_excel_for_filenames(df)
-            
-            # Get file list from folder
-            folder_filenames = get_folder_files(folder_path)
-            
-            # Extract relevant filenames from folder and use set to remove duplicates
-            folder_filenames_base = extract_folder_filename_bases(folder_filenames)
-            
-            # Compare filenames (only match patterns)
-            excel_not_in_folder = excel_filenames[~excel_filenames.isin(folder_filenames_base)]
-            folder_not_in_excel = [f for f in folder_filenames_base if f not in excel_filenames.values]
-            
-            # Check file completeness
-            incomplete_files = check_file_completeness(
-                folder_path,
-                folder_filenames,
+        roots = self._get_folder_roots()
+        recursive = self.recursive_var.get()
+        profile = self._get_completeness_profile()
+        hash_contents = self.hash_contents_var.get()
+        verify_sizes = self.verify_sizes_var.get() or hash_contents
+        find_duplicates = self.find_duplicates_var.get()
+
+        def job(context):
+            return self._build_compare_result(
+                context, excel_file_path, selected_sheet, roots, recursive, files_per_test, profile,
+                verify_sizes, hash_contents, find_duplicates,
+            )
+
+        # 在后台比较，完成后显示结果窗口
+        self._start_job(
+            job,
+            lambda result: ResultWindow(self.root, result),
+            "An error occurred",
+            "Comparing...",
+        )
+
+    def _build_compare_result(self, context, excel_file_path, selected_sheet, roots, recursive, files_per_test,
+                              profile=None, verify_sizes=False, hash_contents=False, find_duplicates=False):
+        """
+        Worker-thread part of compare_files, returns the ResultReport.
+        """
+        # Filename index of the selected sheet (cached, duplicates kept); with the
+        # openpyxl backend the sheet is streamed while comparing
+        context.report("Reading Excel...")
+        excel_index = workbook_cache.get_filename_index(excel_file_path, selected_sheet, stream=True)
+        context.check_cancelled()
+        
+        # Get file list from selected folder(s)
+        context.report("Scanning folders...")
+        if verify_sizes or find_duplicates:
+            folder_index, file_stats = load_folder_listing(roots, recursive)
+        else:
+            folder_index = load_folder_index(roots, recursive)
+        context.check_cancelled()
+        
+        # Compare Excel and folder bases, check completeness and duplicates in one pass
+        context.report("Comparing...")
+        comparison = compare_indexed(excel_index["bases"], folder_index, required_files=files_per_test,
+                                     profile=profile)
+        test_count = excel_index["test_count"]
+        report = build_compare_report(comparison, selected_sheet, test_count, files_per_test, profile)
+        if find_duplicates:
+            duplicates = find_duplicate_contents(
+                file_stats,
+                progress=context.progress_callback("Comparing file contents..."),
+                cancel_event=context.cancel_event,
+            )
+            context.check_cancelled()
+            add_duplicate_content_section(report, duplicates["groups"], duplicates["errors"])
+        if not verify_sizes:
+            return report
+
+        hash_result = None
+        if hash_contents:
+            hash_result = hash_files(
+                file_stats,
+                progress=context.progress_callback("Hashing files..."),
+                cancel_event=context.cancel_event,
+            )
+            context.check_cancelled()
+        add_verification_sections(report, find_undersized_files(file_stats), hash_result)
+        return report
+
+    def toggle_watch(self):
+        """
+        Start or stop live watch mode: the comparison is kept up to date while files arrive
+        """
+        if self.watcher is not None:
+            self._stop_watch()
+            return
+
+        excel_file_path = self.excel_path_var.get()
+        selected_sheet = self.sheet_var.get()
+        if not excel_file_path or not self.folder_path_var.get():
+            messagebox.showerror("Error", "Please select Excel file and folder again")
+            return
+        files_per_test = self._get_files_per_test()
+        if not files_per_test:
+            return
+        roots = self._get_folder_roots()
+        recursive = self.recursive_var.get()
+        profile = self._get_completeness_profile()
+
+        def job(context):
+            context.report("Reading Excel...")
+            return workbook_cache.get_filename_index(excel_file_path, selected_sheet)
+
+        def on_loaded(excel_index):
+            # A fresh queue, so late messages of a stopped watcher are not shown
+            updates = self.watch_queue = queue.Queue()
+            self.watcher = FolderWatcher(
+                roots,
+                excel_index["bases"],
+                on_update=lambda result: updates.put(("update", result)),
+                recursive=recursive,
                 required_files=files_per_test,
+                profile=profile,
+                on_error=lambda exc: updates.put(("error", exc)),
             )
-            
-            result = ""
-            has_issues = False
-            
-            # In Excel but not in folder
-            if not excel_not_in_folder.empty:
-                has_issues = True
-                # Sort by time (lexicographic works for pattern like YYYY_MM_DD_HHMMSS)
-                excel_missing_list = list(excel_not_in_folder.sort_values())
-                result += f"In Excel but not in folder ({len(excel_missing_list)}):\n"
-                result += "\n".join(excel_missing_list) + "\n\n"
-            
-            # In folder but not in Excel
-            if folder_not_in_excel:
-                has_issues = True
-                # Sort by time (same rationale)
-                folder_only_list = sorted(folder_not_in_excel)
-                result += f"In folder but not in Excel ({len(folder_only_list)}):\n"
-                result += "\n".join(folder_only_list) + "\n\n"
-            
-            # Add incomplete file information
-            if incomplete_files:
-                has_issues = True
-                result += f"Incomplete file numbers (less than {files_per_test} files):\n"
-                result += ", ".join(incomplete_files) + "\n\n"
-            
-            # Add duplicate file information
-            if duplicates:
-                has_issues = True
-                result += "Duplicate filenames found in Excel:\n"
-                result += "\n".join(duplicates) + "\n\n"
-            else:
-                result += "No duplicate filenames found in Excel.\n\n"
-            
-            # If no issues found, show complete success message
-            if not has_issues:
-                result = "All numbers have complete file sets (4 files each), Excel and folder match.\nNo duplicate filenames found in Excel."
-            
-            # Add test count information at the beginning of result
-            result = f"Current Excel file ({selected_sheet}) has {test_count} different test numbers.\n\n" + result
-            
-            # 显示结果窗口
-            ResultWindow(self.root, result)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            self.watch_context = (selected_sheet, excel_index["test_count"], files_per_test, profile)
+            self.watcher.start()
+            self.watch_button.config(text="Stop Watching")
+            self.root.after(200, self._poll_watch_queue)
+
+        self._start_job(job, on_loaded, "Cannot start watching", "Reading Excel...")
+
+    def _stop_watch(self):
+        """
+        Stop watch mode; the live result window stays open with the last result
+        """
+        if self.watcher is not None:
+            # Do not block the UI: the thread ends at its next wake-up
+            self.watcher.stop(timeout=0)
+            self.watcher = None
+        self.watch_button.config(text="Watch Folder")
+
+    def _poll_watch_queue(self):
+        """
+        Show watcher updates on the Tk thread
+        """
+        watcher = self.watcher
+        if watcher is None:
+            return
+        latest = None
+        try:
+            while True:
+                kind, value = self.watch_queue.get_nowait()
+                if kind == "error":
+                    self._stop_watch()
+                    messagebox.showerror("Error", f"Watching stopped: {str(value)}")
+                    return
+                latest = value
+        except queue.Empty:
+            pass
+        if latest is not None:
+            self._show_watch_result(latest, watcher.mode)
+        self.root.after(200, self._poll_watch_queue)
+
+    def _show_watch_result(self, result, mode):
+        sheet, test_count, files_per_test, profile = self.watch_context
+        report = build_compare_report(result, sheet, test_count, files_per_test, profile)
+        report.header.append(f"Watching folder ({mode}), last update {time.strftime('%H:%M:%S')}.")
+        if self.watch_window is None or not self.watch_window.window.winfo_exists():
+            self.watch_window = ResultWindow(self.root, report)
+            # Closing the live window ends watch mode
+            self.watch_window.window.protocol("WM_DELETE_WINDOW", self._close_watch_window)
+        else:
+            self.watch_window.set_report(report)
+
+    def _close_watch_window(self):
+        self._stop_watch()
+        if self.watch_window is not None:
+            self.watch_window.window.destroy()
+            self.watch_window = None
 
     def delete_folder_only_tests(self):
         """
@@ -217,29 +436,36 @@ class MainWindow:
             messagebox.showerror("Error", "Please select Excel file and folder again")
             return
 
-        try:
-            df = pd.read_excel(excel_file_path, sheet_name=selected_sheet)
-        except Exception as e:
-            messagebox.showerror("Error", f"Cannot read Excel file: {str(e)}")
-            return
+        roots = self._get_folder_roots()
+        recursive = self.recursive_var.get()
 
-        try:
-            excel_filenames, _, _ = scan_excel_for_filenames(df)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to scan Excel: {str(e)}")
-            return
+        def job(context):
+            context.report("Reading Excel...")
+            try:
+                excel_bases = workbook_cache.get_filename_index(excel_file_path, selected_sheet)["bases"]
+            except Exception as e:
+                raise RuntimeError(f"Cannot read Excel file: {str(e)}") from e
+            context.check_cancelled()
+            context.report("Scanning folders...")
+            try:
+                folder_index = load_folder_index(roots, recursive)
+            except OSError as e:
+                raise RuntimeError(f"Cannot read folder: {str(e)}") from e
+            return compare_indexed(excel_bases, folder_index)
 
-        folder_filenames = get_folder_files(folder_path)
-        folder_filenames_base = extract_folder_filename_bases(folder_filenames)
+        self._start_job(job, self._confirm_delete_folder_only, None, "Looking for folder-only tests...")
 
-        excel_set = set(excel_filenames.values)
-        folder_only_bases = sorted([f for f in folder_filenames_base if f not in excel_set])
+    def _confirm_delete_folder_only(self, comparison):
+        """
+        Ask for confirmation and start deleting the folder-only tests.
+        """
+        folder_only_bases = comparison["folder_only"]
 
         if not folder_only_bases:
             messagebox.showinfo("Info", "No folder-only tests detected.")
             return
 
-        files_map = build_files_by_base_map(folder_path, folder_filenames)
+        files_map = comparison["files_by_base"]
         per_base_counts = {base: len(files_map.get(base, [])) for base in folder_only_bases}
         total_files = sum(per_base_counts.values())
 
@@ -260,45 +486,61 @@ class MainWindow:
         if not messagebox.askyesno("Confirm Delete", "\n".join(preview_lines)):
             return
 
-        deleted = []
-        failed = []
-        for base in folder_only_bases:
-            for file_path in files_map.get(base, []):
-                try:
-                    os.remove(file_path)
-                    deleted.append(file_path)
-                except Exception as exc:
-                    failed.append((file_path, str(exc)))
+        file_paths = [path for base in folder_only_bases for path in sorted(files_map.get(base, ()))]
+
+        def job(context):
+            result = execute_file_operations(
+                file_paths,
+                os.remove,
+                progress=context.progress_callback("Deleting files..."),
+                cancel_event=context.cancel_event,
+            )
+            deleted = [file_paths[index] for index in result["succeeded"]]
+            failed = [(file_paths[index], err) for index, err in result["failed"]]
+            return deleted, failed, result["cancelled"], result["per_second"]
+
+        def on_done(result):
+            self._show_delete_result(folder_only_bases, files_map, *result)
+
+        self._start_job(job, on_done, "Delete failed", "Deleting files...")
 
+    def _show_delete_result(self, folder_only_bases, files_map, deleted, failed, cancelled, per_second):
+        """
+        Show the summary of a folder-only deletion.
+        """
+        # A test counts as deleted only when none of its files is left
+        deleted_tests = fully_deleted_bases(folder_only_bases, files_map, deleted)
         lines = [
-            f"Deleted tests: {len(folder_only_bases)}",
+            f"Deleted tests: {len(deleted_tests)} of {len(folder_only_bases)}",
             f"Files deleted: {len(deleted)}",
             f"Failures: {len(failed)}",
+            f"Throughput: {per_second:.1f} files/s",
         ]
+        if cancelled:
+            lines.append("Cancelled before all files were deleted.")
         if deleted:
             lines.append("")
-            lines.append("Deleted files (first 50):")
-            for file_path in deleted[:50]:
+            lines.append("Deleted files:")
+            for file_path in deleted:
                 lines.append(f"- {os.path.basename(file_path)}")
-            if len(deleted) > 50:
-                lines.append(f"... and {len(deleted) - 50} more")
 
         if failed:
             lines.append("")
             lines.append("Failures:")
-            for file_path, err in failed[:30]:
+            for file_path, err in failed:
                 lines.append(f"- {os.path.basename(file_path)}: {err}")
-            if len(failed) > 30:
-                lines.append(f"... and {len(failed) - 30} more")
 
-        ResultWindow(self.root, "\n".join(lines))
+        ResultWindow(self.root, lines)
 
     def _require_folder_selected(self) -> str:
-        folder_path = self.folder_path_var.get()
-        if not folder_path:
+        roots = self._get_folder_roots()
+        if not roots:
             messagebox.showerror("Error", "Please select a folder first")
             return ""
-        return folder_path
+        if len(roots) > 1:
+            messagebox.showerror("Error", "This action works on a single folder, please select only one")
+            return ""
+        return roots[0]
 
     def _get_files_per_test(self) -> int:
         """
@@ -318,6 +560,13 @@ class MainWindow:
             return 0
         return number
 
+    def _get_completeness_profile(self):
+        """
+        Return the selected completeness profile, or None for the count check.
+        """
+        name = self.profile_var.get()
+        return None if name == self.COUNT_ONLY_PROFILE else get_completeness_profile(name)
+
     def preview_rename(self):
         """
         Preview rename plan for unified suffix
@@ -329,29 +578,31 @@ class MainWindow:
         if not suffix:
             messagebox.showerror("Error", "Please enter the suffix to unify, e.g. H022296_E or E")
             return
-        try:
-            changes, skipped, conflicts = build_suffix_rename_plan(folder_path, suffix)
+
+        def show_preview(plan):
+            changes, skipped, conflicts = plan
             lines = []
             lines.append(f"Target folder: {folder_path}")
             lines.append(f"Unified suffix: {suffix}")
             lines.append("")
             lines.append(f"Will rename {len(changes)} files:")
-            for old_p, new_p in changes[:500]:
+            for old_p, new_p in changes:
                 lines.append(f"{os.path.basename(old_p)}  ->  {os.path.basename(new_p)}")
-            if len(changes) > 500:
-                lines.append(f"... remaining {len(changes) - 500} not shown")
             lines.append("")
             if conflicts:
                 lines.append(f"Detected {len(conflicts)} name conflicts (will not be applied):")
-                for old_p, new_p in conflicts[:200]:
+                for old_p, new_p in conflicts:
                     lines.append(f"Conflict: {os.path.basename(old_p)} -> {os.path.basename(new_p)} already exists")
-                if len(conflicts) > 200:
-                    lines.append(f"... remaining {len(conflicts) - 200} not shown")
                 lines.append("")
             lines.append(f"Skipped {len(skipped)} items (non-matching, already correct, or directories)")
-            ResultWindow(self.root, "\n".join(lines))
-        except Exception as e:
-            messagebox.showerror("Error", f"Preview failed: {str(e)}")
+            ResultWindow(self.root, lines)
+
+        self._start_job(
+            lambda context: build_suffix_rename_plan(folder_path, suffix),
+            show_preview,
+            "Preview failed",
+            "Building rename plan...",
+        )
 
     def execute_rename(self):
         """
@@ -360,110 +611,191 @@ class MainWindow:
         folder_path = self._require_folder_selected()
         if not folder_path:
             return
+        journal_path = journal_path_for(folder_path)
+        if has_unfinished_journal(journal_path):
+            if messagebox.askyesno(
+                "Resume",
+                "An interrupted rename job was found for this folder.\nResume it now?\n\n"
+                "(No starts a new rename and discards the journal of the interrupted job.)",
+            ):
+                self._resume_rename(journal_path)
+                return
         suffix = self.rename_suffix_var.get().strip()
         if not suffix:
             messagebox.showerror("Error", "Please enter the suffix to unify")
             return
-        try:
-            changes, skipped, conflicts = build_suffix_rename_plan(folder_path, suffix)
-            if not changes:
-                messagebox.showinfo("Info", "No files need to be renamed")
-                return
-            if conflicts:
-                messagebox.showwarning("Warning", f"There are {len(conflicts)} name conflicts, they will be skipped")
-            if not messagebox.askyesno("Confirm", f"Apply rename to {len(changes)} files?"):
-                return
-            stats = apply_rename_plan(changes)
+        self._start_job(
+            lambda context: build_suffix_rename_plan(folder_path, suffix),
+            lambda plan: self._confirm_rename(plan, journal_path),
+            "Apply failed",
+            "Building rename plan...",
+        )
+
+    def _resume_rename(self, journal_path):
+        """
+        Finish an interrupted rename job from its journal.
+        """
+        def job(context):
+            return resume_rename_journal(
+                journal_path,
+                progress=context.progress_callback("Renaming files..."),
+                cancel_event=context.cancel_event,
+            )
+
+        self._start_job(
+            job,
+            lambda stats: self._show_rename_result(stats, [], []),
+            "Resume failed",
+            "Resuming rename...",
+        )
+
+    def rollback_rename(self):
+        """
+        Undo the last rename job applied to the selected folder
+        """
+        folder_path = self._require_folder_selected()
+        if not folder_path:
+            return
+        journal_path = journal_path_for(folder_path)
+        if not os.path.exists(journal_path):
+            messagebox.showinfo("Info", "No rename job recorded for this folder")
+            return
+        if not messagebox.askyesno("Confirm", "Restore the original names of the last rename job in this folder?"):
+            return
+
+        def job(context):
+            return rollback_rename_journal(
+                journal_path,
+                progress=context.progress_callback("Restoring names..."),
+                cancel_event=context.cancel_event,
+            )
+
+        def on_done(stats):
             message = (
-                f"Rename completed\n\n"
-                f"Success: {stats['renamed']}\n"
-                f"Failed: {stats['failed']}\n"
-                f"Conflicts skipped: {len(conflicts)}\n"
-                f"Other skipped: {len(skipped)}"
+                f"Rollback completed\n\n"
+                f"Restored: {stats['restored']}\n"
+                f"Failed: {stats['failed']}"
+            )
+            if stats.get('recovered'):
+                message += (f"\n\n{stats['recovered']} of the restored files had been renamed "
+                            f"after the journal was last saved (interrupted job).")
+            if stats.get('cancelled'):
+                message += "\n\nCancelled before all files were restored."
+            for new_p, old_p, err in stats['failures'][:10]:
+                message += f"\n- {os.path.basename(new_p)}: {err}"
+            messagebox.showinfo("Done", message)
+
+        self._start_job(job, on_done, "Rollback failed", "Restoring names...")
+
+    def _confirm_rename(self, plan, journal_path):
+        """
+        Confirm the rename plan and apply it in the background.
+        """
+        changes, skipped, conflicts = plan
+        if not changes:
+            messagebox.showinfo("Info", "No files need to be renamed")
+            return
+        if conflicts:
+            messagebox.showwarning("Warning", f"There are {len(conflicts)} name conflicts, they will be skipped")
+        if not messagebox.askyesno("Confirm", f"Apply rename to {len(changes)} files?"):
+            return
+
+        def job(context):
+            return apply_rename_plan(
+                changes,
+                progress=context.progress_callback("Renaming files..."),
+                cancel_event=context.cancel_event,
+                journal_path=journal_path,
             )
-            if stats.get('failed'):
-                # 分析失败原因并给出简洁说明
-                failure_reasons = {}
-                for old_p, new_p, err in stats.get('failures', []):
-                    if "already exists" in err or "bereits vorhanden" in err:
-                        reason = "Target file already exists (conflict)"
-                    elif "Permission denied" in err or "Access is denied" in err:
-                        reason = "Permission denied (file in use)"
-                    elif "cannot find" in err:
-                        reason = "Source file not found"
-                    else:
-                        reason = f"Other error: {err[:50]}..."
-                    
-                    if reason not in failure_reasons:
-                        failure_reasons[reason] = 0
-                    failure_reasons[reason] += 1
-                
-                # 构建详细消息
-                detail_msg = message + "\n\nFailure reasons:\n"
-                for reason, count in failure_reasons.items():
-                    detail_msg += f"- {reason}: {count} files\n"
-                
-                messagebox.showinfo("Done", detail_msg)
-            else:
-                messagebox.showinfo("Done", message)
-        except Exception as e:
-            messagebox.showerror("Error", f"Apply failed: {str(e)}")
 
-    def _match_excel_prefix(self, file_stem: str, sorted_names):
+        self._start_job(
+            job,
+            lambda stats: self._show_rename_result(stats, skipped, conflicts),
+            "Apply failed",
+            "Renaming files...",
+        )
+
+    def _show_rename_result(self, stats, skipped, conflicts):
         """
-        Return the Excel entry whose prefix matches the given filename stem.
+        Show the summary of an applied rename plan.
         """
-        stem = file_stem.strip().lower()
-        for candidate in sorted_names:
-            if stem.startswith(candidate.lower()):
-                return candidate
-        return None
+        message = (
+            f"Rename completed\n\n"
+            f"Success: {stats['renamed']}\n"
+            f"Failed: {stats['failed']}\n"
+            f"Conflicts skipped: {len(conflicts)}\n"
+            f"Other skipped: {len(skipped)}\n"
+            f"Throughput: {stats.get('per_second', 0.0):.1f} files/s"
+        )
+        if stats.get('recovered'):
+            message += f"\n\n{stats['recovered']} renames had already finished before the interruption."
+        if stats.get('cancelled'):
+            message += "\n\nCancelled before all files were renamed."
+        if stats.get('failed'):
+            # 分析失败原因并给出简洁说明
+            failure_reasons = {}
+            for old_p, new_p, err in stats.get('failures', []):
+                if "already exists" in err or "File exists" in err or "bereits vorhanden" in err:
+                    reason = "Target file already exists (conflict)"
+                elif "Permission denied" in err or "Access is denied" in err:
+                    reason = "Permission denied (file in use)"
+                elif "cannot find" in err:
+                    reason = "Source file not found"
+                else:
+                    reason = f"Other error: {err[:50]}..."
+                
+                if reason not in failure_reasons:
+                    failure_reasons[reason] = 0
+                failure_reasons[reason] += 1
+            
+            # 构建详细消息
+            detail_msg = message + "\n\nFailure reasons:\n"
+            for reason, count in failure_reasons.items():
+                detail_msg += f"- {reason}: {count} files\n"
+            
+            messagebox.showinfo("Done", detail_msg)
+        else:
+            messagebox.showinfo("Done", message)
 
     def group_files_by_excel(self):
         """
         Group folder files into subfolders using Excel column values (default L).
         """
         excel_file_path = self.excel_path_var.get()
-        folder_path = self.folder_path_var.get()
         selected_sheet = self.sheet_var.get()
         group_column = (self.group_column_var.get() or "L").strip() or "L"
 
-        if not excel_file_path or not folder_path:
+        if not excel_file_path:
             messagebox.showerror("Error", "Please select Excel file and folder again")
             return
-
-        try:
-            df = pd.read_excel(excel_file_path, sheet_name=selected_sheet)
-        except Exception as e:
-            messagebox.showerror("Error", f"Cannot read Excel file: {str(e)}")
+        folder_path = self._require_folder_selected()
+        if not folder_path:
             return
 
-        try:
-            filename_to_group, _ = build_group_mapping_from_excel(df, group_column, "M")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to parse column {group_column or 'L'}/M: {str(e)}")
-            return
+        def job(context):
+            context.report("Reading Excel...")
+            try:
+                filename_to_group, _ = workbook_cache.get_group_mapping(
+                    excel_file_path, selected_sheet, group_column, "M"
+                )
+            except ValueError as e:
+                raise RuntimeError(f"Failed to parse column {group_column or 'L'}/M: {str(e)}") from e
+            except Exception as e:
+                raise RuntimeError(f"Cannot read Excel file: {str(e)}") from e
+            context.check_cancelled()
+            context.report("Matching files...")
+            return build_group_plan(folder_path, filename_to_group)
+
+        def on_planned(result):
+            self._confirm_group_move(result, selected_sheet, group_column)
 
-        folder_entries = get_folder_files(folder_path)
-        sorted_names = sorted(filename_to_group.keys(), key=len, reverse=True)
-        plan = []
-        unmatched_files = []
-        missing_excel = set(filename_to_group.keys())
-        for entry in folder_entries:
-            full_path = os.path.join(folder_path, entry)
-            if os.path.isdir(full_path):
-                continue
-            stem = os.path.splitext(entry)[0]
-            matched = self._match_excel_prefix(stem, sorted_names)
-            if not matched:
-                unmatched_files.append(entry)
-                continue
-            group_value = filename_to_group[matched]
-            target_dir = os.path.join(folder_path, group_value)
-            dest_path = os.path.join(target_dir, entry)
-            plan.append((full_path, dest_path, entry, group_value, target_dir, matched))
-            missing_excel.discard(matched)
+        self._start_job(job, on_planned, None, "Preparing grouping...")
 
+    def _confirm_group_move(self, planned, selected_sheet, group_column):
+        """
+        Confirm the grouping plan and move the files in the background.
+        """
+        plan, unmatched_files, missing_excel, filename_to_group = planned
         if not plan:
             messagebox.showinfo("Info", "No files match the Excel filenames in this folder.")
             return
@@ -471,22 +803,32 @@ class MainWindow:
         if not messagebox.askyesno("Confirm", f"Move {len(plan)} files into folders named after column {group_column} values?"):
             return
 
-        moved = []
-        conflicts = []
-        errors = []
-        created_dirs = set()
-        for src, dest, entry, group_value, target_dir, _ in plan:
-            os.makedirs(target_dir, exist_ok=True)
-            if os.path.exists(dest):
-                conflicts.append(f"{entry} (target {group_value})")
-                continue
-            try:
-                shutil.move(src, dest)
-                moved.append((entry, group_value))
-                created_dirs.add(group_value)
-            except Exception as exc:
-                errors.append((entry, group_value, str(exc)))
+        def job(context):
+            return execute_move_plan(
+                [(src, dest) for src, dest, _, _, _, _ in plan],
+                progress=context.progress_callback("Moving files..."),
+                cancel_event=context.cancel_event,
+            )
 
+        def on_done(stats):
+            labels = {src: (entry, group_value) for src, _, entry, group_value, _, _ in plan}
+            moved = [labels[src] for src, _ in stats["moved"]]
+            conflicts = [
+                "{} (target {})".format(*labels[src]) for src, _ in stats["conflicts"]
+            ]
+            errors = [labels[src] + (err,) for src, _, err in stats["errors"]]
+            self._show_group_result(
+                selected_sheet, group_column, moved, conflicts, errors, stats["created_dirs"],
+                unmatched_files, missing_excel, filename_to_group, stats["cancelled"],
+            )
+
+        self._start_job(job, on_done, "Move failed", "Moving files...")
+
+    def _show_group_result(self, selected_sheet, group_column, moved, conflicts, errors, created_dirs,
+                           unmatched_files, missing_excel, filename_to_group, cancelled):
+        """
+        Show the summary of an Excel-driven grouping.
+        """
         missing_by_group = {}
         for name in missing_excel:
             group_value = filename_to_group[name]
@@ -502,45 +844,37 @@ class MainWindow:
             f"Errors while moving: {len(errors)}",
             f"Files skipped (not in Excel): {len(unmatched_files)}",
         ]
+        if cancelled:
+            lines.append("Cancelled before all files were moved.")
 
         if moved:
             lines.append("")
-            lines.append("Moved files (first 50):")
-            for entry, group_value in moved[:50]:
+            lines.append("Moved files:")
+            for entry, group_value in moved:
                 lines.append(f"- {entry} -> {group_value}/")
-            if len(moved) > 50:
-                lines.append(f"... and {len(moved) - 50} more")
 
         if conflicts:
             lines.append("")
             lines.append("Conflicts:")
-            for item in conflicts[:30]:
+            for item in conflicts:
                 lines.append(f"- {item}")
-            if len(conflicts) > 30:
-                lines.append(f"... and {len(conflicts) - 30} more")
 
         if errors:
             lines.append("")
             lines.append("Move errors:")
-            for entry, group_value, err in errors[:30]:
+            for entry, group_value, err in errors:
                 lines.append(f"- {entry} -> {group_value}: {err}")
-            if len(errors) > 30:
-                lines.append(f"... and {len(errors) - 30} more")
 
         if missing_by_group:
             lines.append("")
             lines.append("Excel entries without files in folder:")
-            for group_value, count in list(missing_by_group.items())[:30]:
+            for group_value, count in missing_by_group.items():
                 lines.append(f"- {group_value}: {count} names not found")
-            if len(missing_by_group) > 30:
-                lines.append(f"... and {len(missing_by_group) - 30} more groups")
 
         if unmatched_files:
             lines.append("")
-            lines.append("Files left in root folder (first 30):")
-            for entry in unmatched_files[:30]:
+            lines.append("Files left in root folder:")
+            for entry in unmatched_files:
                 lines.append(f"- {entry}")
-            if len(unmatched_files) > 30:
-                lines.append(f"... and {len(unmatched_files) - 30} more")
 
-        ResultWindow(self.root, "\n".join(lines))
+        ResultWindow(self.root, lines)
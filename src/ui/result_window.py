@@ -3,21 +3,25 @@ Result window UI components
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, filedialog, messagebox
 
 from config.settings import RESULT_WINDOW_TITLE, RESULT_WINDOW_WIDTH, RESULT_WINDOW_HEIGHT
+from src.result_export import ExportCancelled, export_report
+from src.result_model import ResultReport
+from src.ui.job_runner import JobCancelled, JobRunner
+from src.ui.virtual_list import VirtualList
 
 class ResultWindow:
     """
     Window class for displaying comparison results
     """
-    def __init__(self, parent, result_text):
+    def __init__(self, parent, result):
         """
         Initialize result window
         
         Args:
             parent: parent window
-            result_text: result text to display
+            result: ResultReport to display, or plain result text / list of lines
         """
         self.window = tk.Toplevel(parent)
         self.window.title(RESULT_WINDOW_TITLE)
@@ -27,8 +31,14 @@ class ResultWindow:
         self.window.resizable(True, True)
         self.window.minsize(400, 300)  # 设置最小尺寸
 
-        # Save original text for undo
-        self.original_text = result_text
+        if isinstance(result, ResultReport):
+            self.report = result
+        elif isinstance(result, str):
+            self.report = ResultReport.from_lines(result.split('\n'))
+        else:
+            self.report = ResultReport.from_lines(result)
+        # Suffix currently appended to filename items; Undo resets it
+        self.applied_suffix = ""
 
         # Add input box and button frame
         self.input_frame = ttk.Frame(self.window)
@@ -44,36 +54,9 @@ class ResultWindow:
         ttk.Button(self.input_frame, text="Apply Suffix", command=self.apply_suffix).pack(side=tk.LEFT, padx=5)
         ttk.Button(self.input_frame, text="Undo", command=self.undo_changes).pack(side=tk.LEFT, padx=5)
 
-        # Create text box with scrollbars and dynamic sizing
-        text_frame = tk.Frame(self.window)
-        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # 创建滚动条
-        v_scrollbar = tk.Scrollbar(text_frame, orient=tk.VERTICAL)
-        h_scrollbar = tk.Scrollbar(text_frame, orient=tk.HORIZONTAL)
-        
-        # 创建文本框
-        self.text_widget = tk.Text(
-            text_frame, 
-            wrap=tk.NONE,  # 不自动换行，让水平滚动条处理
-            yscrollcommand=v_scrollbar.set,
-            xscrollcommand=h_scrollbar.set,
-            font=('Consolas', 9)  # 使用等宽字体，便于对齐
-        )
-        self.text_widget.insert(tk.END, result_text)
-        
-        # 配置滚动条
-        v_scrollbar.config(command=self.text_widget.yview)
-        h_scrollbar.config(command=self.text_widget.xview)
-        
-        # 布局
-        self.text_widget.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
-        h_scrollbar.grid(row=1, column=0, sticky='ew')
-        
-        # 配置网格权重，让文本框可以扩展
-        text_frame.grid_rowconfigure(0, weight=1)
-        text_frame.grid_columnconfigure(0, weight=1)
+        # Virtualized list: only visible rows are drawn, so long results open instantly
+        self.list_view = VirtualList(self.window, rows=self.report.to_lines(), font=('Consolas', 9))
+        self.list_view.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         # Create button frame
         button_frame = ttk.Frame(self.window)
@@ -82,6 +65,27 @@ class ResultWindow:
         # Add copy buttons
         ttk.Button(button_frame, text="Copy Results (Keep Line Breaks)", command=self.copy_text).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Copy as Single Line", command=self.copy_as_single_line).pack(side=tk.LEFT, padx=5)
+        self.export_button = ttk.Button(button_frame, text="Export...", command=self.export_results)
+        self.export_button.pack(side=tk.LEFT, padx=5)
+
+        # Export progress; the export runs on a worker thread so the window stays responsive
+        status_frame = ttk.Frame(self.window)
+        status_frame.pack(fill=tk.X, padx=10, pady=(0, 5))
+        self.status_var = tk.StringVar()
+        ttk.Label(status_frame, textvariable=self.status_var).pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(status_frame, text="Cancel", command=self.cancel_export, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT)
+        self.progress_bar = ttk.Progressbar(status_frame, orient='horizontal', length=200, mode='determinate')
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+        self.jobs = JobRunner(self.window, on_progress=self._show_progress, on_state=self._set_busy)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+    def set_report(self, report: ResultReport):
+        """
+        Replace the displayed report (live updates), keeping the applied suffix
+        """
+        self.report = report
+        self.list_view.set_rows(self.report.to_lines(self.applied_suffix))
 
     def apply_suffix(self):
         """
@@ -89,53 +93,113 @@ class ResultWindow:
         """
         suffix = self.suffix_var.get()
         if suffix:
-            # Get all text content
-            content = self.text_widget.get("1.0", tk.END).strip()
-            lines = content.split('\n')
-            
-            # Process each line
-            new_content = []
-            for line in lines:
-                if line.strip() and not line.startswith("In Excel") and not line.startswith("In Folder"):
-                    line = line + suffix
-                new_content.append(line)
-            
-            # Update text box content
-            self.text_widget.delete("1.0", tk.END)
-            self.text_widget.insert("1.0", '\n'.join(new_content))
+            self.applied_suffix += suffix
+            self.list_view.set_rows(self.report.to_lines(self.applied_suffix))
 
     def undo_changes(self):
         """
         Undo changes, restore original text
         """
-        self.text_widget.delete("1.0", tk.END)
-        self.text_widget.insert("1.0", self.original_text)
+        self.applied_suffix = ""
+        self.list_view.set_rows(self.report.to_lines())
 
     def copy_text(self):
         """
         Copy text (keep line breaks)
         """
         self.window.clipboard_clear()
-        self.window.clipboard_append(self.text_widget.get("1.0", tk.END))
+        self.window.clipboard_append(self.report.to_text(self.applied_suffix))
         messagebox.showinfo("Success", "Results copied to clipboard!")
 
     def copy_as_single_line(self):
         """
-        Copy as single line (remove line breaks and title lines)
+        Copy as single line (filenames only, no titles or line breaks)
         """
-        content = self.text_widget.get("1.0", tk.END).strip()
-        lines = content.split('\n')
-        
-        # Filter out title lines and empty lines, keep only filenames, remove all whitespace
-        filenames = [line.strip() for line in lines 
-                    if line.strip() and not line.startswith("In Excel") and not line.startswith("In folder")]
+        filenames = self.report.filenames(self.applied_suffix)
+        if self.report.section("text") is not None:
+            # Plain text results: every non-empty line
+            filenames = (line.strip() for line in self.report.to_lines(self.applied_suffix) if line.strip())
         
         # Directly connect all filenames (no separators)
         single_line = ''.join(filenames)
         
-        # Ensure all possible line breaks are removed
-        single_line = single_line.replace('\n', '').replace('\r', '')
-        
         self.window.clipboard_clear()
         self.window.clipboard_append(single_line)
-        messagebox.showinfo("Success", "Results copied as single line!")
\ No newline at end of file
+        messagebox.showinfo("Success", "Results copied as single line!")
+
+    def export_results(self):
+        """
+        Export the result sections to CSV, XLSX or Parquet
+        """
+        file_path = filedialog.asksaveasfilename(
+            parent=self.window,
+            title="Export results",
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("Parquet files", "*.parquet")],
+        )
+        if not file_path:
+            return
+        report, suffix = self.report, self.applied_suffix
+
+        def job(context):
+            try:
+                return export_report(
+                    report, file_path, suffix=suffix,
+                    progress=context.progress_callback("Exporting..."),
+                    cancel_event=context.cancel_event,
+                )
+            except ExportCancelled:
+                raise JobCancelled() from None
+
+        self.jobs.submit(
+            job,
+            lambda count: self._notify(messagebox.showinfo, "Success", f"Exported {count} rows to {file_path}"),
+            on_error=lambda exc: self._notify(messagebox.showerror, "Error", f"Export failed: {str(exc)}"),
+            on_cancel=lambda: self._notify(messagebox.showinfo, "Cancelled", "Export cancelled"),
+            description="Exporting...",
+        )
+
+    def _notify(self, show, title, message):
+        """
+        Show the outcome of an export unless the window was closed meanwhile.
+        """
+        if self.window.winfo_exists():
+            show(title, message, parent=self.window)
+
+    def cancel_export(self):
+        """
+        Cancel the running export
+        """
+        self.jobs.cancel()
+        self.status_var.set("Cancelling...")
+
+    def close(self):
+        """
+        Close the window, cancelling a running export
+        """
+        self.jobs.cancel()
+        self.window.destroy()
+
+    def _show_progress(self, message, current=None, total=None):
+        """
+        Render a progress update of the export.
+        """
+        if not self.window.winfo_exists():
+            return
+        if total:
+            self.progress_bar.config(maximum=total, value=current or 0)
+            self.status_var.set(f"{message} ({current}/{total})")
+        else:
+            self.status_var.set(message)
+
+    def _set_busy(self, busy):
+        """
+        Toggle the export widgets when an export starts or finishes.
+        """
+        if not self.window.winfo_exists():
+            return
+        self.export_button.config(state=tk.DISABLED if busy else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if busy else tk.DISABLED)
+        if not busy:
+            self.progress_bar.config(value=0)
+            self.status_var.set("")
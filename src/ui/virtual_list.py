@@ -0,0 +1,254 @@
+"""
+Virtualized list view: only the visible rows are drawn
+"""
+
+import sys
+import tkinter as tk
+import tkinter.font as tkfont
+from typing import List, Optional, Sequence, Tuple
+
+
+class VirtualList(tk.Frame):
+    """
+    Read-only, scrollable list of text rows drawn on a Canvas.
+
+    A tk.Text widget lays out every inserted line, so inserting 100k lines
+    freezes the UI. Here the rows stay in a Python list and only the rows
+    that fit into the visible area are drawn; scrolling just rewrites the
+    text of a small, fixed pool of canvas items.
+
+    Rows are selected with the mouse (Shift extends, Ctrl+A selects all) and
+    copied with Ctrl+C or the context menu; "Select Text..." opens the selected
+    rows in a text box for copying part of a row.
+    """
+    # Rows shown by "Select Text..."; a Text widget with many more lines is slow
+    TEXT_DIALOG_MAX_ROWS = 1000
+    SELECT_BACKGROUND = '#cce8ff'
+
+    def __init__(self, master, rows: Sequence[str] = (), font=('Consolas', 9), **kwargs):
+        super().__init__(master, **kwargs)
+        self.font = tkfont.Font(root=self, font=font)
+        self.row_height = self.font.metrics('linespace') + 1
+        self.char_width = self.font.measure('0')
+        self.padding = 4
+
+        self.canvas = tk.Canvas(self, background='white', highlightthickness=0, takefocus=True)
+        self.v_scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.h_scrollbar = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.xview)
+        self.canvas.grid(row=0, column=0, sticky='nsew')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
+        self.h_scrollbar.grid(row=1, column=0, sticky='ew')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self._rows: List[str] = []
+        self._content_width = 0
+        self._first = 0
+        self._x_offset = 0
+        self._items: List[int] = []
+        self._highlights: List[int] = []
+        # (anchor, active) row indices of the selected range
+        self._selection: Optional[Tuple[int, int]] = None
+
+        self.menu = tk.Menu(self, tearoff=0)
+        self.menu.add_command(label="Copy", command=self.copy_selection)
+        self.menu.add_command(label="Select Text...", command=self.show_selection_text)
+        self.menu.add_separator()
+        self.menu.add_command(label="Select All", command=self.select_all)
+
+        self.canvas.bind('<Configure>', lambda event: self._redraw())
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<Shift-Button-1>', self._on_drag)
+        self.canvas.bind('<B1-Motion>', self._on_drag)
+        self.canvas.bind('<Button-2>' if sys.platform == 'darwin' else '<Button-3>', self._on_context_menu)
+        # <<Copy>> follows the platform shortcut (Ctrl+C, Cmd+C on macOS)
+        self.canvas.bind('<<Copy>>', lambda event: self.copy_selection())
+        self.canvas.bind('<<SelectAll>>', lambda event: self.select_all())
+        self.canvas.bind('<Control-a>', lambda event: self.select_all())
+        self.canvas.bind('<MouseWheel>', self._on_mousewheel)
+        self.canvas.bind('<Shift-MouseWheel>', self._on_shift_mousewheel)
+        self.canvas.bind('<Button-4>', lambda event: self.yview('scroll', -3, 'units'))
+        self.canvas.bind('<Button-5>', lambda event: self.yview('scroll', 3, 'units'))
+        self.canvas.bind('<Up>', lambda event: self.yview('scroll', -1, 'units'))
+        self.canvas.bind('<Down>', lambda event: self.yview('scroll', 1, 'units'))
+        self.canvas.bind('<Prior>', lambda event: self.yview('scroll', -1, 'pages'))
+        self.canvas.bind('<Next>', lambda event: self.yview('scroll', 1, 'pages'))
+        self.canvas.bind('<Home>', lambda event: self.yview('moveto', 0))
+        self.canvas.bind('<End>', lambda event: self.yview('moveto', 1))
+        self.canvas.bind('<Left>', lambda event: self.xview('scroll', -1, 'units'))
+        self.canvas.bind('<Right>', lambda event: self.xview('scroll', 1, 'units'))
+
+        self.set_rows(rows)
+
+    @property
+    def rows(self) -> List[str]:
+        return self._rows
+
+    def set_rows(self, rows: Sequence[str]):
+        """
+        Replace the displayed rows, keeping the scroll position where possible.
+        """
+        self._rows = list(rows)
+        self._selection = None
+        # Monospaced font: ASCII rows are as wide as their character count;
+        # other rows (e.g. CJK text) are measured
+        longest = max((len(row) for row in self._rows if row.isascii()), default=0) * self.char_width
+        for row in self._rows:
+            if not row.isascii():
+                longest = max(longest, self.font.measure(row))
+        self._content_width = longest + 2 * self.padding
+        self._redraw()
+
+    def selected_rows(self) -> List[str]:
+        """
+        Return the selected rows (empty when nothing is selected).
+        """
+        if self._selection is None:
+            return []
+        start, end = sorted(self._selection)
+        return self._rows[start:end + 1]
+
+    def select_all(self):
+        if self._rows:
+            self._selection = (0, len(self._rows) - 1)
+            self._redraw()
+        return 'break'
+
+    def copy_selection(self):
+        """
+        Copy the selected rows to the clipboard, one per line.
+        """
+        rows = self.selected_rows()
+        if rows:
+            self.clipboard_clear()
+            self.clipboard_append('\n'.join(rows))
+        return 'break'
+
+    def show_selection_text(self):
+        """
+        Open the selected rows in a read-only text box where any part can be selected and copied.
+        """
+        rows = self.selected_rows()
+        if not rows:
+            return
+        dialog = tk.Toplevel(self)
+        dialog.title("Select Text")
+        dialog.transient(self.winfo_toplevel())
+        text = tk.Text(dialog, font=self.font, wrap=tk.NONE, height=min(len(rows), 20) + 1, width=100)
+        text.insert('1.0', '\n'.join(rows[:self.TEXT_DIALOG_MAX_ROWS]))
+        if len(rows) > self.TEXT_DIALOG_MAX_ROWS:
+            text.insert(tk.END, f"\n... {len(rows) - self.TEXT_DIALOG_MAX_ROWS} more rows (use Copy)")
+        # Read-only, but selection and Ctrl+C still work in a disabled Text
+        text.config(state=tk.DISABLED)
+        text.bind('<Button-1>', lambda event: text.focus_set())
+        text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        text.focus_set()
+
+    def _row_at(self, y: int) -> Optional[int]:
+        if not self._rows:
+            return None
+        return max(0, min(len(self._rows) - 1, self._first + int(y // self.row_height)))
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        index = self._row_at(event.y)
+        self._selection = None if index is None else (index, index)
+        self._redraw()
+
+    def _on_drag(self, event):
+        index = self._row_at(event.y)
+        if index is None:
+            return
+        anchor = self._selection[0] if self._selection else index
+        self._selection = (anchor, index)
+        self._redraw()
+
+    def _on_context_menu(self, event):
+        self.canvas.focus_set()
+        index = self._row_at(event.y)
+        if index is not None and index not in range(*self._selection_bounds()):
+            self._selection = (index, index)
+            self._redraw()
+        state = tk.NORMAL if self._selection else tk.DISABLED
+        self.menu.entryconfigure("Copy", state=state)
+        self.menu.entryconfigure("Select Text...", state=state)
+        self.menu.tk_popup(event.x_root, event.y_root)
+
+    def _selection_bounds(self) -> Tuple[int, int]:
+        """
+        Selected rows as a half-open (start, end) range.
+        """
+        if self._selection is None:
+            return 0, 0
+        start, end = sorted(self._selection)
+        return start, end + 1
+
+    def _visible_count(self) -> int:
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def _redraw(self):
+        total = len(self._rows)
+        visible = self._visible_count()
+        self._first = max(0, min(self._first, total - visible))
+        view_width = max(1, self.canvas.winfo_width())
+        self._x_offset = max(0, min(self._x_offset, self._content_width - view_width))
+
+        # Grow the item pool to the number of rows that fit, never per data row
+        while len(self._items) < visible + 1:
+            highlight = self.canvas.create_rectangle(0, 0, 0, 0, fill=self.SELECT_BACKGROUND, outline='',
+                                                     state=tk.HIDDEN)
+            self.canvas.tag_lower(highlight)
+            self._highlights.append(highlight)
+            self._items.append(self.canvas.create_text(0, 0, anchor='nw', font=self.font, text=''))
+        start, end = self._selection_bounds()
+        for slot, (item, highlight) in enumerate(zip(self._items, self._highlights)):
+            index = self._first + slot
+            shown = index < total and slot <= visible
+            text = self._rows[index] if shown else ''
+            self.canvas.coords(item, self.padding - self._x_offset, slot * self.row_height)
+            self.canvas.itemconfigure(item, text=text)
+            self.canvas.coords(highlight, 0, slot * self.row_height, view_width, (slot + 1) * self.row_height)
+            selected = shown and start <= index < end
+            self.canvas.itemconfigure(highlight, state=tk.NORMAL if selected else tk.HIDDEN)
+
+        if total:
+            self.v_scrollbar.set(self._first / total, min(1.0, (self._first + visible) / total))
+        else:
+            self.v_scrollbar.set(0.0, 1.0)
+        if self._content_width > view_width:
+            self.h_scrollbar.set(self._x_offset / self._content_width,
+                                 (self._x_offset + view_width) / self._content_width)
+        else:
+            self.h_scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args):
+        """
+        Scrollbar protocol: ('moveto', fraction) or ('scroll', n, 'units'|'pages').
+        """
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._first = int(float(args[1]) * len(self._rows))
+        elif args[0] == 'scroll':
+            step = self._visible_count() if args[2] == 'pages' else 1
+            self._first += int(args[1]) * step
+        self._redraw()
+
+    def xview(self, *args):
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._x_offset = int(float(args[1]) * self._content_width)
+        elif args[0] == 'scroll':
+            step = max(1, self.canvas.winfo_width() - self.char_width) if args[2] == 'pages' else 4 * self.char_width
+            self._x_offset += int(args[1]) * step
+        self._redraw()
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.yview('scroll', -3 * delta, 'units')
+
+    def _on_shift_mousewheel(self, event):
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.xview('scroll', -delta, 'units')
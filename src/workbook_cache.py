@@ -0,0 +1,221 @@
+"""
+Excel工作簿缓存，避免每次操作都重新解析同一个sheet
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from config.settings import WORKBOOK_CACHE_SIZE, EXCEL_BACKEND, INDEX_CACHE_ENABLED
+from src.excel_utils import (
+    get_excel_sheets,
+    extract_excel_filename_bases,
+    ExcelBaseStream,
+    count_test_numbers,
+    build_group_mapping_from_excel,
+    build_group_mapping_streaming,
+)
+from src.index_store import IndexStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _file_signature(file_path: str) -> Tuple[int, int]:
+    """
+    Return (mtime_ns, size) used to detect on-disk changes.
+    """
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class StreamedFilenameIndex(Mapping):
+    """
+    Filename index of a sheet that is still being read by the openpyxl backend.
+
+    "bases" is an ExcelBaseStream that yields bases while the sheet is read;
+    "test_count" needs the whole sheet and reads the rest of it if necessary.
+    """
+    def __init__(self, stream: ExcelBaseStream):
+        self._stream = stream
+
+    def __getitem__(self, key: str):
+        if key == "bases":
+            return self._stream
+        if key == "test_count":
+            return count_test_numbers(self._stream.ordered)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("bases", "test_count"))
+
+    def __len__(self) -> int:
+        return 2
+
+
+class WorkbookCache:
+    """
+    LRU cache of parsed sheets keyed by (path, mtime, size, sheet).
+
+    Each entry holds the DataFrame plus data derived from it (filename index,
+    group mappings). An entry is dropped as soon as the file's mtime or size
+    changes, so edited workbooks are always re-read. When an IndexStore is
+    given, derived data is also persisted on disk and reused across runs.
+    """
+    def __init__(
+        self,
+        max_entries: int = WORKBOOK_CACHE_SIZE,
+        backend: str = EXCEL_BACKEND,
+        index_store: Optional[IndexStore] = None,
+    ):
+        """
+        Args:
+            max_entries: 最多缓存的sheet数量
+            backend: "pandas" 读取整个DataFrame，"openpyxl" 流式读取（不缓存DataFrame）
+            index_store: 磁盘索引缓存，为None时只使用内存缓存
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer")
+        if backend not in ("pandas", "openpyxl"):
+            raise ValueError(f"Unsupported Excel backend: {backend}")
+        self.max_entries = max_entries
+        self.backend = backend
+        self.index_store = index_store
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Dict[str, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_entry(self, file_path: str, sheet: Optional[str]) -> Dict[str, object]:
+        """
+        Return the cache entry for the sheet, creating or invalidating it as needed.
+        """
+        key = (os.path.abspath(file_path), sheet)
+        signature = _file_signature(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["signature"] == signature:
+                self._entries.move_to_end(key)
+                return entry
+            entry = {"signature": signature}
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def _get_digest(self, entry: Dict[str, object], file_path: str) -> Optional[str]:
+        """
+        Return the workbook content hash for the index store, or None when disabled/unavailable.
+        """
+        if self.index_store is None:
+            return None
+        if "digest" not in entry:
+            try:
+                entry["digest"] = self.index_store.get_digest(file_path)
+            except OSError:
+                entry["digest"] = None
+        return entry["digest"]
+
+    def get_sheet_names(self, file_path: str) -> List[str]:
+        """
+        获取Excel文件的所有sheet名称（缓存）
+        """
+        entry = self._get_entry(file_path, None)
+        if "sheet_names" not in entry:
+            entry["sheet_names"] = get_excel_sheets(file_path)
+        return entry["sheet_names"]
+
+    def get_dataframe(self, file_path: str, sheet: str) -> "pd.DataFrame":
+        """
+        读取指定sheet（缓存）。返回的DataFrame为共享对象，调用方不应修改。
+        """
+        entry = self._get_entry(file_path, sheet)
+        if "df" not in entry:
+            import pandas as pd
+            entry["df"] = pd.read_excel(file_path, sheet_name=sheet)
+        return entry["df"]
+
+    def get_filename_index(self, file_path: str, sheet: str, stream: bool = False) -> Mapping[str, object]:
+        """
+        获取sheet中的文件名索引（缓存）
+
+        Args:
+            stream: openpyxl后端且没有缓存时返回 StreamedFilenameIndex，
+                调用方可在读完整个sheet之前开始比较；读完后索引同样会被缓存
+
+        Returns:
+            {"bases": 所有文件名基本部分（含重复项，按列顺序）, "test_count": 不同测试编号的数量}
+        """
+        entry = self._get_entry(file_path, sheet)
+        if "filename_index" not in entry:
+            digest = self._get_digest(entry, file_path)
+            index = self.index_store.load_filename_index(digest, sheet, self.backend) if digest else None
+            if index is None:
+                if self.backend == "openpyxl":
+                    bases_stream = ExcelBaseStream(
+                        file_path, sheet,
+                        on_complete=lambda bases: self._store_filename_index(entry, digest, sheet, bases),
+                    )
+                    if stream:
+                        return StreamedFilenameIndex(bases_stream)
+                    bases_stream.ordered
+                    return entry["filename_index"]
+                bases = extract_excel_filename_bases(self.get_dataframe(file_path, sheet))
+                self._store_filename_index(entry, digest, sheet, bases)
+                return entry["filename_index"]
+            entry["filename_index"] = index
+        return entry["filename_index"]
+
+    def _store_filename_index(self, entry: Dict[str, object], digest: Optional[str], sheet: str, bases: List[str]):
+        """
+        Cache the index of a completely read sheet (in memory and in the index store).
+        """
+        index = {
+            "bases": bases,
+            "test_count": count_test_numbers(bases),
+        }
+        if digest:
+            self.index_store.save_filename_index(digest, sheet, self.backend, index)
+        entry["filename_index"] = index
+
+    def get_group_mapping(self, file_path: str, sheet: str, group_column="L", names_column="M"):
+        """
+        获取文件名与分组的映射（缓存），参见 build_group_mapping_from_excel
+        """
+        entry = self._get_entry(file_path, sheet)
+        groups = entry.setdefault("groups", {})
+        key = (group_column, names_column)
+        if key not in groups:
+            digest = self._get_digest(entry, file_path)
+            mapping = (
+                self.index_store.load_group_mapping(digest, sheet, self.backend, group_column, names_column)
+                if digest else None
+            )
+            if mapping is None:
+                if self.backend == "openpyxl":
+                    mapping = build_group_mapping_streaming(file_path, sheet, group_column, names_column)
+                else:
+                    df = self.get_dataframe(file_path, sheet)
+                    mapping = build_group_mapping_from_excel(df, group_column, names_column)
+                if digest:
+                    self.index_store.save_group_mapping(
+                        digest, sheet, self.backend, group_column, names_column, mapping
+                    )
+            groups[key] = mapping
+        return groups[key]
+
+    def invalidate(self, file_path: Optional[str] = None):
+        """
+        清除指定文件（或全部）的缓存
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                return
+            path = os.path.abspath(file_path)
+            for key in [k for k in self._entries if k[0] == path]:
+                del self._entries[key]
+
+
+# 应用共享的缓存实例
+workbook_cache = WorkbookCache(index_store=IndexStore() if INDEX_CACHE_ENABLED else None)
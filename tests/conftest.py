@@ -0,0 +1,12 @@
+import pytest
+
+from src import folder_snapshot
+
+
+@pytest.fixture(autouse=True)
+def isolated_snapshots(tmp_path, monkeypatch):
+    """
+    Keep folder snapshots of a test in its temp directory and out of the session cache.
+    """
+    monkeypatch.setattr(folder_snapshot, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(folder_snapshot, "_snapshots", {})
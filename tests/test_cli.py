@@ -0,0 +1,119 @@
+import json
+import os
+
+import openpyxl
+import pytest
+
+from src import cli, rename_journal
+from src.file_utils import fully_deleted_bases
+from src.rename_journal import RenameJournal, journal_path_for, load_journal
+
+BASE = "2025_04_15_155131"
+
+
+@pytest.fixture
+def folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(rename_journal, "JOURNAL_DIR", str(tmp_path / "journals"))
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / f"{BASE}_P_Q.blf").write_text("A")
+    return str(data)
+
+
+def interrupted_journal(folder):
+    """
+    Journal of an apply that stopped before its first rename.
+    """
+    path = journal_path_for(folder)
+    os.makedirs(os.path.dirname(path))
+    old = os.path.join(folder, f"{BASE}_P_Q.blf")
+    RenameJournal.create(path, [(old, os.path.join(folder, f"{BASE}_X_Y.blf"))]).close()
+    return path
+
+
+def test_rename_apply_refuses_to_discard_unfinished_journal(folder, capsys):
+    path = interrupted_journal(folder)
+    exit_code = cli.main(["rename-apply", "--folder", folder, "--suffix", "X_Y_Z"])
+    assert exit_code == cli.EXIT_ERROR
+    assert "--resume" in capsys.readouterr().err
+    assert len(load_journal(path)["changes"]) == 1
+    assert os.path.exists(os.path.join(folder, f"{BASE}_P_Q.blf"))
+
+
+def test_rename_apply_force_starts_new_journal(folder):
+    path = interrupted_journal(folder)
+    exit_code = cli.main(["rename-apply", "--folder", folder, "--suffix", "X_Y_Z", "--force"])
+    assert exit_code == cli.EXIT_OK
+    assert os.path.exists(os.path.join(folder, f"{BASE}_X_Y_Z.blf"))
+    assert load_journal(path)["complete"]
+
+
+def test_rename_apply_resume_requires_journal(folder):
+    with pytest.raises(SystemExit):
+        cli.main(["rename-apply", "--folder", folder, "--resume", "--no-journal"])
+
+
+def make_workbook(path, names):
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["files"])
+    for name in names:
+        workbook.active.append([name])
+    workbook.save(path)
+    return path
+
+
+def test_delete_folder_only_lists_unless_confirmed(folder, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cli.workbook_cache, "index_store", None)
+    excel = make_workbook(str(tmp_path / "tests.xlsx"), ["2025_04_15_155132_P_Q"])
+    extra = os.path.join(folder, f"{BASE}_P_Q.blf")
+
+    assert cli.main(["delete-folder-only", "--excel", excel, "--folder", folder]) == cli.EXIT_OK
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["dry_run"] and payload["planned"] == [extra]
+    assert os.path.exists(extra)
+
+    assert cli.main(["delete-folder-only", "--excel", excel, "--folder", folder, "--yes", "--dry-run"]) == cli.EXIT_OK
+    assert json.loads(capsys.readouterr().out)["dry_run"]
+    assert os.path.exists(extra)
+
+    assert cli.main(["delete-folder-only", "--excel", excel, "--folder", folder, "--yes"]) == cli.EXIT_OK
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["deleted"] == [extra] and payload["deleted_tests"] == [BASE]
+    assert not os.path.exists(extra)
+
+
+def test_delete_folder_only_counts_only_fully_deleted_tests():
+    files_by_base = {
+        "2025_04_15_155131": [f"{BASE}_A.blf", f"{BASE}_A.mp4"],
+        "2025_04_15_155132": ["2025_04_15_155132_A.blf"],
+    }
+    deleted = [f"{BASE}_A.blf", "2025_04_15_155132_A.blf"]
+    assert fully_deleted_bases(sorted(files_by_base), files_by_base, deleted) == ["2025_04_15_155132"]
+
+
+def test_compare_reports_files_the_duplicate_check_could_not_read(tmp_path, monkeypatch):
+    # Keep the shared workbook cache away from the user's on-disk index store
+    monkeypatch.setattr(cli.workbook_cache, "index_store", None)
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["files"])
+    workbook.active.append([f"{BASE}_DA00097_A"])
+    excel = str(tmp_path / "tests.xlsx")
+    workbook.save(excel)
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / f"{BASE}_DA00097_A.blf").write_text("x")
+    unreadable = str(data / f"{BASE}_DA00097_A.blf")
+    monkeypatch.setattr(cli, "find_duplicate_contents", lambda file_stats: {
+        "groups": [], "errors": [(unreadable, "Permission denied")], "hashed": 0, "cancelled": False,
+    })
+    output = str(tmp_path / "result.json")
+    export = str(tmp_path / "result.csv")
+
+    exit_code = cli.main(["compare", "--excel", excel, "--folder", str(data), "--files-per-test", "1",
+                          "--find-duplicates", "--output", output, "--export", export])
+    assert exit_code == cli.EXIT_ISSUES
+    with open(output, encoding='utf-8') as handle:
+        payload = json.load(handle)
+    assert payload["duplicate_unreadable"] == [{"path": unreadable, "error": "Permission denied"}]
+    with open(export, encoding='utf-8-sig') as handle:
+        assert f"duplicate_unreadable,{unreadable}: Permission denied" in handle.read()
@@ -0,0 +1,55 @@
+import pytest
+
+from src.compare_engine import compare_bases, compare_indexed
+from src.excel_utils import count_test_numbers
+
+A = "2025_04_15_155131"
+B = "2025_04_15_155132"
+C = "2025_04_15_155133"
+D = "2025_04_16_155131"
+E = "2025_04_16_000001"
+
+# B repeats before A does; D shares its test number with A
+EXCEL_BASES = [A, B, "", C, B, A, D, A]
+FOLDER_FILES = [
+    f"{A}_DA00097_A.blf", f"{A}_DA00097_A_inside.mp4",
+    f"D:/campaign/{B}_DA00097_A.blf", f"{B}_DA00097_A.txt",
+    f"{E}_DA00097_A.blf",
+    "notes.txt",
+]
+
+
+def test_compare_bases_result():
+    result = compare_bases(EXCEL_BASES, FOLDER_FILES, required_files=2)
+    assert result["excel_only"] == [C, D]
+    assert result["folder_only"] == [E]
+    assert result["incomplete"] == [E]
+    assert result["missing"] == {}
+    assert result["duplicates"] == [B, A]
+    assert result["files_by_base"] == {
+        A: [f"{A}_DA00097_A.blf", f"{A}_DA00097_A_inside.mp4"],
+        B: [f"D:/campaign/{B}_DA00097_A.blf", f"{B}_DA00097_A.txt"],
+        E: [f"{E}_DA00097_A.blf"],
+    }
+
+
+def test_compare_indexed_matches_compare_bases():
+    files_by_base = compare_bases(EXCEL_BASES, FOLDER_FILES)["files_by_base"]
+    # The same file listed twice counts once
+    files_by_base[E] = [f"{E}_DA00097_A.blf", f"{E}_DA00097_A.blf"]
+    result = compare_indexed(iter(EXCEL_BASES), files_by_base, required_files=2)
+    expected = compare_bases(EXCEL_BASES, FOLDER_FILES, required_files=2)
+    expected["files_by_base"] = files_by_base
+    assert result == expected
+    assert compare_indexed(EXCEL_BASES, files_by_base, required_files=3)["incomplete"] == [A, B, E]
+
+
+def test_test_count_uses_the_test_number():
+    assert count_test_numbers(EXCEL_BASES) == 3
+
+
+def test_required_files_must_be_positive():
+    with pytest.raises(ValueError):
+        compare_bases(EXCEL_BASES, FOLDER_FILES, required_files=0)
+    with pytest.raises(ValueError):
+        compare_indexed(EXCEL_BASES, {}, required_files=0)
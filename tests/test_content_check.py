@@ -0,0 +1,65 @@
+import os
+
+from src.content_check import DigestCache, find_undersized_files, hash_files
+from src.folder_snapshot import load_folder_listing
+
+NAME = "2025_04_15_155131_DA00097_A.blf"
+
+
+def test_rewritten_file_is_not_judged_by_stale_snapshot(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    path = str(data / NAME)
+    open(path, 'wb').close()
+    # Directory listing older than the snapshot's mtime grace period
+    os.utime(str(data), (1_700_000_000, 1_700_000_000))
+    cache = DigestCache(str(tmp_path / "digests.json"))
+
+    _, file_stats = load_folder_listing([str(data)])
+    assert find_undersized_files(file_stats) == [(path, 0)]
+    empty_digest = hash_files(file_stats, cache=cache)["digests"][path]
+
+    # Finishing the copy changes the file, not the directory listing
+    with open(path, 'wb') as handle:
+        handle.write(b"x" * 5000)
+
+    _, file_stats = load_folder_listing([str(data)])
+    assert file_stats[path][0] == 5000
+    assert find_undersized_files(file_stats) == []
+    result = hash_files(file_stats, cache=cache)
+    assert result["hashed"] == 1
+    assert result["digests"][path] != empty_digest
+
+
+def test_file_vanishing_after_hashing_is_only_an_error(tmp_path, monkeypatch):
+    path = str(tmp_path / NAME)
+    with open(path, 'wb') as handle:
+        handle.write(b"x")
+    file_stats = {path: (1, os.stat(path).st_mtime)}
+    real_stat = os.stat
+
+    def vanished(target, *args, **kwargs):
+        if target == path:
+            raise FileNotFoundError(target)
+        return real_stat(target, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", vanished)
+    result = hash_files(file_stats, cache=DigestCache(str(tmp_path / "digests.json")))
+    assert result["digests"] == {}
+    assert [error_path for error_path, _ in result["errors"]] == [path]
+
+
+def test_least_recently_used_digests_are_dropped(tmp_path):
+    cache_path = str(tmp_path / "digests.json")
+    cache = DigestCache(cache_path, max_entries=2)
+    cache.put("a", 1, 1.0, "md5", "da")
+    cache.put("b", 1, 1.0, "md5", "db")
+    # Reading "a" makes "b" the least recently used one
+    assert cache.get("a", 1, 1.0, "md5") == "da"
+    cache.put("c", 1, 1.0, "md5", "dc")
+    cache.save()
+
+    reloaded = DigestCache(cache_path, max_entries=2)
+    assert reloaded.get("b", 1, 1.0, "md5") is None
+    assert reloaded.get("a", 1, 1.0, "md5") == "da"
+    assert reloaded.get("c", 1, 1.0, "md5") == "dc"
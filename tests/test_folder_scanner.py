@@ -0,0 +1,36 @@
+import os
+
+from src import folder_snapshot
+from src.folder_scanner import distinct_roots, scan_folders
+from src.folder_snapshot import load_folder_index
+
+
+def test_nested_roots_are_dropped_for_recursive_scans(tmp_path):
+    outer = str(tmp_path / "campaign")
+    inner = os.path.join(outer, "day1")
+    sibling = str(tmp_path / "campaign2")
+    assert distinct_roots([inner, outer, sibling, outer], recursive=True) == [outer, sibling]
+    assert distinct_roots([inner, outer], recursive=False) == [inner, outer]
+
+
+def test_nested_root_is_scanned_once(tmp_path):
+    outer = tmp_path / "campaign"
+    inner = outer / "day1"
+    inner.mkdir(parents=True)
+    (inner / "2025_04_15_155131_DA00097_A.blf").write_text("x")
+
+    entries = scan_folders([str(inner), str(outer)], recursive=True)
+    assert [entry.path for entry in entries] == [str(inner), str(inner / "2025_04_15_155131_DA00097_A.blf")]
+
+    index = load_folder_index([str(inner), str(outer)], recursive=True)
+    assert list(index) == ["2025_04_15_155131"]
+    # One snapshot for the outer folder only
+    assert [snapshot.root for snapshot in folder_snapshot._snapshots.values()] == [str(outer)]
+
+
+def test_file_stats_are_only_read_on_request(tmp_path):
+    (tmp_path / "2025_04_15_155131_DA00097_A.blf").write_text("xyz")
+    entries = scan_folders([str(tmp_path)])
+    assert [(entry.size, entry.mtime) for entry in entries] == [(None, None)]
+    entries = scan_folders([str(tmp_path)], with_stats=True)
+    assert entries[0].size == 3 and entries[0].mtime
@@ -0,0 +1,32 @@
+import os
+
+from src import folder_snapshot
+from src.folder_snapshot import FolderSnapshot
+
+NAME = "2025_04_15_155131_DA00097_A.blf"
+
+
+def make_snapshot(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / NAME).write_text("x")
+    # Older than the mtime grace period, so the listing is reused when valid
+    os.utime(str(data), (1_700_000_000, 1_700_000_000))
+    snapshot = FolderSnapshot(str(data), snapshot_dir=str(tmp_path / "snapshots"))
+    snapshot.refresh()
+    return str(data)
+
+
+def test_unchanged_snapshot_is_reused(tmp_path):
+    data = make_snapshot(tmp_path)
+    snapshot = FolderSnapshot(data, snapshot_dir=str(tmp_path / "snapshots"))
+    assert snapshot.refresh()["rescanned"] == 0
+    assert list(snapshot.files_by_base) == ["2025_04_15_155131"]
+
+
+def test_snapshot_is_discarded_when_filename_pattern_changes(tmp_path, monkeypatch):
+    data = make_snapshot(tmp_path)
+    monkeypatch.setattr(folder_snapshot, "FILENAME_PATTERN", r'20\d{2}_\d{2}_\d{2}')
+    snapshot = FolderSnapshot(data, snapshot_dir=str(tmp_path / "snapshots"))
+    assert snapshot.files_by_base == {}
+    assert snapshot.refresh()["rescanned"] == 1
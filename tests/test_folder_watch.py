@@ -0,0 +1,25 @@
+import os
+
+from src.folder_snapshot import load_folder_index
+from src.folder_watch import FolderWatcher
+
+BASE = "2025_04_15_155131"
+
+
+def test_compare_refresh_does_not_hide_changes_from_watcher(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    watcher = FolderWatcher([str(data)], [BASE], on_update=lambda result: None)
+    watcher._refresh(initial=True)
+    assert watcher.comparison.result()["excel_only"] == [BASE]
+
+    for suffix in ("a.blf", "b.blf", "c_inside.mp4", "d_outside.mp4"):
+        open(os.path.join(str(data), f"{BASE}_DA00097_{suffix}"), 'w').close()
+    # A compare job refreshes the shared snapshot first
+    assert BASE in load_folder_index([str(data)])
+
+    assert watcher._refresh() is True
+    result = watcher.comparison.result()
+    assert result["excel_only"] == [] and result["incomplete"] == []
+    assert watcher._refresh() is False
+    watcher._backend.close()
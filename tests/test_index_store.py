@@ -0,0 +1,53 @@
+import json
+import os
+
+from src import index_store
+from src.index_store import IndexStore
+
+INDEX = {"bases": ["2025_04_15_155131"], "test_count": 1}
+
+
+def make_workbook(folder, name, content=b"workbook"):
+    path = os.path.join(str(folder), name)
+    with open(path, 'wb') as handle:
+        handle.write(content + name.encode())
+    return path
+
+
+def test_index_key_includes_backend_and_pattern(tmp_path, monkeypatch):
+    store = IndexStore(str(tmp_path / "cache"))
+    store.save_filename_index("d" * 32, "Tests", "pandas", INDEX)
+    assert store.load_filename_index("d" * 32, "Tests", "pandas") == INDEX
+    assert store.load_filename_index("d" * 32, "Tests", "openpyxl") is None
+
+    monkeypatch.setattr(index_store, "FILENAME_PATTERN", r'\d{8}')
+    assert store.load_filename_index("d" * 32, "Tests", "pandas") is None
+
+
+def test_least_recently_used_sidecars_are_pruned(tmp_path):
+    store = IndexStore(str(tmp_path / "cache"), max_entries=2)
+    for number, digest in enumerate(("a" * 32, "b" * 32)):
+        store.save_filename_index(digest, "Tests", "pandas", INDEX)
+        path = store._index_path(digest, "Tests", "pandas")
+        os.utime(path, (1000 + number, 1000 + number))
+    # Reading "a" makes "b" the least recently used one
+    assert store.load_filename_index("a" * 32, "Tests", "pandas") == INDEX
+    store.save_filename_index("c" * 32, "Tests", "pandas", INDEX)
+
+    assert store.load_filename_index("b" * 32, "Tests", "pandas") is None
+    assert store.load_filename_index("a" * 32, "Tests", "pandas") == INDEX
+    assert store.load_filename_index("c" * 32, "Tests", "pandas") == INDEX
+
+
+def test_digests_of_concurrent_stores_are_merged_and_limited(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first, second = IndexStore(cache_dir, max_entries=2), IndexStore(cache_dir, max_entries=2)
+    books = [make_workbook(tmp_path, f"book{i}.xlsx") for i in range(3)]
+    first.get_digest(books[0])
+    second.get_digest(books[1])
+    with open(os.path.join(cache_dir, "digests.json"), encoding='utf-8') as handle:
+        assert set(json.load(handle)) == {os.path.abspath(books[0]), os.path.abspath(books[1])}
+
+    first.get_digest(books[2])
+    with open(os.path.join(cache_dir, "digests.json"), encoding='utf-8') as handle:
+        assert set(json.load(handle)) == {os.path.abspath(books[1]), os.path.abspath(books[2])}
@@ -0,0 +1,43 @@
+import os
+
+from src import move_engine
+from src.move_engine import execute_move_plan
+
+NAME = "2025_04_15_155131_DA00097_A.blf"
+
+
+def make_source(tmp_path, name=NAME, content="source"):
+    source = tmp_path / "source"
+    source.mkdir(exist_ok=True)
+    path = source / name
+    path.write_text(content)
+    return str(path)
+
+
+def test_names_differing_only_by_case_conflict(tmp_path, monkeypatch):
+    # As on a case-insensitive filesystem
+    monkeypatch.setattr(move_engine.os.path, "normcase", str.lower)
+    target = tmp_path / "target"
+    first = make_source(tmp_path)
+    second = make_source(tmp_path, NAME.lower())
+    moves = [(first, str(target / NAME)), (second, str(target / NAME.lower()))]
+
+    result = execute_move_plan(moves)
+    assert result["moved"] == moves[:1]
+    assert result["conflicts"] == moves[1:]
+    assert os.path.exists(second)
+
+
+def test_file_created_after_listing_is_not_replaced(tmp_path, monkeypatch):
+    target = tmp_path / "target"
+    target.mkdir()
+    source = make_source(tmp_path)
+    # The target folder looked empty when it was listed
+    monkeypatch.setattr(move_engine, "scan_folder", lambda folder: [])
+    (target / NAME).write_text("arrived later")
+
+    result = execute_move_plan([(source, str(target / NAME))])
+    assert result["moved"] == [] and result["errors"] == []
+    assert result["conflicts"] == [(source, str(target / NAME))]
+    assert (target / NAME).read_text() == "arrived later"
+    assert os.path.exists(source)
@@ -0,0 +1,171 @@
+import os
+
+import pytest
+
+from src.file_utils import apply_rename_plan, build_suffix_rename_plan
+from src.fs_executor import rename_no_replace
+from src.rename_journal import (
+    RenameJournal, linked_steps, load_journal, resume_rename_journal, rollback_rename_journal,
+)
+
+BASE = "2025_04_15_155131"
+
+
+def write(folder, name, content):
+    path = os.path.join(str(folder), name)
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(content)
+    return path
+
+
+def read(folder, name):
+    with open(os.path.join(str(folder), name), encoding='utf-8') as handle:
+        return handle.read()
+
+
+def chain_plan(folder):
+    """
+    B: ..._X_Y_Z.blf -> ..._X_Y_Z_Z.blf must run before A: ..._P_Q.blf -> ..._X_Y_Z.blf
+    """
+    write(folder, f"{BASE}_X_Y_Z.blf", "B")
+    write(folder, f"{BASE}_P_Q.blf", "A")
+    changes, _, conflicts = build_suffix_rename_plan(str(folder), "X_Y_Z")
+    assert not conflicts
+    assert [os.path.basename(new) for _, new in changes] == [f"{BASE}_X_Y_Z_Z.blf", f"{BASE}_X_Y_Z.blf"]
+    return changes
+
+
+def crash_after(changes, journal_path, steps):
+    """
+    Run the first `steps` renames like apply_rename_plan does, then stop
+    before any batched "done" record reaches the journal.
+    """
+    journal = RenameJournal.create(journal_path, changes, sync_every=10 ** 6)
+    linked = linked_steps(changes)
+    for index in range(steps):
+        if index in linked:
+            journal.record_started(index)
+        os.rename(*changes[index])
+    # Simulated crash: unsynced records are lost
+    journal._handle = open(os.devnull, 'w')
+
+
+def test_rename_no_replace_refuses_existing_target(tmp_path):
+    old = write(tmp_path, "a.txt", "a")
+    new = write(tmp_path, "b.txt", "b")
+    with pytest.raises(FileExistsError):
+        rename_no_replace(old, new)
+    assert read(tmp_path, "a.txt") == "a" and read(tmp_path, "b.txt") == "b"
+
+
+def test_rename_no_replace_finishes_interrupted_link(tmp_path):
+    old = write(tmp_path, "a.txt", "a")
+    new = os.path.join(str(tmp_path), "b.txt")
+    os.link(old, new)  # crash before the unlink
+    rename_no_replace(old, new)
+    assert not os.path.exists(old) and read(tmp_path, "b.txt") == "a"
+
+
+def test_apply_chain(tmp_path):
+    changes = chain_plan(tmp_path)
+    stats = apply_rename_plan(changes, journal_path=str(tmp_path / "journal.jsonl"))
+    assert stats["renamed"] == 2 and stats["failed"] == 0
+    assert read(tmp_path, f"{BASE}_X_Y_Z_Z.blf") == "B"
+    assert read(tmp_path, f"{BASE}_X_Y_Z.blf") == "A"
+
+
+def test_apply_and_rollback_cycle(tmp_path):
+    a = write(tmp_path, f"{BASE}_A_A.blf", "A")
+    b = write(tmp_path, f"{BASE}_B_B.blf", "B")
+    tmp = os.path.join(str(tmp_path), f"{BASE}_A_A.blf.renaming0")
+    changes = [(a, tmp), (b, a), (tmp, b)]
+    journal_path = str(tmp_path / "journal.jsonl")
+
+    stats = apply_rename_plan(changes, journal_path=journal_path)
+    assert stats["failed"] == 0
+    assert read(tmp_path, f"{BASE}_A_A.blf") == "B" and read(tmp_path, f"{BASE}_B_B.blf") == "A"
+
+    stats = rollback_rename_journal(journal_path)
+    assert stats["restored"] == 3 and stats["failed"] == 0
+    assert read(tmp_path, f"{BASE}_A_A.blf") == "A" and read(tmp_path, f"{BASE}_B_B.blf") == "B"
+
+
+def test_resume_after_crash_keeps_chain_contents(tmp_path):
+    changes = chain_plan(tmp_path)
+    journal_path = str(tmp_path / "journal.jsonl")
+    crash_after(changes, journal_path, 2)
+    assert not load_journal(journal_path)["done"]
+
+    stats = resume_rename_journal(journal_path)
+    assert stats["failed"] == 0 and stats["recovered"] == 2
+    assert read(tmp_path, f"{BASE}_X_Y_Z_Z.blf") == "B"
+    assert read(tmp_path, f"{BASE}_X_Y_Z.blf") == "A"
+    assert load_journal(journal_path)["complete"]
+
+
+def test_resume_after_partial_crash_finishes_chain(tmp_path):
+    changes = chain_plan(tmp_path)
+    journal_path = str(tmp_path / "journal.jsonl")
+    crash_after(changes, journal_path, 1)
+
+    stats = resume_rename_journal(journal_path)
+    assert stats["failed"] == 0 and stats["renamed"] == 1 and stats["recovered"] == 1
+    assert read(tmp_path, f"{BASE}_X_Y_Z_Z.blf") == "B"
+    assert read(tmp_path, f"{BASE}_X_Y_Z.blf") == "A"
+
+
+def test_resume_without_intent_records_never_overwrites(tmp_path):
+    changes = chain_plan(tmp_path)
+    journal_path = str(tmp_path / "journal.jsonl")
+    RenameJournal.create(journal_path, changes).close()
+    for change in changes:
+        os.rename(*change)
+
+    stats = resume_rename_journal(journal_path)
+    assert stats["failed"] == 1
+    assert read(tmp_path, f"{BASE}_X_Y_Z_Z.blf") == "B"
+    assert read(tmp_path, f"{BASE}_X_Y_Z.blf") == "A"
+
+
+def test_resume_cycle_after_crash(tmp_path):
+    a = write(tmp_path, f"{BASE}_A_A.blf", "A")
+    b = write(tmp_path, f"{BASE}_B_B.blf", "B")
+    tmp = os.path.join(str(tmp_path), f"{BASE}_A_A.blf.renaming0")
+    changes = [(a, tmp), (b, a), (tmp, b)]
+    journal_path = str(tmp_path / "journal.jsonl")
+    crash_after(changes, journal_path, 2)
+
+    stats = resume_rename_journal(journal_path)
+    assert stats["failed"] == 0 and stats["renamed"] == 1 and stats["recovered"] == 2
+    assert read(tmp_path, f"{BASE}_A_A.blf") == "B" and read(tmp_path, f"{BASE}_B_B.blf") == "A"
+    assert not os.path.exists(tmp)
+
+
+def test_rollback_restores_unjournaled_renames(tmp_path):
+    changes = chain_plan(tmp_path)
+    journal_path = str(tmp_path / "journal.jsonl")
+    crash_after(changes, journal_path, 2)
+
+    stats = rollback_rename_journal(journal_path)
+    assert stats["restored"] == 2 and stats["failed"] == 0 and stats["recovered"] == 2
+    assert read(tmp_path, f"{BASE}_X_Y_Z.blf") == "B"
+    assert read(tmp_path, f"{BASE}_P_Q.blf") == "A"
+
+
+def test_resume_after_crash_between_link_and_unlink(tmp_path):
+    changes = chain_plan(tmp_path)
+    journal_path = str(tmp_path / "journal.jsonl")
+    crash_after(changes, journal_path, 0)
+    journal = RenameJournal(journal_path)
+    journal.record_started(0)
+    journal.close()
+    os.link(*changes[0])  # first rename stopped between link and unlink
+
+    stats = resume_rename_journal(journal_path)
+    assert stats["failed"] == 0 and stats["renamed"] == 2
+    assert sorted(os.listdir(str(tmp_path))) == sorted(
+        [f"{BASE}_X_Y_Z_Z.blf", f"{BASE}_X_Y_Z.blf", "journal.jsonl"]
+    )
+    assert read(tmp_path, f"{BASE}_X_Y_Z_Z.blf") == "B"
+    assert read(tmp_path, f"{BASE}_X_Y_Z.blf") == "A"
+    assert load_journal(journal_path)["complete"]
@@ -0,0 +1,82 @@
+import os
+
+from src.file_utils import _order_renames, _resolve_rename_conflicts, build_suffix_rename_plan
+
+BASE = "2025_04_15_155131"
+
+
+def plan(renames, others=()):
+    """
+    Resolve and order renames [(old, new)] in a folder that also holds the names in others.
+    """
+    moves = {os.path.normcase(old): (old, new) for old, new in renames}
+    existing_keys = {os.path.normcase(name) for name in list(moves) + list(others)}
+    ok = _resolve_rename_conflicts(moves, existing_keys)
+    return ok, _order_renames(moves, ok, existing_keys), existing_keys
+
+
+def apply(names, ordered):
+    """
+    Run the ordered renames on a set of names, checking that every target is free.
+    """
+    names = set(names)
+    for old, new in ordered:
+        assert old in names
+        assert os.path.normcase(new) not in {os.path.normcase(name) for name in names - {old}}
+        names.remove(old)
+        names.add(new)
+    return names
+
+
+def test_chain_frees_each_target_first():
+    ok, ordered, existing = plan([("A", "B"), ("B", "C")])
+    assert ok == {"A", "B"}
+    assert ordered == [("B", "C"), ("A", "B")]
+    assert apply(existing, ordered) == {"B", "C"}
+
+
+def test_two_cycle_goes_through_a_temporary_name():
+    ok, ordered, existing = plan([("A", "B"), ("B", "A")])
+    assert ok == {"A", "B"}
+    assert ordered == [("A", "A.renaming"), ("B", "A"), ("A.renaming", "B")]
+    assert apply(existing, ordered) == {"A", "B"}
+
+
+def test_three_cycle_temporary_name_avoids_existing_files():
+    ok, ordered, existing = plan([("A", "B"), ("B", "C"), ("C", "A")], others=["A.renaming"])
+    assert ok == {"A", "B", "C"}
+    assert ordered == [("A", "A.renaming1"), ("C", "A"), ("B", "C"), ("A.renaming1", "B")]
+    assert apply(existing, ordered) == {"A", "B", "C", "A.renaming"}
+
+
+def test_target_held_by_file_that_is_not_renamed_conflicts():
+    ok, ordered, _ = plan([("A", "B"), ("X", "Y")], others=["B"])
+    assert ok == {"X"}
+    assert ordered == [("X", "Y")]
+
+
+def test_conflict_at_the_tail_of_a_chain_propagates():
+    ok, ordered, _ = plan([("A", "B"), ("B", "C")], others=["C"])
+    assert ok == set()
+    assert ordered == []
+
+
+def test_case_only_rename_is_not_a_conflict(monkeypatch):
+    # As on a case-insensitive filesystem
+    monkeypatch.setattr(os.path, "normcase", str.lower)
+    ok, ordered, existing = plan([("a.blf", "A.blf")])
+    assert ok == {"a.blf"}
+    assert ordered == [("a.blf", "A.blf")]
+    assert apply(existing, ordered) == {"A.blf"}
+
+
+def test_two_sources_with_the_same_target(tmp_path):
+    for name in (f"{BASE}_DA00097_A.blf", f"{BASE}_DA00098_B.blf", f"{BASE}_DA00097_A.mp4"):
+        (tmp_path / name).write_text("x")
+    folder = str(tmp_path)
+
+    changes, _, conflicts = build_suffix_rename_plan(folder, "X_Y")
+    target = os.path.join(folder, f"{BASE}_X_Y.blf")
+    assert sorted(new for _, new in changes) == [target, os.path.join(folder, f"{BASE}_X_Y.mp4")]
+    assert [path for _, path in conflicts] == [target]
+    assert len({old for old, _ in changes} | {old for old, _ in conflicts}) == 3
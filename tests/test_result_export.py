@@ -0,0 +1,35 @@
+import threading
+
+import pytest
+
+from src.result_export import ExportCancelled, count_report_rows, export_report
+from src.result_model import ResultReport
+
+
+def make_report(items):
+    report = ResultReport(header=["Sheet: Tests"])
+    report.add_section("excel_only", "Only in Excel", [f"2025_04_15_{i:06d}" for i in range(items)], filenames=True)
+    report.add_section("folder_only", "Only in folder")
+    return report
+
+
+def test_export_reports_progress(tmp_path):
+    report = make_report(250)
+    calls = []
+    path = str(tmp_path / "result.csv")
+    count = export_report(report, path, progress=lambda current, total: calls.append((current, total)))
+    assert count == count_report_rows(report) == 252
+    assert calls[-1] == (252, 252)
+    with open(path, encoding='utf-8-sig') as handle:
+        assert len(handle.read().splitlines()) == 253
+
+
+def test_cancelled_export_keeps_existing_file(tmp_path):
+    path = tmp_path / "result.csv"
+    path.write_text("previous export")
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with pytest.raises(ExportCancelled):
+        export_report(make_report(250), str(path), cancel_event=cancel_event)
+    assert path.read_text() == "previous export"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["result.csv"]
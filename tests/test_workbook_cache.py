@@ -0,0 +1,69 @@
+import openpyxl
+
+from src.compare_engine import compare_indexed
+from src.excel_utils import ExcelBaseStream, build_group_mapping_streaming
+from src.workbook_cache import StreamedFilenameIndex, WorkbookCache
+
+A = "2025_04_15_155131"
+B = "2025_04_15_155132"
+C = "2025_04_15_155133"
+
+
+def make_workbook(path):
+    """
+    Row-major order of the bases is A B B C A A, column-major order is
+    A C A B B A, so the first repeated base differs between the two.
+    """
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Tests"
+    sheet.append(["first", "second"])
+    sheet.append([f"{A}_DA00097_A", f"{B}_DA00097_A, {B}_DA00097_B"])
+    sheet.append([f"{C}_DA00097_A_inside.mp4", A])
+    sheet.append([A, None])
+    workbook.save(path)
+    return str(path)
+
+
+def test_stream_keeps_column_order(tmp_path):
+    path = make_workbook(tmp_path / "tests.xlsx")
+    stream = ExcelBaseStream(path, "Tests")
+    assert list(stream) == [A, B, B, C, A, A]
+    assert stream.ordered == [A, C, A, B, B, A]
+    assert list(stream) == stream.ordered
+
+    pandas_index = WorkbookCache(backend="pandas").get_filename_index(path, "Tests")
+    assert pandas_index["bases"] == stream.ordered
+
+
+def test_streamed_comparison_matches_pandas_backend(tmp_path):
+    path = make_workbook(tmp_path / "tests.xlsx")
+    folder_index = {A: {f"{A}_DA00097_A.blf"}, B: {f"{B}_DA00097_A.blf"}}
+    cache = WorkbookCache(backend="openpyxl")
+
+    index = cache.get_filename_index(path, "Tests", stream=True)
+    assert isinstance(index, StreamedFilenameIndex)
+    streamed = compare_indexed(index["bases"], folder_index)
+    assert index["test_count"] == 3
+
+    pandas_index = WorkbookCache(backend="pandas").get_filename_index(path, "Tests")
+    expected = compare_indexed(pandas_index["bases"], folder_index)
+    assert streamed["duplicates"] == expected["duplicates"] == [A, B]
+    assert streamed["excel_only"] == expected["excel_only"] == [C]
+
+    # The completed stream is cached like a fully read index
+    assert cache.get_filename_index(path, "Tests", stream=True) == pandas_index
+
+
+def test_streaming_group_mapping_without_pandas_values(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["group", "names"])
+    sheet.append([12.0, f"{A}, {B}"])
+    sheet.append([None, C])
+    path = str(tmp_path / "groups.xlsx")
+    workbook.save(path)
+
+    filename_to_group, group_to_names = build_group_mapping_streaming(path, None, 0, 1)
+    assert filename_to_group == {A: "12", B: "12"}
+    assert group_to_names == {"12": {A, B}}